@@ -1,19 +1,25 @@
+import argparse
+import itertools
 import os
 import sys
-import glob
-import logging
 from pathlib import Path
 
 # Add src to pythonpath
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
 
-from src.adapters.driven.fs_adapter import LocalFileSystemAdapter
-from src.adapters.driven.pdf_adapter import Xhtml2PdfAdapter
-from src.adapters.driven.fs_archiver import FileSystemArchiver
-from src.application.service import ConversionService
+import threading
+from dataclasses import replace
+from src.adapters.driven.dir_watcher import create_directory_watcher
+from src.adapters.driven.fs_adapter import LocalFileSystemAdapter, scan_filter
+from src.application.batch import BatchConverter
+from src.application.manifest import manifest_name
+from src.application.watch import WatchConverter
+from src.domain.model import FileScan
+from src.infrastructure.config import settings
+from src.infrastructure.container import Container
 from src.infrastructure.logger import logger
 
-def process_files():
+def process_files(workers: int, timeout: float, force: bool = False, prune: bool = False, scan: FileScan = FileScan()):
     input_dir = Path("data/input")
     output_dir = Path("data/output")
     
@@ -21,30 +27,116 @@ def process_files():
     input_dir.mkdir(parents=True, exist_ok=True)
     output_dir.mkdir(parents=True, exist_ok=True)
     
-    # Init service
-    fs_adapter = LocalFileSystemAdapter()
-    pdf_adapter = Xhtml2PdfAdapter()
-    archiver = FileSystemArchiver()
-    service = ConversionService(pdf_adapter, fs_adapter, archiver)
+    # Recursive and lazy: conversions start while the tree is still being scanned
+    files = LocalFileSystemAdapter().scan_files(str(input_dir), scan)
+    first = next(files, None)
     
-    files = list(input_dir.glob("*.md")) + list(input_dir.glob("*.txt"))
-    
-    if not files:
-        print(f"No files found in {input_dir}. Add .md or .txt files there.")
+    if first is None:
+        print(f"No files found in {input_dir}. Add .md, .markdown or .txt files there.")
         return
 
-    print(f"Found {len(files)} files. Processing...")
-    
-    for file_path in files:
-        output_filename = f"{file_path.stem}.pdf"
-        output_path = output_dir / output_filename
-        
-        try:
-            print(f"Converting: {file_path.name}...")
-            result = service.convert_file(str(file_path), str(output_path))
-            print(f"  -> Generated: {result}")
-        except Exception as e:
-            print(f"  -> Error: {e}")
+    # Init service with a render pool sized to the batch
+    container = Container(replace(settings, render_workers=workers))
+    
+    shard = f" (shard {scan.shard_index}/{scan.shard_count})" if scan.sharded else ""
+    print(f"Processing {input_dir}{shard} with {container.render_workers} workers...")
+    
+    try:
+        container.warm_up()
+        batch = BatchConverter(container.service, workers=container.render_workers, file_timeout=timeout)
+        summary = batch.run(
+            itertools.chain([first], files), str(output_dir), incremental=not force, prune=prune,
+            input_root=str(input_dir), manifest_name=manifest_name(scan.shard_index, scan.shard_count),
+        )
+    finally:
+        container.shutdown()
+    
+    for item in summary.results:
+        if item.status == "success":
+            print(f"  {item.file} -> Generated: {output_dir / item.output} ({item.duration_s}s)")
+        elif item.status == "unchanged":
+            print(f"  {item.file} -> Unchanged: {output_dir / item.output}")
+        else:
+            print(f"  {item.file} -> Error: {item.error}")
+    
+    for name in summary.pruned:
+        print(f"  Pruned: {output_dir / name}")
+    
+    throughput = summary.throughput()
+    print(
+        f"Done: {summary.successful}/{summary.processed} successful, {summary.unchanged} unchanged "
+        f"in {throughput['elapsed_s']}s "
+        f"({throughput['files_per_s']} files/s, {throughput['mb_per_s']} MB/s)"
+    )
+
+def watch_files(workers: int, timeout: float, prune: bool = False, scan: FileScan = FileScan()):
+    input_dir = Path("data/input")
+    output_dir = Path("data/output")
+    input_dir.mkdir(parents=True, exist_ok=True)
+    
+    # The same selection as a bulk run: recursive, filtered and sharded
+    fs = LocalFileSystemAdapter()
+    
+    def list_files():
+        return fs.scan_files(str(input_dir), scan)
+    
+    container = Container(replace(settings, render_workers=workers))
+    watcher = create_directory_watcher(
+        str(input_dir), scan.extensions, settings.watch_poll_ms / 1000, list_files=list_files
+    )
+    
+    def report(item):
+        if item.status == "error":
+            print(f"  {item.file} -> Error: {item.error}")
+        elif item.status == "success":
+            print(f"  {item.file} -> Generated: {output_dir / item.output} ({item.duration_s}s)")
+    
+    stop = threading.Event()
+    shard = f" (shard {scan.shard_index}/{scan.shard_count})" if scan.sharded else ""
+    print(f"Watching {input_dir}{shard} -> {output_dir} with {container.render_workers} workers (Ctrl+C to stop)...")
+    try:
+        container.warm_up()
+        batch = BatchConverter(container.service, workers=container.render_workers, file_timeout=timeout)
+        WatchConverter(
+            batch, watcher, str(input_dir), str(output_dir), list_files,
+            debounce=settings.watch_debounce_ms / 1000, prune=prune, on_result=report,
+            input_root=str(input_dir), manifest_name=manifest_name(scan.shard_index, scan.shard_count),
+            selects=scan_filter(str(input_dir), scan),
+        ).run(stop)
+    except KeyboardInterrupt:
+        stop.set()
+        print("Stopped watching.")
+    finally:
+        container.shutdown()
 
 if __name__ == "__main__":
-    process_files()
+    parser = argparse.ArgumentParser(description="Convert every file in data/input to PDF.")
+    parser.add_argument("--workers", "-w", type=int, default=settings.batch_workers or settings.render_workers,
+                        help="Parallel conversions (default: one per CPU core)")
+    parser.add_argument("--timeout", "-t", type=float, default=settings.batch_file_timeout_s,
+                        help="Per-file timeout in seconds")
+    parser.add_argument("--force", action="store_true",
+                        help="Re-render every file, even when unchanged since the last run")
+    parser.add_argument("--prune", action="store_true",
+                        help="Delete outputs whose input file was removed")
+    parser.add_argument("--watch", action="store_true",
+                        help="Keep running and convert new and changed files as they appear")
+    parser.add_argument("--include", action="append", default=[], metavar="GLOB",
+                        help="Only convert paths (below data/input) matching this glob; repeatable")
+    parser.add_argument("--exclude", action="append", default=[], metavar="GLOB",
+                        help="Skip paths and directories matching this glob; repeatable")
+    parser.add_argument("--shard", default=f"{settings.shard_index}/{settings.shard_count}", metavar="I/N",
+                        help="Convert only shard I of N of the input tree (default: PDF_SHARD_INDEX/PDF_SHARD_COUNT)")
+    args = parser.parse_args()
+    try:
+        shard_index, shard_count = (int(part) for part in args.shard.split("/"))
+        scan = FileScan(
+            include=tuple(args.include), exclude=tuple(args.exclude),
+            shard_index=shard_index, shard_count=shard_count,
+        )
+    except ValueError as e:
+        parser.error(f"--shard: {e}")
+    if args.watch:
+        watch_files(args.workers, args.timeout, args.prune, scan)
+    else:
+        process_files(args.workers, args.timeout, args.force, args.prune, scan)
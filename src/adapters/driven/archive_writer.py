@@ -0,0 +1,267 @@
+"""
+Buffered Archiver - Background writer shared by the history adapters.
+
+``archive()`` only snapshots the request/result fields and enqueues them,
+so a conversion pays for a queue put, not for text scans and storage
+I/O. A writer thread builds the history records (content statistics in a
+single pass) and hands them to the concrete store in batches. The queued
+snapshots hold the source text until then, so the queue is bounded by
+text size as well as by record count.
+"""
+import atexit
+import queue
+import threading
+import time
+from abc import abstractmethod
+from datetime import datetime
+from src.domain.model import ConversionRequest, ConversionResult
+from src.domain.ports import ArchiverPort
+from src.infrastructure.logger import logger
+from src.infrastructure.metrics import registry
+
+ARCHIVE_RECORDS = registry.counter(
+    "pdf_archive_records_total", "History records by result (written, dropped, failed)", ("result",)
+)
+ARCHIVE_FLUSHES = registry.counter("pdf_archive_flushes_total", "Batched history writes")
+
+# Text is scanned in slices so word counting never builds a full word list
+_STATS_CHUNK = 1024 * 1024
+
+
+def content_stats(text: str) -> dict:
+    """
+    Byte, word, line and character counts of text in a single chunked pass.
+
+    Lines are newline-terminated lines (a trailing partial line counts);
+    words are runs of non-whitespace, as with str.split().
+    """
+    ascii_only = text.isascii()
+    byte_count = len(text) if ascii_only else 0
+    words = lines = 0
+    previous_is_space = True
+    for start in range(0, len(text), _STATS_CHUNK):
+        chunk = text[start:start + _STATS_CHUNK]
+        if not ascii_only:
+            byte_count += len(chunk.encode('utf-8'))
+        lines += chunk.count('\n')
+        words += len(chunk.split())
+        # A word straddling the slice boundary was counted on both sides
+        if not previous_is_space and not chunk[0].isspace():
+            words -= 1
+        previous_is_space = chunk[-1].isspace()
+    if text and not text.endswith('\n'):
+        lines += 1
+    return {
+        "input_size_bytes": byte_count,
+        "word_count": words,
+        "line_count": lines,
+        "char_count": len(text),
+    }
+
+
+class _Flush:
+    """Queue marker asking the writer to write everything received so far."""
+
+    def __init__(self):
+        self.done = threading.Event()
+
+
+_STOP = object()
+
+
+class BufferedArchiver(ArchiverPort):
+    """
+    Archiver that records conversions on a background writer thread.
+
+    Args:
+        queue_size: Records waiting to be written; beyond it records are dropped
+        queue_chars: Source text held by waiting records; beyond it records
+            are dropped (a record is always accepted when none are waiting)
+        batch_size: Records written per flush at most
+        flush_interval: Seconds a record may wait before being written
+    """
+
+    def __init__(
+        self,
+        queue_size: int = 10000,
+        queue_chars: int = 64 * 1024 * 1024,
+        batch_size: int = 256,
+        flush_interval: float = 1.0,
+    ):
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.queue_chars = queue_chars
+        self._queue: queue.Queue = queue.Queue(maxsize=queue_size)
+        # Source text characters held by records not yet built
+        self._queued_chars = 0
+        self._stats = {"written": 0, "dropped": 0, "failed": 0, "flushes": 0}
+        self._stats_lock = threading.Lock()
+        self._closed = False
+        self._thread = threading.Thread(target=self._run, name="archive-writer", daemon=True)
+        self._thread.start()
+        # Records still queued at interpreter exit are written, not lost
+        atexit.register(self._stop)
+
+    def archive(self, request: ConversionRequest, result: ConversionResult) -> None:
+        """
+        Queue a conversion for history: its metadata and the source text
+        the writer derives content statistics from (no files).
+
+        Never blocks: when the writer is behind and the queue is full (by
+        record count or by queued text) the record is dropped and counted.
+
+        Args:
+            request: Original conversion request
+            result: Conversion result with status
+        """
+        if self._closed:
+            return
+        # Snapshot now; the text itself is immutable and scanned by the writer
+        item = (
+            datetime.now(),
+            request.output_filename,
+            request.source_format.value,
+            request.content,
+            request.content_hash,
+            result.size_bytes,
+            result.success,
+            result.error_message,
+        )
+        size = len(request.content)
+        with self._stats_lock:
+            accepted = self._queued_chars == 0 or self._queued_chars + size <= self.queue_chars
+            if accepted:
+                self._queued_chars += size
+        if accepted:
+            try:
+                self._queue.put_nowait(item)
+                return
+            except queue.Full:
+                self._dequeued(size)
+        self._count("dropped")
+        logger.warning("Archive queue full, dropped history record for %s", request.output_filename)
+
+    def _count(self, key: str, amount: int = 1) -> None:
+        with self._stats_lock:
+            self._stats[key] += amount
+        if key == "flushes":
+            ARCHIVE_FLUSHES.inc(amount)
+        else:
+            ARCHIVE_RECORDS.inc(amount, result=key)
+
+    def _dequeued(self, size: int) -> None:
+        with self._stats_lock:
+            self._queued_chars -= size
+
+    def stats(self) -> dict:
+        """Records written, dropped and failed, flushes done and records still queued."""
+        with self._stats_lock:
+            return {**self._stats, "queued": self._queue.qsize()}
+
+    @staticmethod
+    def _build_record(item: tuple) -> dict:
+        timestamp, filename, source_format, content, content_hash, output_size, success, error = item
+        run_id = f"{timestamp.strftime('%Y%m%d_%H%M%S')}_{content_hash[:8]}"
+        stats = content_stats(content)
+        # Metadata only - no file copies for storage efficiency
+        return {
+            "run_id": run_id,
+            "timestamp": timestamp.isoformat(),
+            "date": timestamp.strftime("%Y-%m-%d"),
+            "time": timestamp.strftime("%H:%M:%S"),
+            "original_filename": filename,
+            "source_format": source_format,
+            "input_size_bytes": stats["input_size_bytes"],
+            "output_size_bytes": output_size,
+            "content_hash": content_hash,
+            "success": success,
+            "error": error,
+            # Additional structural metrics
+            "word_count": stats["word_count"],
+            "line_count": stats["line_count"],
+            "char_count": stats["char_count"],
+        }
+
+    @abstractmethod
+    def _write_records(self, records: list[dict]) -> None:
+        """Stores a batch of history records (called on the writer thread)."""
+        pass
+
+    def _close_store(self) -> None:
+        """Releases store resources (called on the writer thread as it stops)."""
+        pass
+
+    def _write_batch(self, batch: list[tuple]) -> None:
+        if not batch:
+            return
+        records = []
+        for item in batch:
+            try:
+                records.append(self._build_record(item))
+            except Exception as e:
+                logger.error("Failed to build history record: %s", e)
+                self._count("failed")
+            finally:
+                self._dequeued(len(item[3]))
+        if records:
+            try:
+                self._write_records(records)
+                self._count("written", len(records))
+            except Exception as e:
+                # Do NOT raise - archiving failures should not block main flow
+                logger.error("Failed to archive %s conversion record(s): %s", len(records), e)
+                self._count("failed", len(records))
+        self._count("flushes")
+        logger.debug("Archived %s conversion record(s)", len(records))
+
+    def _run(self) -> None:
+        batch: list[tuple] = []
+        deadline = None
+        while True:
+            timeout = None if deadline is None else max(0.0, deadline - time.monotonic())
+            try:
+                item = self._queue.get(timeout=timeout)
+            except queue.Empty:
+                item = None
+            if isinstance(item, _Flush) or item is _STOP:
+                self._write_batch(batch)
+                batch, deadline = [], None
+                if item is _STOP:
+                    self._close_store()
+                    return
+                item.done.set()
+                continue
+            if item is not None:
+                batch.append(item)
+                if deadline is None:
+                    deadline = time.monotonic() + self.flush_interval
+            if len(batch) >= self.batch_size or (deadline is not None and time.monotonic() >= deadline):
+                self._write_batch(batch)
+                batch, deadline = [], None
+
+    def flush(self, timeout: float = 10.0) -> bool:
+        """Waits until every record queued so far has been written."""
+        if self._closed:
+            return True
+        marker = _Flush()
+        self._queue.put(marker)
+        return marker.done.wait(timeout)
+
+    def _stop(self) -> bool:
+        if self._closed:
+            return False
+        self._closed = True
+        self._queue.put(_STOP)
+        self._thread.join()
+        atexit.unregister(self._stop)
+        return True
+
+    def close(self) -> None:
+        """Writes pending records and stops the writer thread."""
+        if not self._stop():
+            return
+        stats = self.stats()
+        logger.info(
+            "Archive writer stopped: %s record(s) written in %s flush(es), %s dropped, %s failed",
+            stats['written'], stats['flushes'], stats['dropped'], stats['failed']
+        )
@@ -0,0 +1,219 @@
+"""
+Directory Watchers - Change notifications for watch mode.
+
+InotifyDirectoryWatcher asks the Linux kernel for events (via libc, no
+extra dependency), so an idle directory costs nothing and a change is
+seen immediately without rescanning. PollingDirectoryWatcher compares
+(size, mtime) snapshots and works everywhere else. Both watch the whole
+tree below the directory.
+"""
+import ctypes
+import ctypes.util
+import os
+import select
+import struct
+import sys
+import time
+from typing import Callable, Iterable, Optional
+from src.domain.ports import DirectoryWatcherPort
+from src.infrastructure.logger import logger
+
+# <sys/inotify.h>
+IN_MODIFY = 0x00000002
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_FROM = 0x00000040
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+IN_Q_OVERFLOW = 0x00004000
+IN_IGNORED = 0x00008000
+IN_ISDIR = 0x40000000
+WATCH_MASK = IN_MODIFY | IN_CLOSE_WRITE | IN_MOVED_FROM | IN_MOVED_TO | IN_CREATE | IN_DELETE
+
+_EVENT_HEADER = struct.Struct("iIII")
+_READ_SIZE = 64 * 1024
+
+
+def _matches(name: str, extensions: tuple[str, ...]) -> bool:
+    return name.lower().endswith(extensions)
+
+
+def _walk_files(directory: str, extensions: tuple[str, ...]) -> Iterable[str]:
+    """Files below directory with one of the extensions (symlinked directories are not followed)."""
+    for dirpath, _, filenames in os.walk(directory):
+        for name in filenames:
+            if _matches(name, extensions):
+                yield os.path.join(dirpath, name)
+
+
+class PollingDirectoryWatcher(DirectoryWatcherPort):
+    """
+    Portable watcher: stats the tree's files every interval seconds.
+
+    Args:
+        directory: Directory to watch (recursively)
+        extensions: Lower-case suffixes of the files of interest
+        interval: Seconds between scans
+        list_files: Lists the files to compare between scans instead of
+            walking the whole tree (e.g. a scanner that skips excluded
+            directories)
+    """
+
+    def __init__(
+        self,
+        directory: str,
+        extensions: tuple[str, ...],
+        interval: float = 1.0,
+        list_files: Optional[Callable[[], Iterable[str]]] = None,
+    ):
+        self.directory = directory
+        self.extensions = tuple(extensions)
+        self.interval = interval
+        self.list_files = list_files or (lambda: _walk_files(self.directory, self.extensions))
+        self._snapshot = self._scan()
+        self._next_scan = time.monotonic() + interval
+
+    def _scan(self) -> dict[str, tuple[int, int]]:
+        snapshot = {}
+        for path in self.list_files():
+            try:
+                stat = os.stat(path)
+            except FileNotFoundError:
+                continue
+            snapshot[path] = (stat.st_size, stat.st_mtime_ns)
+        return snapshot
+
+    def wait_for_changes(self, timeout: float) -> set[str]:
+        deadline = time.monotonic() + timeout
+        while True:
+            now = time.monotonic()
+            if now < self._next_scan:
+                # Scans stay interval apart however often the caller polls
+                if now >= deadline:
+                    return set()
+                time.sleep(min(self._next_scan, deadline) - now)
+                continue
+            self._next_scan = now + self.interval
+            snapshot = self._scan()
+            changed = {
+                path for path in snapshot.keys() | self._snapshot.keys()
+                if snapshot.get(path) != self._snapshot.get(path)
+            }
+            self._snapshot = snapshot
+            if changed or time.monotonic() >= deadline:
+                return changed
+
+
+class InotifyDirectoryWatcher(DirectoryWatcherPort):
+    """
+    Linux watcher backed by inotify, with one watch per directory of the
+    tree; directories created or moved in later are watched as they appear.
+
+    Raises OSError when inotify is unavailable (not Linux, no libc symbol,
+    watch limit reached); use create_directory_watcher() to fall back.
+    """
+
+    def __init__(self, directory: str, extensions: tuple[str, ...]):
+        if not sys.platform.startswith("linux"):
+            raise OSError("inotify is only available on Linux")
+        self.directory = directory
+        self.extensions = tuple(extensions)
+        self._libc = ctypes.CDLL(ctypes.util.find_library("c") or "libc.so.6", use_errno=True)
+        self._fd = self._libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+        if self._fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+        # watch descriptor -> watched directory
+        self._watches: dict[int, str] = {}
+        try:
+            self._watch_tree(directory, required=True)
+        except OSError:
+            os.close(self._fd)
+            raise
+
+    def _watch_tree(self, root: str, required: bool = False) -> set[str]:
+        """Watches root and its subdirectories; returns the matching files already in them."""
+        found = set()
+        for dirpath, dirnames, filenames in os.walk(root):
+            wd = self._libc.inotify_add_watch(self._fd, os.fsencode(dirpath), WATCH_MASK)
+            if wd < 0:
+                errno = ctypes.get_errno()
+                if required and dirpath == root:
+                    raise OSError(errno, f"inotify_add_watch failed for {dirpath}")
+                logger.warning("Cannot watch %s: %s", dirpath, os.strerror(errno))
+                dirnames.clear()
+                continue
+            self._watches[wd] = dirpath
+            found.update(os.path.join(dirpath, name) for name in filenames if _matches(name, self.extensions))
+        return found
+
+    def _unwatch_tree(self, root: str) -> None:
+        """Drops the watches of a directory moved out of view."""
+        for wd, path in list(self._watches.items()):
+            if path == root or path.startswith(root + os.sep):
+                self._libc.inotify_rm_watch(self._fd, wd)
+                del self._watches[wd]
+
+    def wait_for_changes(self, timeout: float) -> set[str]:
+        readable, _, _ = select.select([self._fd], [], [], timeout)
+        if not readable:
+            return set()
+        changed = set()
+        try:
+            while True:
+                changed |= self._parse(os.read(self._fd, _READ_SIZE))
+        except BlockingIOError:
+            pass
+        return changed
+
+    def _parse(self, data: bytes) -> set[str]:
+        changed, offset = set(), 0
+        while offset + _EVENT_HEADER.size <= len(data):
+            wd, mask, _, length = _EVENT_HEADER.unpack_from(data, offset)
+            offset += _EVENT_HEADER.size
+            name = data[offset:offset + length].rstrip(b"\0").decode(errors="surrogateescape")
+            offset += length
+            if mask & IN_Q_OVERFLOW:
+                # Events were lost: report every file so nothing is missed
+                logger.warning("inotify queue overflowed; rescanning %s", self.directory)
+                changed |= set(_walk_files(self.directory, self.extensions))
+                continue
+            if mask & IN_IGNORED:
+                # The directory was deleted (or unwatched)
+                self._watches.pop(wd, None)
+                continue
+            parent = self._watches.get(wd)
+            if parent is None or not name:
+                continue
+            path = os.path.join(parent, name)
+            if mask & IN_ISDIR:
+                if mask & (IN_CREATE | IN_MOVED_TO):
+                    # Files may have landed before the new watch was in place
+                    changed |= self._watch_tree(path)
+                elif mask & IN_MOVED_FROM:
+                    self._unwatch_tree(path)
+                    # Gone from the tree: lets the caller notice removed inputs
+                    changed.add(path)
+            elif _matches(name, self.extensions):
+                changed.add(path)
+        return changed
+
+    def close(self) -> None:
+        if self._fd >= 0:
+            os.close(self._fd)
+            self._fd = -1
+
+
+def create_directory_watcher(
+    directory: str,
+    extensions: tuple[str, ...],
+    poll_interval: float = 1.0,
+    list_files: Optional[Callable[[], Iterable[str]]] = None,
+) -> DirectoryWatcherPort:
+    """inotify where available, otherwise mtime polling (of list_files, when given)."""
+    try:
+        watcher = InotifyDirectoryWatcher(directory, extensions)
+        logger.info("Watching %s with inotify", directory)
+        return watcher
+    except (OSError, AttributeError) as e:
+        logger.info("inotify unavailable (%s); polling %s every %ss", e, directory, poll_interval)
+        return PollingDirectoryWatcher(directory, extensions, poll_interval, list_files)
@@ -0,0 +1,80 @@
+"""
+Format Router - Picks a PDF converter per source format.
+
+The service talks to a single PDFConverterPort; the router forwards each
+request to the converter registered for its source format (e.g. the
+streaming text renderer for ``.txt``) and falls back to a default one.
+Sectioned rendering is offered for the formats whose converter supports it.
+"""
+from typing import Optional
+from src.domain.model import ConversionRequest, ConversionResult, SourceFormat
+from src.domain.exceptions import UnsupportedFormatError
+from src.domain.ports import PDFConverterPort, SectionRendererPort
+
+
+class FormatRouter(PDFConverterPort, SectionRendererPort):
+    """
+    Args:
+        default: Converter used for formats without a dedicated one
+        by_format: Dedicated converters keyed by source format
+    """
+
+    def __init__(self, default: PDFConverterPort, by_format: Optional[dict[SourceFormat, PDFConverterPort]] = None):
+        self.default = default
+        self.by_format = dict(by_format or {})
+
+    def converter_for(self, source_format: SourceFormat) -> PDFConverterPort:
+        return self.by_format.get(source_format, self.default)
+
+    def convert(self, request: ConversionRequest, output_dir: str) -> ConversionResult:
+        return self.converter_for(request.source_format).convert(request, output_dir)
+
+    def render(self, request: ConversionRequest, spill_threshold: Optional[int] = None) -> ConversionResult:
+        return self.converter_for(request.source_format).render(request, spill_threshold)
+
+    def _section_renderer(self, request: ConversionRequest) -> SectionRendererPort:
+        converter = self.converter_for(request.source_format)
+        if not isinstance(converter, SectionRendererPort):
+            raise UnsupportedFormatError(f"Sectioned rendering is not supported for {request.source_format.value}")
+        return converter
+
+    def split_sections(self, request: ConversionRequest, min_chars: int) -> list[ConversionRequest]:
+        converter = self.converter_for(request.source_format)
+        if not isinstance(converter, SectionRendererPort):
+            return [request]
+        return converter.split_sections(request, min_chars)
+
+    def render_section(self, request: ConversionRequest) -> ConversionResult:
+        return self._section_renderer(request).render_section(request)
+
+    def number_section(self, request: ConversionRequest, pdf: bytes, first_page: int) -> bytes:
+        return self._section_renderer(request).number_section(request, pdf, first_page)
+
+    def merge_sections(
+        self,
+        request: ConversionRequest,
+        sections: list[bytes],
+        output_dir: Optional[str] = None,
+        spill_threshold: Optional[int] = None,
+    ) -> ConversionResult:
+        return self._section_renderer(request).merge_sections(
+            request, sections, output_dir, spill_threshold
+        )
+
+    def _converters(self) -> list[PDFConverterPort]:
+        return [self.default, *self.by_format.values()]
+
+    def warm_up(self) -> None:
+        for converter in self._converters():
+            warm_up = getattr(converter, "warm_up", None)
+            if warm_up:
+                warm_up()
+
+    def options_key(self) -> str:
+        return "|".join(converter.options_key() for converter in self._converters())
+
+    def themes_available(self) -> list[str]:
+        return self.default.themes_available()
+
+    def applies_themes(self, source_format: SourceFormat) -> bool:
+        return self.converter_for(source_format).applies_themes(source_format)
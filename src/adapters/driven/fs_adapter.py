@@ -1,6 +1,42 @@
+import fnmatch
 import os
-from pathlib import Path
+import re
+from typing import Callable, Iterator, Optional
+from src.domain.model import FileScan
 from src.domain.ports import FileSystemPort
+from src.infrastructure.logger import logger
+
+
+def _compile_patterns(patterns: tuple[str, ...]) -> Optional[re.Pattern]:
+    """One regex for a list of globs, so each path is matched once."""
+    if not patterns:
+        return None
+    return re.compile("|".join(f"(?:{fnmatch.translate(p)})" for p in patterns))
+
+
+def scan_filter(directory: str, scan: FileScan) -> Callable[[str], bool]:
+    """
+    The selection of scan_files as a test on single paths below directory
+    (e.g. paths reported by a watcher): same extensions, include and
+    exclude globs (everything below an excluded directory is excluded) and
+    shard. Only the path is looked at, so deleted files can be tested too.
+    """
+    suffixes = tuple(ext.lower() for ext in scan.extensions)
+    include = _compile_patterns(scan.include)
+    exclude = _compile_patterns(scan.exclude)
+
+    def selects(path: str) -> bool:
+        relative = os.path.relpath(path, directory).replace(os.sep, "/")
+        if relative.startswith("../") or not relative.lower().endswith(suffixes):
+            return False
+        if exclude is not None:
+            parts = relative.split("/")
+            if any(exclude.match("/".join(parts[:i])) for i in range(1, len(parts) + 1)):
+                return False
+        return (include is None or include.match(relative) is not None) and scan.in_shard(relative)
+
+    return selects
+
 
 class LocalFileSystemAdapter(FileSystemPort):
     def read_file(self, path: str) -> str:
@@ -10,16 +46,63 @@ class LocalFileSystemAdapter(FileSystemPort):
         with open(path, 'r', encoding='utf-8') as f:
             return f.read()
 
+    def read_bytes(self, path: str) -> bytes:
+        if not os.path.exists(path):
+            raise FileNotFoundError(f"File not found: {path}")
+
+        with open(path, 'rb') as f:
+            return f.read()
+
     def save_file(self, path: str, content: bytes) -> str:
         with open(path, "wb") as f:
             f.write(content)
         return os.path.abspath(path)
 
     def list_files(self, directory: str, extensions: list[str]) -> list[str]:
-        path = Path(directory)
-        if not path.exists():
+        """Files directly in directory with one of the extensions (one directory read)."""
+        suffixes = tuple(ext.lower() for ext in extensions)
+        try:
+            with os.scandir(directory) as entries:
+                return [e.path for e in entries if e.name.lower().endswith(suffixes) and e.is_file()]
+        except FileNotFoundError:
             return []
-        files = []
-        for ext in extensions:
-            files.extend([str(p) for p in path.glob(f"*{ext}")])
-        return files
+
+    def scan_files(self, directory: str, scan: FileScan) -> Iterator[str]:
+        """
+        Depth-first walk over os.scandir: one directory read per directory,
+        file types from the directory entries (no extra stat), nothing held
+        beyond the pending directories. Entries are visited in name order so
+        every node sees the same sequence. Symlinked directories are not
+        followed (no cycles); unreadable directories are logged and skipped.
+        """
+        suffixes = tuple(ext.lower() for ext in scan.extensions)
+        include = _compile_patterns(scan.include)
+        exclude = _compile_patterns(scan.exclude)
+        # (absolute path, path relative to the root with a trailing "/")
+        pending = [(directory, "")]
+        while pending:
+            path, prefix = pending.pop()
+            try:
+                with os.scandir(path) as it:
+                    entries = sorted(it, key=lambda e: e.name)
+            except FileNotFoundError:
+                continue
+            except PermissionError as e:
+                logger.warning("Skipping unreadable directory %s: %s", path, e)
+                continue
+            subdirs = []
+            for entry in entries:
+                relative = prefix + entry.name
+                if exclude is not None and exclude.match(relative):
+                    continue
+                if entry.is_dir(follow_symlinks=False):
+                    subdirs.append((entry.path, relative + "/"))
+                elif (
+                    entry.name.lower().endswith(suffixes)
+                    and (include is None or include.match(relative))
+                    and scan.in_shard(relative)
+                    and entry.is_file()
+                ):
+                    yield entry.path
+            # Reversed onto the stack so subdirectories are walked in name order
+            pending.extend(reversed(subdirs))
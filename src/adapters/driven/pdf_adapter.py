@@ -1,103 +1,112 @@
+import html
+import io
 import os
 import re
+import tempfile
+import threading
+from dataclasses import replace
+from typing import BinaryIO, Optional
 import markdown
+from reportlab import rl_config
 from xhtml2pdf import pisa
 from src.domain.model import ConversionRequest, ConversionResult, SourceFormat
-from src.domain.ports import PDFConverterPort
+from src.domain.ports import PDFConverterPort, SectionRendererPort
+from src.adapters.driven import sections
+from src.adapters.driven.theming import DEFAULT_THEME, Theme, ThemeRegistry
+from src.infrastructure.metrics import timed
 
-class Xhtml2PdfAdapter(PDFConverterPort):
-    def __init__(self, css_path: str = None):
+# Reproducible output: fixed document dates and IDs, so identical input
+# renders to identical bytes and a PDF's ETag can be strong
+rl_config.invariant = 1
+
+
+class SpillBuffer(io.RawIOBase):
+    """
+    Write-only PDF sink that stays in memory until spill_threshold bytes,
+    then moves its content to a temporary file on disk.
+    """
+
+    def __init__(self, spill_threshold: Optional[int] = None):
+        self.spill_threshold = spill_threshold
+        self._memory = io.BytesIO()
+        self._file = None
+        self.size = 0
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, data) -> int:
+        if self._file is None and self.spill_threshold is not None \
+                and self.size + len(data) > self.spill_threshold:
+            self._file = tempfile.NamedTemporaryFile(suffix=".pdf", delete=False)
+            self._file.write(self._memory.getbuffer())
+            self._memory = io.BytesIO()
+        (self._file or self._memory).write(data)
+        self.size += len(data)
+        return len(data)
+
+    def tell(self) -> int:
+        # PDF writers record object offsets as they go
+        return self.size
+
+    def to_result(self) -> ConversionResult:
+        if self._file is not None:
+            self._file.close()
+            return ConversionResult(file_path=self._file.name, size_bytes=self.size, success=True)
+        return ConversionResult(
+            file_path="", size_bytes=self.size, success=True, content=self._memory.getvalue()
+        )
+
+    def discard(self) -> None:
+        if self._file is not None:
+            self._file.close()
+            os.remove(self._file.name)
+
+
+MARKDOWN_EXTENSIONS = ['tables', 'fenced_code', 'codehilite']
+
+
+class Xhtml2PdfAdapter(PDFConverterPort, SectionRendererPort):
+    def __init__(self, css_path: str = None, theme: str = DEFAULT_THEME):
         self.css_path = css_path
-        # CSS compatible with xhtml2pdf (ReportLab)
-        self.default_css = """
-        <style>
-            @page {
-                size: a4;
-                margin: 2.5cm;
-                @frame footer_frame {
-                    -pdf-frame-content: footerContent;
-                    bottom: 1cm;
-                    margin-left: 2.5cm;
-                    margin-right: 2.5cm;
-                    height: 1cm;
-                }
-            }
-            body {
-                font-family: 'Helvetica', sans-serif;
-                font-size: 11pt;
-                line-height: 1.5;
-                color: #000000; /* FORCE BLACK TEXT */
-            }
-            h1 { 
-                font-size: 22pt; 
-                color: #000000; 
-                border-bottom: 2px solid #000000; 
-                padding-bottom: 5px; 
-                margin-top: 20px;
-                margin-bottom: 15px;
-            }
-            h2 { 
-                font-size: 16pt; 
-                color: #000000; 
-                margin-top: 18px; 
-                margin-bottom: 10px;
-                font-weight: bold;
-            }
-            h3 { 
-                font-size: 14pt; 
-                color: #000000; 
-                font-weight: bold;
-                margin-top: 15px;
-                margin-bottom: 8px;
-            }
-            p {
-                margin-bottom: 10px;
-                text-align: justify;
-            }
-            code { 
-                background-color: #f5f5f5; 
-                font-family: 'Courier New', Courier, monospace; 
-                color: #000000;
-            }
-            pre { 
-                background-color: #f5f5f5; 
-                padding: 10px; 
-                border: 1px solid #cccccc; 
-                margin-bottom: 15px;
-            }
-            ul, ol {
-                display: block;
-                margin-top: 5px;
-                margin-bottom: 10px;
-                margin-left: 20px;
-                padding-left: 10px;
-            }
-            li {
-                display: list-item; /* Restore bullets */
-                margin-bottom: 5px;
-                color: #000000;
-                list-style-type: disc; 
-            }
-            table { 
-                border: 1px solid #000000; 
-                width: 100%; 
-                border-collapse: collapse; 
-                margin-bottom: 15px;
-            }
-            th { 
-                background-color: #e0e0e0; 
-                font-weight: bold; 
-                padding: 8px; 
-                border: 1px solid #000000; 
-                color: #000000;
-            }
-            td { 
-                padding: 8px; 
-                border: 1px solid #000000; 
-                color: #000000;
-            }
-        </style>
-        """
+        # A custom stylesheet becomes the adapter's default theme
+        self.themes = ThemeRegistry(extra={"custom": css_path} if css_path else None)
+        self.default_theme = "custom" if css_path else theme
+        # markdown.Markdown is not thread-safe: one reusable instance per thread
+        self._local = threading.local()
+
+    def __getstate__(self):
+        # Thread-local parsers are rebuilt on the other side of a pickle; render
+        # workers unpickle the adapter once (install_worker_converter) and keep them
+        state = self.__dict__.copy()
+        del state['_local']
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._local = threading.local()
+
+    def _markdown(self) -> markdown.Markdown:
+        md = getattr(self._local, 'md', None)
+        if md is None:
+            md = markdown.Markdown(extensions=MARKDOWN_EXTENSIONS)
+            self._local.md = md
+        return md.reset()
+
+    def warm_up(self) -> None:
+        """Renders a tiny document so imports, fonts and parsers are loaded before real traffic."""
+        self.render(ConversionRequest(
+            content="# Warm-up\n\n- item\n\n`code`",
+            source_format=SourceFormat.MARKDOWN,
+            output_filename="warm_up.pdf"
+        ))
+
+    def options_key(self) -> str:
+        # Theme file changes invalidate previously cached renders
+        return f"{type(self).__name__}:{self.default_theme}:{self.themes.fingerprint()}"
+
+    def themes_available(self) -> list[str]:
+        return self.themes.names()
 
     def _preprocess_markdown(self, text: str) -> str:
         """
@@ -110,60 +119,91 @@ class Xhtml2PdfAdapter(PDFConverterPort):
         text = re.sub(r'([^\n])\n(\s*\d+\. )', r'\1\n\n\2', text)
         return text
 
+    def _build_html(
+        self,
+        request: ConversionRequest,
+        theme: Optional[Theme] = None,
+        timings: Optional[dict] = None,
+        page_numbers: bool = True,
+    ) -> str:
+        """Converts the request content into the full HTML document."""
+        timings = {} if timings is None else timings
+        theme = theme or self.themes.get(request.theme or self.default_theme)
+        # Convert Content to HTML
+        html_body = ""
+        if request.source_format == SourceFormat.MARKDOWN:
+            # Preprocess markdown content
+            with timed(timings, "preprocess"):
+                processed_content = self._preprocess_markdown(request.content)
+            with timed(timings, "html"):
+                html_body = self._markdown().convert(processed_content)
+        else:
+            html_body = f"<pre>{html.escape(request.content)}</pre>"
+
+        # Full HTML from the precompiled template
+        with timed(timings, "html"):
+            return self.themes.render_html(theme, html_body, page_numbers)
+
+    def _write_html(self, html: str, theme: Theme, dest: BinaryIO, timings: dict[str, float]) -> None:
+        # Style rules come pre-parsed from the theme instead of the document
+        token = self.themes.activate(theme)
+        try:
+            with timed(timings, "pdf_render"):
+                pisa_status = pisa.CreatePDF(src=html, dest=dest)
+        finally:
+            self.themes.deactivate(token)
+        if pisa_status.err:
+            raise RuntimeError(f"PDF generation error: {pisa_status.err}")
+
+    def _write_pdf(self, request: ConversionRequest, dest: BinaryIO, page_numbers: bool = True) -> dict[str, float]:
+        """Renders the request as PDF into a writable binary stream; returns stage timings."""
+        timings: dict[str, float] = {}
+        theme = self.themes.get(request.theme or self.default_theme)
+        html = self._build_html(request, theme, timings, page_numbers)
+        self._write_html(html, theme, dest, timings)
+        return timings
+
+    @staticmethod
+    def _output_path(request: ConversionRequest, output_dir: str) -> str:
+        filename = request.output_filename or f"output_{int(request.created_at.timestamp())}.pdf"
+        if not filename.endswith('.pdf'):
+            filename += ".pdf"
+        return os.path.join(output_dir, filename)
+
     def convert(self, request: ConversionRequest, output_dir: str) -> ConversionResult:
         try:
-            filename = request.output_filename or f"output_{int(request.created_at.timestamp())}.pdf"
-            if not filename.endswith('.pdf'):
-                filename += ".pdf"
-            
-            output_path = os.path.join(output_dir, filename)
-
-            # Convert Content to HTML
-            html_body = ""
-            if request.source_format == SourceFormat.MARKDOWN:
-                # Preprocess markdown content
-                processed_content = self._preprocess_markdown(request.content)
-                html_body = markdown.markdown(
-                    processed_content,
-                    extensions=['tables', 'fenced_code', 'codehilite']
-                )
-            else:
-                html_body = f"<pre>{request.content}</pre>"
-
-            # Full HTML
-            full_html = f"""
-            <html>
-            <head>
-                <meta charset="utf-8"/>
-                {self.default_css}
-            </head>
-            <body>
-                {html_body}
-                <div id="footerContent" style="text-align:center;">
-                    Page <pdf:pagenumber>
-                </div>
-            </body>
-            </html>
-            """
+            output_path = self._output_path(request, output_dir)
 
             # Generate PDF
             with open(output_path, "wb") as output_file:
-                pisa_status = pisa.CreatePDF(
-                    src=full_html,
-                    dest=output_file
-                )
-            
-            if pisa_status.err:
-                 raise RuntimeError(f"PDF generation error: {pisa_status.err}")
+                timings = self._write_pdf(request, output_file)
                 
             size = os.path.getsize(output_path)
             return ConversionResult(
                 file_path=os.path.abspath(output_path),
                 size_bytes=size,
-                success=True
+                success=True,
+                timings=timings
+            )
+
+        except Exception as e:
+            return ConversionResult(
+                file_path="",
+                size_bytes=0,
+                success=False,
+                error_message=str(e),
+                created_at=request.created_at # Keep original timestamp
             )
 
+    def render(self, request: ConversionRequest, spill_threshold: Optional[int] = None) -> ConversionResult:
+        buffer = SpillBuffer(spill_threshold)
+        try:
+            timings = self._write_pdf(request, buffer)
+            result = buffer.to_result()
+            result.timings = timings
+            return result
         except Exception as e:
+            buffer.discard()
             return ConversionResult(
                 file_path="",
                 size_bytes=0,
@@ -171,3 +211,73 @@ class Xhtml2PdfAdapter(PDFConverterPort):
                 error_message=str(e),
                 created_at=request.created_at # Keep original timestamp
             )
+
+    def split_sections(self, request: ConversionRequest, min_chars: int) -> list[ConversionRequest]:
+        if request.source_format != SourceFormat.MARKDOWN or len(request.content) < 2 * min_chars:
+            return [request]
+        parts = sections.split_markdown_sections(request.content, min_chars)
+        return [replace(request, content=part, precomputed_hash=None) for part in parts]
+
+    def render_section(self, request: ConversionRequest) -> ConversionResult:
+        try:
+            buffer = io.BytesIO()
+            timings = self._write_pdf(request, buffer, page_numbers=False)
+            pdf = buffer.getvalue()
+            return ConversionResult(
+                file_path="",
+                size_bytes=len(pdf),
+                success=True,
+                content=pdf,
+                timings=timings,
+                page_count=sections.page_count(pdf),
+            )
+        except Exception as e:
+            return ConversionResult(
+                file_path="",
+                size_bytes=0,
+                success=False,
+                error_message=str(e),
+                created_at=request.created_at
+            )
+
+    def number_section(self, request: ConversionRequest, pdf: bytes, first_page: int) -> bytes:
+        # An overlay of blank pages whose footers carry the page numbers,
+        # laid out by the same template and theme as the section itself
+        theme = self.themes.get(request.theme or self.default_theme)
+        blank_pages = "<pdf:nextpage />".join(["<p>&nbsp;</p>"] * sections.page_count(pdf))
+        overlay = io.BytesIO()
+        with sections.numbered_from(first_page):
+            self._write_html(self.themes.render_html(theme, blank_pages), theme, overlay, {})
+        return sections.stamp_pages(pdf, overlay.getvalue())
+
+    def merge_sections(
+        self,
+        request: ConversionRequest,
+        parts: list[bytes],
+        output_dir: Optional[str] = None,
+        spill_threshold: Optional[int] = None,
+    ) -> ConversionResult:
+        buffer = None
+        try:
+            if output_dir is None:
+                buffer = SpillBuffer(spill_threshold)
+                sections.concatenate(parts, buffer)
+                return buffer.to_result()
+            output_path = self._output_path(request, output_dir)
+            with open(output_path, "wb") as output_file:
+                sections.concatenate(parts, output_file)
+            return ConversionResult(
+                file_path=os.path.abspath(output_path),
+                size_bytes=os.path.getsize(output_path),
+                success=True
+            )
+        except Exception as e:
+            if buffer is not None:
+                buffer.discard()
+            return ConversionResult(
+                file_path="",
+                size_bytes=0,
+                success=False,
+                error_message=str(e),
+                created_at=request.created_at
+            )
@@ -0,0 +1,154 @@
+"""
+Tiered Render Cache - Content-addressed storage for rendered PDFs.
+
+Identical sources rendered with identical options always produce the same
+PDF, so the bytes are cached under a key derived from the content hash,
+source format and converter options. A small in-memory tier serves hot
+documents; an optional on-disk tier survives restarts. Both tiers evict
+least-recently-used entries once their byte budget is exceeded.
+"""
+import os
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Optional
+from src.domain.ports import RenderCachePort
+from src.infrastructure.logger import logger
+
+
+class TieredRenderCache(RenderCachePort):
+    """
+    Two-tier (memory + disk) LRU cache with byte budgets.
+
+    A budget of 0 disables the corresponding tier.
+    """
+
+    def __init__(
+        self,
+        memory_budget_bytes: int = 64 * 1024 * 1024,
+        disk_dir: Optional[str] = "data/cache",
+        disk_budget_bytes: int = 512 * 1024 * 1024,
+    ):
+        self.memory_budget_bytes = memory_budget_bytes
+        self.disk_budget_bytes = disk_budget_bytes if disk_dir else 0
+        self.disk_dir = Path(disk_dir) if disk_dir else None
+
+        self._memory: "OrderedDict[str, bytes]" = OrderedDict()
+        self._memory_bytes = 0
+        self._disk: "OrderedDict[str, int]" = OrderedDict()
+        self._disk_bytes = 0
+        self._lock = threading.Lock()
+
+        self.hits = 0
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+        if self.disk_budget_bytes > 0:
+            self.disk_dir.mkdir(parents=True, exist_ok=True)
+            self._load_disk_index()
+
+    def _load_disk_index(self) -> None:
+        """Rebuilds the disk LRU order from file mtimes (oldest first)."""
+        entries = []
+        with os.scandir(self.disk_dir) as it:
+            for entry in it:
+                if entry.is_file() and entry.name.endswith(".pdf"):
+                    stat = entry.stat()
+                    entries.append((stat.st_mtime, entry.name[:-4], stat.st_size))
+        for _, key, size in sorted(entries):
+            self._disk[key] = size
+            self._disk_bytes += size
+        self._evict_disk()
+
+    def _disk_path(self, key: str) -> Path:
+        return self.disk_dir / f"{key}.pdf"
+
+    def get(self, key: str) -> Optional[bytes]:
+        with self._lock:
+            data = self._memory.get(key)
+            if data is not None:
+                self._memory.move_to_end(key)
+                self.hits += 1
+                self.memory_hits += 1
+                return data
+            on_disk = key in self._disk
+
+        if on_disk:
+            try:
+                path = self._disk_path(key)
+                data = path.read_bytes()
+                os.utime(path)
+            except OSError:
+                data = None
+            with self._lock:
+                if data is not None:
+                    self._disk.move_to_end(key)
+                    self.hits += 1
+                    self.disk_hits += 1
+                    self._put_memory(key, data)
+                    return data
+                # File vanished underneath us
+                self._disk_bytes -= self._disk.pop(key, 0)
+
+        with self._lock:
+            self.misses += 1
+        return None
+
+    def put(self, key: str, data: bytes) -> None:
+        with self._lock:
+            self._put_memory(key, data)
+
+        if self.disk_budget_bytes <= 0 or len(data) > self.disk_budget_bytes:
+            return
+        try:
+            path = self._disk_path(key)
+            tmp_path = path.with_suffix(f".{threading.get_ident()}.tmp")
+            tmp_path.write_bytes(data)
+            os.replace(tmp_path, path)
+        except OSError as e:
+            logger.warning("Render cache disk write failed: %s", e)
+            return
+        with self._lock:
+            self._disk_bytes -= self._disk.pop(key, 0)
+            self._disk[key] = len(data)
+            self._disk_bytes += len(data)
+            self._evict_disk()
+
+    def _put_memory(self, key: str, data: bytes) -> None:
+        # Caller holds the lock
+        if len(data) > self.memory_budget_bytes:
+            return
+        self._memory_bytes -= len(self._memory.pop(key, b""))
+        self._memory[key] = data
+        self._memory_bytes += len(data)
+        while self._memory_bytes > self.memory_budget_bytes:
+            _, evicted = self._memory.popitem(last=False)
+            self._memory_bytes -= len(evicted)
+            self.evictions += 1
+
+    def _evict_disk(self) -> None:
+        # Caller holds the lock
+        while self._disk_bytes > self.disk_budget_bytes and self._disk:
+            key, size = self._disk.popitem(last=False)
+            self._disk_bytes -= size
+            self.evictions += 1
+            try:
+                self._disk_path(key).unlink()
+            except OSError:
+                pass
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "memory_hits": self.memory_hits,
+                "disk_hits": self.disk_hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "memory_entries": len(self._memory),
+                "memory_bytes": self._memory_bytes,
+                "disk_entries": len(self._disk),
+                "disk_bytes": self._disk_bytes,
+            }
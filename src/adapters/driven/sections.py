@@ -0,0 +1,145 @@
+"""
+Sectioned rendering helpers for very large Markdown documents.
+
+A large document is split at its top-level headings into sections that
+render independently (each starting on a new page), so several worker
+processes can lay them out at once. Sections are rendered without page
+numbers; once every section's page count is known, each one gets its
+footers from an overlay rendered with the document template, numbered
+from the section's first page (see numbered_from), and the numbered
+sections are concatenated into the final PDF.
+"""
+import contextlib
+import contextvars
+import io
+import re
+import threading
+from typing import BinaryIO, Iterator
+
+from pypdf import PdfReader, PdfWriter
+from xhtml2pdf import document as pisa_document
+from xhtml2pdf.xhtml2pdf_reportlab import PmlBaseDoc
+
+# Sections are not cut smaller than this (each render has a fixed setup cost)
+MIN_SECTION_CHARS = 20_000
+
+_FENCE = re.compile(r"^\s{0,3}(```|~~~)")
+_HEADING = re.compile(r"^(#{1,6})\s")
+_REFERENCE = re.compile(r"^\s{0,3}\[[^\]]+\]:\s*\S")
+
+# Number of the first page of the document being rendered in this thread
+_first_page: contextvars.ContextVar[int] = contextvars.ContextVar("first_page", default=1)
+# Serializes the PmlBaseDoc swap in numbered_from
+_swap_lock = threading.Lock()
+
+
+class OffsetPmlBaseDoc(PmlBaseDoc):
+    """PmlBaseDoc whose page numbers start at the active first page."""
+
+    def handle_documentBegin(self):
+        super().handle_documentBegin()
+        first_page = _first_page.get()
+        if first_page != 1:
+            # <pdf:pagenumber> reads the canvas counter; doc.page counts pages begun
+            self.canv._pageNumber = first_page
+            self.page = first_page - 1
+
+
+@contextlib.contextmanager
+def numbered_from(first_page: int) -> Iterator[None]:
+    """
+    Documents rendered by this thread inside the block number their pages
+    from first_page. pisa has no option for this and builds its document
+    from the module-level PmlBaseDoc, so OffsetPmlBaseDoc stands in for it
+    only while the block runs. Renders in other threads that start
+    meanwhile get it too, but keep the default first page of 1.
+    """
+    token = _first_page.set(first_page)
+    try:
+        with _swap_lock:
+            pisa_document.PmlBaseDoc = OffsetPmlBaseDoc
+            try:
+                yield
+            finally:
+                pisa_document.PmlBaseDoc = PmlBaseDoc
+    finally:
+        _first_page.reset(token)
+
+
+def split_markdown_sections(text: str, min_chars: int = MIN_SECTION_CHARS) -> list[str]:
+    """
+    Splits Markdown before each top-level heading (the highest heading
+    level used outside code blocks), grouping consecutive headings until a
+    section holds at least min_chars. Reference-style link definitions are
+    repeated in every section so links keep resolving.
+    """
+    lines = text.splitlines(keepends=True)
+    headings: list[tuple[int, int]] = []
+    references: list[str] = []
+    fence = None
+    for number, line in enumerate(lines):
+        match = _FENCE.match(line)
+        if match:
+            if fence is None:
+                fence = match.group(1)
+            elif match.group(1) == fence:
+                fence = None
+            continue
+        if fence is not None:
+            continue
+        heading = _HEADING.match(line)
+        if heading:
+            headings.append((number, len(heading.group(1))))
+        elif _REFERENCE.match(line):
+            references.append(line if line.endswith("\n") else line + "\n")
+
+    if not headings:
+        return [text]
+    top = min(level for _, level in headings)
+    starts = [number for number, level in headings if level == top]
+    # Text before the first heading stays with the first section
+    starts[0] = 0
+
+    sections, current, size = [], [], 0
+    for start, end in zip(starts, starts[1:] + [len(lines)]):
+        chunk = "".join(lines[start:end])
+        if current and size >= min_chars:
+            sections.append("".join(current))
+            current, size = [], 0
+        current.append(chunk)
+        size += len(chunk)
+    if current:
+        if sections and size < min_chars:
+            # A short tail joins the previous section
+            sections[-1] += "".join(current)
+        else:
+            sections.append("".join(current))
+
+    if references and len(sections) > 1:
+        definitions = "\n" + "".join(references)
+        sections = [section + definitions for section in sections]
+    return sections
+
+
+def page_count(pdf: bytes) -> int:
+    return len(PdfReader(io.BytesIO(pdf)).pages)
+
+
+def stamp_pages(pdf: bytes, overlay: bytes) -> bytes:
+    """Draws each overlay page over the matching page of pdf."""
+    writer = PdfWriter(clone_from=PdfReader(io.BytesIO(pdf)))
+    overlay_pages = PdfReader(io.BytesIO(overlay)).pages
+    for page, overlay_page in zip(writer.pages, overlay_pages):
+        page.merge_page(overlay_page)
+        page.compress_content_streams()
+    output = io.BytesIO()
+    writer.write(output)
+    return output.getvalue()
+
+
+def concatenate(parts: list[bytes], dest: BinaryIO) -> None:
+    """Writes the pages of parts, in order, into one PDF."""
+    writer = PdfWriter()
+    for part in parts:
+        writer.append(PdfReader(io.BytesIO(part)))
+    writer.write(dest)
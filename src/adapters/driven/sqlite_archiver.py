@@ -0,0 +1,158 @@
+"""
+SQLite Archiver - Indexed History Storage Adapter.
+
+Keeps the same metadata-only records as the JSONL archive in an embedded
+SQLite database, indexed by content hash, timestamp (date) and status, so
+history queries are index range scans instead of reads of every daily
+file. Pages are keyset-paginated: the cursor is the last record's id, and
+a page costs O(log n + limit) however deep it is.
+"""
+import json
+import sqlite3
+from contextlib import closing
+from datetime import date, timedelta
+from pathlib import Path
+from typing import Optional
+from src.adapters.driven.archive_writer import BufferedArchiver
+from src.domain.model import HistoryPage, HistoryQuery
+from src.domain.ports import HistoryQueryPort
+from src.infrastructure.logger import logger
+
+COLUMNS = (
+    "run_id", "timestamp", "date", "time", "original_filename", "source_format",
+    "input_size_bytes", "output_size_bytes", "content_hash", "success", "error",
+    "word_count", "line_count", "char_count",
+)
+REQUIRED = ("run_id", "timestamp", "date", "time", "content_hash", "success")
+
+# Every index ends in timestamp, so filtered pages come back already ordered
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS conversions (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    run_id TEXT NOT NULL,
+    timestamp TEXT NOT NULL,
+    date TEXT NOT NULL,
+    time TEXT NOT NULL,
+    original_filename TEXT,
+    source_format TEXT,
+    input_size_bytes INTEGER,
+    output_size_bytes INTEGER,
+    content_hash TEXT NOT NULL,
+    success INTEGER NOT NULL,
+    error TEXT,
+    word_count INTEGER,
+    line_count INTEGER,
+    char_count INTEGER
+);
+CREATE INDEX IF NOT EXISTS idx_conversions_timestamp ON conversions (timestamp);
+CREATE INDEX IF NOT EXISTS idx_conversions_hash ON conversions (content_hash, timestamp);
+CREATE INDEX IF NOT EXISTS idx_conversions_success ON conversions (success, timestamp);
+CREATE TABLE IF NOT EXISTS imported_files (
+    name TEXT PRIMARY KEY,
+    records INTEGER NOT NULL,
+    imported_at TEXT NOT NULL DEFAULT CURRENT_TIMESTAMP
+);
+"""
+
+_INSERT = (
+    f"INSERT INTO conversions ({', '.join(COLUMNS)}) "
+    f"VALUES ({', '.join(':' + column for column in COLUMNS)})"
+)
+
+MAX_PAGE_SIZE = 500
+
+
+class SQLiteArchiver(BufferedArchiver, HistoryQueryPort):
+    """
+    Conversion history in SQLite, written in batches by the archive writer.
+
+    Args:
+        db_path: Database file (created with its schema on first use)
+        **writer: Queue and flush settings (see BufferedArchiver)
+    """
+
+    def __init__(self, db_path: str = "data/archive/history.db", **writer):
+        self.db_path = Path(db_path)
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        with closing(self._connect()) as conn:
+            # WAL lets queries read while the writer thread appends
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.executescript(SCHEMA)
+        self._writer_conn: Optional[sqlite3.Connection] = None
+        super().__init__(**writer)
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.db_path, timeout=30)
+        conn.row_factory = sqlite3.Row
+        return conn
+
+    def _write_records(self, records: list[dict]) -> None:
+        # Only the writer thread writes; it keeps one connection open
+        if self._writer_conn is None:
+            self._writer_conn = self._connect()
+        with self._writer_conn:
+            self._writer_conn.executemany(_INSERT, records)
+
+    def _close_store(self) -> None:
+        if self._writer_conn is not None:
+            self._writer_conn.close()
+            self._writer_conn = None
+
+    def query(self, query: HistoryQuery) -> HistoryPage:
+        clauses, params = [], []
+        if query.content_hash is not None:
+            clauses.append("content_hash = ?")
+            params.append(query.content_hash)
+        if query.success is not None:
+            clauses.append("success = ?")
+            params.append(int(query.success))
+        # Dates become timestamp ranges so the timestamp indexes serve them
+        if query.date_from is not None:
+            clauses.append("timestamp >= ?")
+            params.append(date.fromisoformat(query.date_from).isoformat())
+        if query.date_to is not None:
+            clauses.append("timestamp < ?")
+            params.append((date.fromisoformat(query.date_to) + timedelta(days=1)).isoformat())
+        if query.cursor is not None:
+            clauses.append("(timestamp, id) < (SELECT timestamp, id FROM conversions WHERE id = ?)")
+            params.append(query.cursor)
+        where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+        limit = max(1, min(query.limit, MAX_PAGE_SIZE))
+        # One extra row tells whether another page exists
+        sql = f"SELECT * FROM conversions {where} ORDER BY timestamp DESC, id DESC LIMIT ?"
+        with closing(self._connect()) as conn:
+            rows = conn.execute(sql, (*params, limit + 1)).fetchall()
+
+        records = [{**dict(row), "success": bool(row["success"])} for row in rows[:limit]]
+        next_cursor = records[-1]["id"] if len(rows) > limit else None
+        return HistoryPage(records=records, next_cursor=next_cursor)
+
+    def import_jsonl(self, meta_dir: str = "data/archive/metadata") -> int:
+        """
+        Imports daily JSONL history files, each file only once.
+
+        Returns the number of records imported. Malformed lines are skipped.
+        """
+        imported = 0
+        with closing(self._connect()) as conn:
+            done = {row["name"] for row in conn.execute("SELECT name FROM imported_files")}
+            for path in sorted(Path(meta_dir).glob("*.jsonl")):
+                if path.name in done:
+                    continue
+                records = []
+                with open(path, encoding="utf-8") as f:
+                    for number, line in enumerate(f, 1):
+                        try:
+                            record = json.loads(line)
+                            if any(record.get(column) is None for column in REQUIRED):
+                                raise ValueError("missing required field")
+                            records.append({column: record.get(column) for column in COLUMNS})
+                        except (ValueError, AttributeError):
+                            logger.warning("Skipping malformed history line %s:%s", path.name, number)
+                # Records and the file marker commit together, so a re-run never duplicates
+                with conn:
+                    conn.executemany(_INSERT, records)
+                    conn.execute("INSERT INTO imported_files (name, records) VALUES (?, ?)", (path.name, len(records)))
+                imported += len(records)
+                logger.info("Imported %s history record(s) from %s", len(records), path.name)
+        return imported
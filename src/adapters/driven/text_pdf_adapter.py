@@ -0,0 +1,242 @@
+"""
+Streaming plain-text renderer.
+
+Plain-text sources (logs, dumps) do not need HTML layout: every line is
+drawn in a monospace font and pages are cut every N lines. Going through
+xhtml2pdf meant building one giant ``<pre>`` element and a full layout
+tree for it, which for large logs costs minutes and gigabytes of RAM.
+
+This adapter walks the source line by line and writes each page to the
+output as soon as it is full, so memory stays constant no matter how
+large the document is (apart from the source text itself and one offset
+per PDF object). ReportLab provides the page geometry and font metrics;
+the file structure is written incrementally because ReportLab's canvas
+keeps every page in memory until ``save()``.
+"""
+import os
+import re
+import zlib
+from typing import BinaryIO, Iterator, Optional
+from reportlab.lib.pagesizes import A4
+from reportlab.lib.units import cm
+from reportlab.pdfbase.pdfmetrics import stringWidth
+from src.domain.model import ConversionRequest, ConversionResult
+from src.domain.ports import PDFConverterPort
+from src.adapters.driven.pdf_adapter import SpillBuffer
+from src.infrastructure.metrics import timed
+
+# C0 controls (except tab) and DEL would corrupt the text run
+_CONTROL_CHARS = re.compile(r"[\x00-\x08\x0b-\x1f\x7f]")
+
+
+def iter_lines(text: str) -> Iterator[str]:
+    """Yields the lines of text without copying it (unlike splitlines())."""
+    start, length = 0, len(text)
+    while start < length:
+        end = text.find("\n", start)
+        if end == -1:
+            end = length
+        yield text[start:end].rstrip("\r")
+        start = end + 1
+
+
+class _PdfStreamWriter:
+    """Writes PDF objects sequentially and records their offsets for the xref table."""
+
+    # Fixed object numbers; pages start after these
+    CATALOG, PAGES, FONT, INFO = 1, 2, 3, 4
+
+    def __init__(self, dest: BinaryIO):
+        self.dest = dest
+        self.position = 0
+        self.offsets: dict[int, int] = {}
+        self.next_id = 5
+        self.page_ids: list[int] = []
+
+    def _write(self, data: bytes) -> None:
+        self.dest.write(data)
+        self.position += len(data)
+
+    def begin(self) -> None:
+        # Binary comment marks the file as binary for transfer tools
+        self._write(b"%PDF-1.4\n%\xe2\xe3\xcf\xd3\n")
+
+    def object(self, obj_id: int, body: bytes) -> None:
+        self.offsets[obj_id] = self.position
+        self._write(b"%d 0 obj\n" % obj_id + body + b"\nendobj\n")
+
+    def page(self, content: bytes, width: float, height: float) -> None:
+        stream_id, page_id = self.next_id, self.next_id + 1
+        self.next_id += 2
+        data = zlib.compress(content)
+        self.object(
+            stream_id,
+            b"<< /Length %d /Filter /FlateDecode >>\nstream\n" % len(data) + data + b"\nendstream",
+        )
+        self.object(
+            page_id,
+            b"<< /Type /Page /Parent %d 0 R /MediaBox [0 0 %.2f %.2f] "
+            b"/Resources << /Font << /F1 %d 0 R >> >> /Contents %d 0 R >>"
+            % (self.PAGES, width, height, self.FONT, stream_id),
+        )
+        self.page_ids.append(page_id)
+
+    def finish(self, font_name: str) -> None:
+        self.object(
+            self.FONT,
+            b"<< /Type /Font /Subtype /Type1 /BaseFont /%s /Encoding /WinAnsiEncoding >>"
+            % font_name.encode("ascii"),
+        )
+        kids = b" ".join(b"%d 0 R" % page_id for page_id in self.page_ids)
+        self.object(self.PAGES, b"<< /Type /Pages /Kids [%s] /Count %d >>" % (kids, len(self.page_ids)))
+        self.object(self.CATALOG, b"<< /Type /Catalog /Pages %d 0 R >>" % self.PAGES)
+        # No creation date: identical text renders to identical bytes (strong ETags)
+        self.object(self.INFO, b"<< /Producer (text-to-pdf-service) >>")
+
+        xref_at = self.position
+        count = self.next_id
+        lines = [b"xref\n0 %d\n" % count, b"0000000000 65535 f \n"]
+        for obj_id in range(1, count):
+            lines.append(b"%010d 00000 n \n" % self.offsets[obj_id])
+        self._write(b"".join(lines))
+        self._write(
+            b"trailer\n<< /Size %d /Root %d 0 R /Info %d 0 R >>\nstartxref\n%d\n%%%%EOF\n"
+            % (count, self.CATALOG, self.INFO, xref_at)
+        )
+
+
+class StreamingTextAdapter(PDFConverterPort):
+    """
+    Renders plain text directly to PDF, one page at a time.
+
+    Long lines are wrapped at the page width, tabs are expanded and
+    control characters dropped. Characters outside Latin-1/CP1252 (the
+    encoding of the standard PDF fonts) are replaced with '?'. Document
+    themes do not apply to plain text.
+
+    Args:
+        font_name: A standard monospace PDF font
+        font_size: Font size in points
+        margin: Page margin in points
+    """
+
+    def __init__(self, font_name: str = "Courier", font_size: float = 9, margin: float = 2.5 * cm):
+        self.font_name = font_name
+        self.font_size = font_size
+        self.margin = margin
+        self.leading = font_size * 1.25
+        self.page_width, self.page_height = A4
+
+    @property
+    def chars_per_line(self) -> int:
+        usable = self.page_width - 2 * self.margin
+        return max(1, int(usable // stringWidth("M", self.font_name, self.font_size)))
+
+    @property
+    def lines_per_page(self) -> int:
+        usable = self.page_height - 2 * self.margin
+        return max(1, int(usable // self.leading))
+
+    def options_key(self) -> str:
+        return f"{type(self).__name__}:{self.font_name}:{self.font_size}:{self.margin}"
+
+    def _wrap(self, text: str) -> Iterator[str]:
+        """Yields display lines: cleaned, tab-expanded and hard-wrapped."""
+        width = self.chars_per_line
+        for line in iter_lines(text):
+            line = _CONTROL_CHARS.sub("", line.expandtabs(4))
+            if not line:
+                yield ""
+                continue
+            for start in range(0, len(line), width):
+                yield line[start:start + width]
+
+    def _encode(self, line: str) -> bytes:
+        # Control characters are already stripped; literal strings only need
+        # backslash and parentheses escaped (reportlab's escapePDF works
+        # byte by byte in Python and dominated render time)
+        data = line.encode("cp1252", errors="replace")
+        return data.replace(b"\\", b"\\\\").replace(b"(", b"\\(").replace(b")", b"\\)")
+
+    def _page_content(self, lines: list[str], number: int) -> bytes:
+        top = self.page_height - self.margin - self.font_size
+        parts = [
+            b"BT /F1 %.2f Tf %.2f TL %.2f %.2f Td" % (self.font_size, self.leading, self.margin, top)
+        ]
+        for index, line in enumerate(lines):
+            # ' moves to the next line (by TL) before showing the text
+            operator = b"Tj" if index == 0 else b"'"
+            parts.append(b"(%s) %s" % (self._encode(line), operator))
+        parts.append(b"ET")
+        # Centered footer, like the HTML template's footerContent frame
+        footer = f"Page {number}"
+        footer_x = (self.page_width - stringWidth(footer, self.font_name, self.font_size)) / 2
+        parts.append(
+            b"BT /F1 %.2f Tf %.2f %.2f Td (%s) Tj ET"
+            % (self.font_size, footer_x, 1 * cm, self._encode(footer))
+        )
+        return b"\n".join(parts)
+
+    def _write_pdf(self, request: ConversionRequest, dest: BinaryIO) -> dict[str, float]:
+        """Streams the request as PDF into a writable binary stream; returns stage timings."""
+        timings: dict[str, float] = {}
+        with timed(timings, "pdf_render"):
+            self._stream_pages(request, dest)
+        return timings
+
+    def _stream_pages(self, request: ConversionRequest, dest: BinaryIO) -> None:
+        writer = _PdfStreamWriter(dest)
+        writer.begin()
+        per_page = self.lines_per_page
+        page: list[str] = []
+        for line in self._wrap(request.content):
+            page.append(line)
+            if len(page) == per_page:
+                writer.page(self._page_content(page, len(writer.page_ids) + 1), self.page_width, self.page_height)
+                page = []
+        # Always emit at least one page (empty input still yields a valid PDF)
+        if page or not writer.page_ids:
+            writer.page(self._page_content(page, len(writer.page_ids) + 1), self.page_width, self.page_height)
+        writer.finish(self.font_name)
+
+    def convert(self, request: ConversionRequest, output_dir: str) -> ConversionResult:
+        try:
+            filename = request.output_filename or f"output_{int(request.created_at.timestamp())}.pdf"
+            if not filename.endswith('.pdf'):
+                filename += ".pdf"
+
+            output_path = os.path.join(output_dir, filename)
+            with open(output_path, "wb") as output_file:
+                timings = self._write_pdf(request, output_file)
+
+            return ConversionResult(
+                file_path=os.path.abspath(output_path),
+                size_bytes=os.path.getsize(output_path),
+                success=True,
+                timings=timings
+            )
+        except Exception as e:
+            return ConversionResult(
+                file_path="",
+                size_bytes=0,
+                success=False,
+                error_message=str(e),
+                created_at=request.created_at
+            )
+
+    def render(self, request: ConversionRequest, spill_threshold: Optional[int] = None) -> ConversionResult:
+        buffer = SpillBuffer(spill_threshold)
+        try:
+            timings = self._write_pdf(request, buffer)
+            result = buffer.to_result()
+            result.timings = timings
+            return result
+        except Exception as e:
+            buffer.discard()
+            return ConversionResult(
+                file_path="",
+                size_bytes=0,
+                success=False,
+                error_message=str(e),
+                created_at=request.created_at
+            )
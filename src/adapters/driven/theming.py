@@ -0,0 +1,239 @@
+"""
+Theming - Precompiled document templates and pre-parsed stylesheets.
+
+A theme is a CSS file in ``themes/`` (or any CSS file passed explicitly).
+The HTML skeleton is a Jinja2 template compiled once per process. Each
+theme's CSS is split into:
+
+- page rules (``@page``/``@frame``/``@font-face``), which configure the
+  pisa context as a side effect of parsing and are therefore embedded in
+  the document and parsed per render (they are tiny), and
+- style rules, which are parsed once into xhtml2pdf rulesets and reused
+  by every render until the file's mtime changes.
+
+xhtml2pdf's own default stylesheet is likewise parsed once per process.
+"""
+import contextvars
+import threading
+import weakref
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Optional
+
+import jinja2
+from xhtml2pdf import document as pisa_document
+from xhtml2pdf.context import pisaContext, pisaCSSBuilder, pisaCSSParser
+from xhtml2pdf.w3c import css
+from src.domain.exceptions import ThemeNotFoundError
+
+THEMES_DIR = Path(__file__).parent / "themes"
+TEMPLATES_DIR = Path(__file__).parent / "templates"
+DEFAULT_THEME = "default"
+
+# At-rules whose parsing mutates the pisa context (page templates, fonts)
+_CONTEXT_AT_RULES = ("@page", "@frame", "@font-face")
+
+
+def split_css(text: str) -> tuple[str, str]:
+    """Splits CSS into (context at-rules, plain style rules) at top level."""
+    page_parts, style_parts = [], []
+    i, n = 0, len(text)
+    while i < n:
+        if text[i].isspace():
+            i += 1
+            continue
+        if text.startswith("/*", i):
+            end = text.find("*/", i + 2)
+            i = n if end == -1 else end + 2
+            continue
+        brace = text.find("{", i)
+        if brace == -1:
+            break
+        head = text[i:brace].strip()
+        depth, j = 1, brace + 1
+        while j < n and depth:
+            if text[j] == "{":
+                depth += 1
+            elif text[j] == "}":
+                depth -= 1
+            j += 1
+        block = text[i:j].strip()
+        if head.lower().startswith(_CONTEXT_AT_RULES):
+            page_parts.append(block)
+        else:
+            style_parts.append(block)
+        i = j
+    return "\n".join(page_parts), "\n".join(style_parts)
+
+
+def _new_css_parser(context: pisaContext) -> pisaCSSParser:
+    """Builds a CSS parser bound to context, mirroring pisaContext.parseCSS."""
+    builder = pisaCSSBuilder(mediumSet=["all", "print", "pdf"])
+    builder._c = weakref.ref(context)
+    pisaCSSBuilder.c = property(lambda self: self._c())
+    parser = pisaCSSParser(builder)
+    parser.rootPath = context.pathDirectory
+    parser._c = weakref.ref(context)
+    pisaCSSParser.c = property(lambda self: self._c())
+    return parser
+
+
+def _parse_standalone(text: str):
+    """Parses context-free CSS with a throwaway context."""
+    context = pisaContext("")
+    return _new_css_parser(context).parse(text)
+
+
+def _merge(*stylesheets):
+    normal, important = css.CSSRuleset(), css.CSSRuleset()
+    for sheet_normal, sheet_important in stylesheets:
+        normal.mergeStyles(sheet_normal)
+        important.mergeStyles(sheet_important)
+    return normal, important
+
+
+@dataclass
+class Theme:
+    name: str
+    path: Path
+    mtime: float
+    page_css: str
+    style_css: str
+    _parsed: Optional[tuple] = field(default=None, repr=False)
+    _lock: threading.Lock = field(default_factory=threading.Lock, repr=False)
+
+    @classmethod
+    def load(cls, name: str, path: Path) -> "Theme":
+        text = path.read_text(encoding="utf-8")
+        page_css, style_css = split_css(text)
+        return cls(name=name, path=path, mtime=path.stat().st_mtime, page_css=page_css, style_css=style_css)
+
+    @property
+    def parsed_styles(self) -> tuple:
+        """Style rules parsed into (normal, important) rulesets, built once."""
+        if self._parsed is None:
+            with self._lock:
+                if self._parsed is None:
+                    self._parsed = _parse_standalone(self.style_css)
+        return self._parsed
+
+
+# Theme used by the render currently running in this thread/task
+_active_theme: contextvars.ContextVar[Optional[Theme]] = contextvars.ContextVar("active_theme", default=None)
+_default_css_cache: dict[str, tuple] = {}
+_default_css_lock = threading.Lock()
+
+
+class ThemedPisaContext(pisaContext):
+    """
+    pisaContext that reuses pre-parsed stylesheets.
+
+    Only the document's own <style> (the theme's page rules) is parsed per
+    render; the active theme's style rules and xhtml2pdf's default CSS come
+    from process-wide caches. The cascade levels are unchanged: theme rules
+    stay at "user" level, the defaults at "user agent" level.
+    """
+
+    def parseCSS(self):
+        parser = _new_css_parser(self)
+        self.cssBuilder = parser.cssBuilder
+        self.cssParser = parser
+
+        self.css = parser.parse(self.cssText)
+        theme = _active_theme.get()
+        if theme is not None:
+            self.css = _merge(theme.parsed_styles, self.css)
+
+        cached = _default_css_cache.get(self.cssDefaultText)
+        if cached is None:
+            with _default_css_lock:
+                cached = _default_css_cache.setdefault(
+                    self.cssDefaultText, _parse_standalone(self.cssDefaultText)
+                )
+        self.cssDefault = cached
+        self.cssCascade = css.CSSCascadeStrategy(userAgent=self.cssDefault, user=self.css)
+        self.cssCascade.parser = parser
+
+
+# pisaDocument builds its context from this module global; there is no
+# parameter to pass a custom context, so the subclass is installed here.
+pisa_document.pisaContext = ThemedPisaContext
+
+
+class ThemeRegistry:
+    """
+    Loads themes on demand and keeps them until their CSS file changes.
+
+    Args:
+        themes_dir: Directory of ``<name>.css`` theme files
+        extra: Additional named themes pointing at arbitrary CSS files
+    """
+
+    def __init__(self, themes_dir: Path = THEMES_DIR, extra: Optional[dict[str, str]] = None):
+        self.themes_dir = Path(themes_dir)
+        self.extra = {name: Path(path) for name, path in (extra or {}).items()}
+        self._themes: dict[str, Theme] = {}
+        self._lock = threading.Lock()
+        # auto_reload recompiles a template only when its mtime changes
+        self.env = jinja2.Environment(
+            loader=jinja2.FileSystemLoader(str(TEMPLATES_DIR)),
+            autoescape=False,
+            auto_reload=True,
+        )
+
+    def _path_for(self, name: str) -> Path:
+        if name in self.extra:
+            return self.extra[name]
+        path = self.themes_dir / f"{name}.css"
+        # Names are plain identifiers; never resolve outside themes_dir
+        if path.parent != self.themes_dir or not path.is_file():
+            raise ThemeNotFoundError(f"Unknown theme: {name}")
+        return path
+
+    def names(self) -> list[str]:
+        names = {p.stem for p in self.themes_dir.glob("*.css")}
+        return sorted(names | set(self.extra))
+
+    def get(self, name: str) -> Theme:
+        path = self._path_for(name)
+        try:
+            mtime = path.stat().st_mtime
+        except OSError:
+            raise ThemeNotFoundError(f"Unknown theme: {name}")
+        theme = self._themes.get(name)
+        if theme is None or theme.mtime != mtime:
+            with self._lock:
+                theme = self._themes.get(name)
+                if theme is None or theme.mtime != mtime:
+                    theme = Theme.load(name, path)
+                    self._themes[name] = theme
+        return theme
+
+    def fingerprint(self) -> str:
+        """Changes whenever any theme or template file changes (for cache keys)."""
+        parts = []
+        for name in self.names():
+            try:
+                parts.append(f"{name}@{self._path_for(name).stat().st_mtime_ns}")
+            except (OSError, ThemeNotFoundError):
+                continue
+        for template in sorted(TEMPLATES_DIR.glob("*.html")):
+            parts.append(f"{template.name}@{template.stat().st_mtime_ns}")
+        return ";".join(parts)
+
+    def render_html(self, theme: Theme, body: str, page_numbers: bool = True) -> str:
+        template = self.env.get_template("document.html")
+        return template.render(page_css=theme.page_css, body=body, page_numbers=page_numbers)
+
+    def activate(self, theme: Theme) -> contextvars.Token:
+        return _active_theme.set(theme)
+
+    def deactivate(self, token: contextvars.Token) -> None:
+        _active_theme.reset(token)
+
+    def __getstate__(self):
+        # Locks and compiled templates are rebuilt in worker processes
+        return {"themes_dir": self.themes_dir, "extra": self.extra}
+
+    def __setstate__(self, state):
+        self.__init__(state["themes_dir"], {k: str(v) for k, v in state["extra"].items()})
@@ -1,21 +1,51 @@
-from fastapi import FastAPI, UploadFile, File, HTTPException, BackgroundTasks, Request
-from fastapi.responses import FileResponse
+from fastapi import FastAPI, HTTPException, BackgroundTasks, Request, Query
+from fastapi.responses import FileResponse, PlainTextResponse, Response, StreamingResponse
 from fastapi.middleware.cors import CORSMiddleware
-from typing import List
-import shutil
+from contextlib import asynccontextmanager
+from functools import lru_cache
+from datetime import date
+from typing import Literal, Optional
+import asyncio
+import hashlib
+import itertools
+import json
 import os
-import tempfile
 import zipfile
 import time
 import uuid
 from pathlib import Path
 
-from src.adapters.driven.fs_adapter import LocalFileSystemAdapter
-from src.adapters.driven.pdf_adapter import Xhtml2PdfAdapter
-from src.adapters.driven.fs_archiver import FileSystemArchiver
+from src.adapters.driving.conditional import (
+    RangeNotSatisfiable, byte_range, iter_file_range, make_etag, none_match
+)
+from src.adapters.driving.progress import STREAM_HEADERS, ProgressStream, batch_item_event
+from src.adapters.driving.uploads import (
+    ReceivedUpload, UploadLimits, body_media_type, multipart_body, receive_body, receive_uploads, text_body
+)
+from src.adapters.driving.zip_stream import ZipStreamWriter
+from src.application.batch import BatchConverter
+from src.application.jobs import JobManager, JobStatus
+from src.application.manifest import manifest_name
 from src.application.service import ConversionService
-from src.domain.exceptions import UnsupportedFormatError, ConversionError
-from src.infrastructure.logger import logger
+from src.domain.exceptions import (
+    UnsupportedFormatError, ConversionError, JobQueueFullError, RenderLimitError, ThemeNotFoundError
+)
+from src.domain.model import SOURCE_EXTENSIONS, ConversionResult, FileScan, HistoryQuery
+from src.infrastructure.config import settings
+from src.infrastructure.container import get_container, shutdown_container
+from src.infrastructure.logger import access_logger, logger
+from src.infrastructure.metrics import HTTP_REQUEST_SECONDS, registry as metrics_registry
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Build adapters, cache and render pool once and warm them before traffic
+    get_container().warm_up()
+    yield
+    # Drain job workers, then stop render worker processes
+    await get_job_manager().stop()
+    shutdown_container()
+
 
 app = FastAPI(
     title="Text to PDF Service",
@@ -46,8 +76,11 @@ Finalized with **Gemini 3 Flash**.
     openapi_tags=[
         {"name": "Conversion", "description": "Core PDF generation operations"},
         {"name": "Status", "description": "Service health and monitoring: /health for uptime, / for basic info."},
+        {"name": "Jobs", "description": "Asynchronous conversions: submit, poll, download"},
+        {"name": "History", "description": "Archived conversion history"},
         {"name": "Tools", "description": "Batch processing and dev utilities"},
-    ]
+    ],
+    lifespan=lifespan
 )
 
 # =============================================================================
@@ -66,9 +99,6 @@ async def add_process_time_and_trace_id(request: Request, call_next):
     # Store request_id in state for access in endpoints if needed
     request.state.request_id = request_id
     
-    # Log request start
-    logger.info(f"[{request_id}] {request.method} {request.url.path} - Started")
-    
     try:
         response = await call_next(request)
         
@@ -76,16 +106,31 @@ async def add_process_time_and_trace_id(request: Request, call_next):
         response.headers["X-Process-Time"] = str(round(process_time, 4))
         response.headers["X-Request-ID"] = request_id
         
-        # Log request completion
-        logger.info(
-            f"[{request_id}] {request.method} {request.url.path} - "
-            f"Status: {response.status_code} - Time: {round(process_time, 4)}s"
+        # Route templates (not raw paths) keep the label set bounded
+        route = request.scope.get("route")
+        HTTP_REQUEST_SECONDS.observe(
+            process_time,
+            method=request.method,
+            path=getattr(route, "path", "unmatched"),
+            status=str(response.status_code),
+        )
+        
+        # One access line per request, formatted lazily (and only if sampled)
+        access_logger.info(
+            "[%s] %s %s - Status: %s - Time: %.4fs",
+            request_id, request.method, request.url.path, response.status_code, process_time,
+            extra={
+                "request_id": request_id,
+                "method": request.method,
+                "path": request.url.path,
+                "status": response.status_code,
+                "duration_ms": round(process_time * 1000, 2),
+            },
         )
         
         return response
     except Exception as e:
-        process_time = time.time() - start_time
-        logger.error(f"[{request_id}] {request.method} {request.url.path} - Failed: {str(e)}")
+        logger.error("[%s] %s %s - Failed: %s", request_id, request.method, request.url.path, e)
         raise e
 
 
@@ -130,12 +175,100 @@ async def root():
     }
 
 
+@app.get("/cache/stats", summary="Render Cache Statistics", tags=["Status"])
+async def cache_stats():
+    """Hit/miss counters and tier usage of the rendered-PDF cache."""
+    cache = get_container().cache
+    return cache.stats() if cache else {}
+
+
+@app.get("/themes", summary="List Document Themes", tags=["Status"])
+async def list_themes():
+    """Themes selectable with the `theme` parameter of the conversion endpoints."""
+    return {"themes": get_service().converter.themes_available()}
+
+
+def _render_stat(key: str) -> float:
+    executor = get_container().executor
+    return executor.stats()[key] if executor else 0
+
+
+metrics_registry.gauge("pdf_render_in_flight", "Renders running in worker processes", lambda: _render_stat("running"))
+metrics_registry.gauge(
+    "pdf_render_queue_depth", "Renders waiting for a worker or a queue slot", lambda: _render_stat("queued")
+)
+metrics_registry.gauge("pdf_job_queue_depth", "Asynchronous jobs waiting to start", lambda: get_job_manager().queue_depth())
+
+
+@app.get("/metrics", summary="Prometheus Metrics", tags=["Status"], response_class=PlainTextResponse)
+async def metrics():
+    """
+    Metrics in the Prometheus text format: conversion counts and latency by
+    format and outcome, per-stage timing histograms (read, detect_format,
+    cache, render, preprocess, html, pdf_render, archive), HTTP latency by
+    route, render queue depth, in-flight renders and job queue depth.
+    """
+    return PlainTextResponse(metrics_registry.expose(), media_type="text/plain; version=0.0.4")
+
+
+@app.get("/history", summary="Query Conversion History", tags=["History"])
+def query_history(
+    content_hash: Optional[str] = Query(None, description="SHA-256 of the source content"),
+    status: Optional[Literal["success", "failed"]] = None,
+    date_from: Optional[date] = Query(None, description="First day (inclusive)"),
+    date_to: Optional[date] = Query(None, description="Last day (inclusive)"),
+    limit: int = Query(50, ge=1, le=500),
+    cursor: Optional[int] = Query(None, description="`next_cursor` of the previous page"),
+):
+    """
+    Archived conversions matching all given filters, newest first.
+    
+    Answers e.g. "was this content converted before?" (`content_hash`) or
+    "what failed last week?" (`status=failed&date_from=...`). Results are
+    served from indexes and paginated by cursor: pass `next_cursor` back
+    as `cursor` until it is `null`. Records appear once the archive writer
+    has flushed them (within `PDF_ARCHIVE_FLUSH_MS`).
+    
+    Returns `503` when the history backend cannot be queried
+    (`PDF_ARCHIVE_BACKEND=jsonl`).
+    """
+    history = get_container().history
+    if history is None:
+        raise HTTPException(status_code=503, detail="Conversion history is not queryable with this archive backend")
+    page = history.query(HistoryQuery(
+        content_hash=content_hash,
+        success=None if status is None else status == "success",
+        date_from=date_from.isoformat() if date_from else None,
+        date_to=date_to.isoformat() if date_to else None,
+        limit=limit,
+        cursor=cursor,
+    ))
+    return {"items": page.records, "next_cursor": page.next_cursor}
+
+
+THEME_QUERY = Query(None, description="Document theme (see `/themes`); defaults to the service theme")
+STREAM_QUERY = Query(None, description="Stream per-file progress events instead: `sse` or `ndjson`")
+
+
+def validate_theme(theme: Optional[str]) -> None:
+    if theme is not None and theme not in get_service().converter.themes_available():
+        raise HTTPException(status_code=400, detail=f"Unknown theme '{theme}'")
+
+
+@lru_cache(maxsize=1)
+def get_job_manager() -> JobManager:
+    return JobManager(
+        get_service,
+        workers=settings.job_workers or get_container().render_workers,
+        queue_size=settings.job_queue_size,
+        result_ttl=settings.job_result_ttl_s,
+        spill_threshold=settings.spill_threshold_bytes,
+    )
+
+
 def get_service() -> ConversionService:
-    fs_adapter = LocalFileSystemAdapter()
-    pdf_adapter = Xhtml2PdfAdapter()
-    # Enable Archiver
-    archiver = FileSystemArchiver()
-    return ConversionService(pdf_adapter, fs_adapter, archiver)
+    # Shared, warmed service; renders run in the process pool off the event loop
+    return get_container().service
 
 def cleanup_file(path: str):
     try:
@@ -144,111 +277,284 @@ def cleanup_file(path: str):
     except Exception:
         pass
 
-@app.post("/convert/", summary="Convert File to PDF", tags=["Conversion"])
-async def convert_document(background_tasks: BackgroundTasks, file: UploadFile = File(...)):
+def pdf_response(
+    result: ConversionResult,
+    filename: str,
+    background_tasks: BackgroundTasks,
+    cleanup: bool = True,
+    request: Optional[Request] = None,
+    etag: Optional[str] = None,
+) -> Response:
     """
-    Upload a single text or markdown file and receive a professionally formatted PDF.
-    
-    **Supported formats**: `.md`, `.markdown`, `.txt`
-    
-    **Process**:
-    1. File is validated and temporarily stored
-    2. Content is converted to styled PDF
-    3. PDF is returned and temporary files are cleaned up
-    
-    **Limits**: 
-    - Single file per request
-    - Max file size: 10MB
-    
-    **For bulk conversion**: Use `/bulk-convert` endpoint instead.
+    Sends a rendered PDF from memory, or from its spill file when it was
+    too large. etag is sent as the PDF's validator; given the request, a
+    single byte range (Range, guarded by If-Range) is answered with 206.
     """
-    filename = file.filename
-    ext = Path(filename).suffix.lower()
-    
-    # Validation
-    if ext not in ['.md', '.markdown', '.txt']:
-        logger.warning(f"Invalid file type attempted: {ext}")
-        raise HTTPException(
-            status_code=400, 
-            detail=f"Unsupported file type '{ext}'. Only .md, .markdown, and .txt are supported."
+    headers = {"Content-Disposition": f'attachment; filename="{filename}"', "Accept-Ranges": "bytes"}
+    if etag:
+        headers["ETag"] = etag
+    in_memory = result.content is not None
+    if not in_memory and cleanup:
+        background_tasks.add_task(cleanup_file, result.file_path)
+    size = len(result.content) if in_memory else os.path.getsize(result.file_path)
+
+    span = None
+    if request is not None:
+        try:
+            span = byte_range(request.headers.get("range"), size, etag, request.headers.get("if-range"))
+        except RangeNotSatisfiable:
+            headers["Content-Range"] = f"bytes */{size}"
+            return Response(status_code=416, headers=headers)
+    if span is None:
+        if in_memory:
+            return Response(content=result.content, media_type='application/pdf', headers=headers)
+        return FileResponse(result.file_path, media_type='application/pdf', headers=headers)
+
+    first, last = span
+    headers["Content-Range"] = f"bytes {first}-{last}/{size}"
+    if in_memory:
+        return Response(
+            content=result.content[first:last + 1], status_code=206, media_type='application/pdf', headers=headers
         )
-    
-    # File sizes & validation
-    MAX_SIZE = 10 * 1024 * 1024
-    file_content = await file.read()
+    headers["Content-Length"] = str(last - first + 1)
+    return StreamingResponse(
+        iter_file_range(result.file_path, first, last),
+        status_code=206, media_type='application/pdf', headers=headers
+    )
+
+SUPPORTED_EXTENSIONS = SOURCE_EXTENSIONS
+MAX_UPLOAD_SIZE = 10 * 1024 * 1024
+
+SINGLE_UPLOAD_LIMITS = UploadLimits(
+    max_file_size=MAX_UPLOAD_SIZE, allowed_extensions=SUPPORTED_EXTENSIONS
+)
+
+
+async def read_validated_upload(request: Request) -> tuple[ReceivedUpload, bytes]:
+    """
+    Streams a single upload in, validating type and size as it arrives,
+    and returns it (with its SHA-256) together with its content.
+    """
+    uploads = await receive_uploads(request, SINGLE_UPLOAD_LIMITS)
+    if not uploads:
+        raise HTTPException(status_code=422, detail="Missing file upload")
+    upload = uploads[0]
+    try:
+        file_content = await upload.read()
+    finally:
+        upload.close()
     
     if not file_content:
-        logger.warning(f"Empty file uploaded: {filename}")
+        logger.warning("Empty file uploaded: %s", upload.filename)
         raise HTTPException(
             status_code=400,
             detail="Uploaded file is empty"
         )
-        
-    if len(file_content) > MAX_SIZE:
-        logger.warning(f"File too large: {len(file_content)} bytes")
-        raise HTTPException(
-            status_code=413,
-            detail="File size exceeds 10MB limit"
-        )
-    
-    logger.info(f"Converting file: {filename} ({len(file_content)} bytes)")
-    
-    # Create temp files with unique names
-    fd, input_path = tempfile.mkstemp(suffix=ext)
-    os.close(fd)
-    
+    return upload, file_content
+
+async def convert_to_pdf_response(
+    request: Request,
+    background_tasks: BackgroundTasks,
+    content: str | bytes,
+    filename: str,
+    content_hash: str,
+    theme: Optional[str],
+) -> Response:
+    """
+    Renders one document held in memory and sends the PDF (the shared tail
+    of /convert/ and /convert/text): answers If-None-Match from the ETag
+    before rendering and maps domain errors to HTTP errors.
+    """
     output_filename = f"{Path(filename).stem}.pdf"
-    output_path = input_path + ".pdf"
     
     try:
-        # Save uploaded content
-        with open(input_path, "wb") as buffer:
-            buffer.write(file_content)
-            
-        # Convert using service
         service = get_service()
-        result_path = service.convert_file(input_path, output_path)
-            
-        # Schedule cleanup
-        background_tasks.add_task(cleanup_file, input_path)
-        background_tasks.add_task(cleanup_file, output_path)
+        # Renders are reproducible: the render key names the exact PDF bytes
+        etag = make_etag(service.render_key(content_hash, filename, theme))
+        if none_match(request.headers.get("if-none-match"), etag):
+            logger.info("Client already holds %s, not rendering", output_filename)
+            return Response(status_code=304, headers={"ETag": etag})
 
-        logger.info(f"Conversion successful: {output_filename}")
-        
-        return FileResponse(
-            result_path, 
-            media_type='application/pdf', 
-            filename=output_filename
+        # Convert in memory; only very large outputs spill to disk
+        result = await service.convert_content_async(
+            content,
+            filename,
+            spill_threshold=settings.spill_threshold_bytes,
+            theme=theme,
+            content_hash=content_hash
         )
-    except UnsupportedFormatError as e:
-        cleanup_file(input_path)
-        cleanup_file(output_path)
-        logger.error(f"Format error: {str(e)}")
+
+        logger.info("Conversion successful: %s", output_filename)
+        
+        return pdf_response(result, output_filename, background_tasks, request=request, etag=etag)
+    except (UnsupportedFormatError, ThemeNotFoundError) as e:
+        logger.error("Format error: %s", e)
         raise HTTPException(status_code=400, detail=str(e))
+    except RenderLimitError as e:
+        logger.error("Render limit exceeded (%s): %s", e.limit, e)
+        # The document, not the service, is at fault when it breaks a limit
+        status_code = 500 if e.limit == "worker_crash" else 422
+        raise HTTPException(status_code=status_code, detail=f"PDF generation failed: {str(e)}")
     except ConversionError as e:
-        cleanup_file(input_path)
-        cleanup_file(output_path)
-        logger.error(f"Conversion error: {str(e)}")
+        logger.error("Conversion error: %s", e)
         raise HTTPException(status_code=500, detail=f"PDF generation failed: {str(e)}")
     except Exception:
-        cleanup_file(input_path)
-        cleanup_file(output_path)
         logger.exception("Unexpected error during conversion")
         raise HTTPException(status_code=500, detail="Internal server error during conversion")
 
+@app.post(
+    "/convert/", summary="Convert File to PDF", tags=["Conversion"], openapi_extra=multipart_body("file")
+)
+async def convert_document(
+    request: Request,
+    background_tasks: BackgroundTasks,
+    theme: Optional[str] = THEME_QUERY
+):
+    """
+    Upload a single text or markdown file and receive a professionally formatted PDF.
+    
+    **Supported formats**: `.md`, `.markdown`, `.txt`
+    
+    **Process**:
+    1. File is streamed in, hashed and validated chunk by chunk
+    2. Content is converted to styled PDF
+    3. PDF is returned straight from memory
+    
+    **Limits**: 
+    - Single file per request
+    - Max file size: 10MB (`413` as soon as it is exceeded, or up front
+      from `Content-Length`)
+    
+    **For bulk conversion**: Use `/bulk-convert` endpoint instead.
+    """
+    upload, file_content = await read_validated_upload(request)
+    logger.info("Converting file: %s (%s bytes)", upload.filename, len(file_content))
+    return await convert_to_pdf_response(
+        request, background_tasks, file_content, upload.filename, upload.sha256, theme
+    )
+
+# Raw bodies: media type -> extension of the source format
+TEXT_MEDIA_TYPES = {"text/markdown": ".md", "text/x-markdown": ".md", "text/plain": ".txt"}
+# JSON payloads: format -> extension
+TEXT_FORMATS = {"markdown": ".md", "text": ".txt"}
+# The size limit applies to the decoded content; the raw JSON body may be
+# larger since escaping expands a character up to 6 bytes ("\u0001")
+JSON_ESCAPE_EXPANSION = 6
+# Room for JSON syntax and the other fields around the content
+JSON_BODY_OVERHEAD = 64 * 1024
+
+
+def parse_text_payload(body: bytes) -> dict:
+    """Validates a /convert/text JSON payload."""
+    try:
+        payload = json.loads(body)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=f"Malformed JSON body: {e}")
+    if not isinstance(payload, dict) or not isinstance(payload.get("content"), str):
+        raise HTTPException(status_code=422, detail="JSON body needs a 'content' string")
+    if payload.setdefault("format", "markdown") not in TEXT_FORMATS:
+        raise HTTPException(
+            status_code=422, detail=f"Unknown format '{payload['format']}'. Use 'markdown' or 'text'."
+        )
+    for key in ("filename", "theme"):
+        if payload.get(key) is not None and not isinstance(payload[key], str):
+            raise HTTPException(status_code=422, detail=f"'{key}' must be a string")
+    return payload
+
+
+@app.post(
+    "/convert/text", summary="Convert Text Body to PDF", tags=["Conversion"],
+    openapi_extra=text_body(tuple(TEXT_MEDIA_TYPES))
+)
+async def convert_text(
+    request: Request,
+    background_tasks: BackgroundTasks,
+    filename: str = Query("document", description="Name of the returned PDF (its stem is used)"),
+    theme: Optional[str] = THEME_QUERY
+):
+    """
+    Convert a document sent as the request body, without multipart encoding.
+    
+    **Bodies**:
+    - `text/markdown` or `text/plain` (UTF-8): the document itself
+    - `application/json`: `{"content": "...", "format": "markdown" | "text",
+      "filename": "...", "theme": "..."}`; `filename` and `theme` override
+      the query parameters
+    
+    The body is read into memory (no multipart parsing, no temp file) and
+    the PDF is returned from memory, with the same limits, ETag and range
+    handling as `/convert/`.
+    """
+    media_type, charset = body_media_type(request)
+    if media_type == "application/json":
+        body, _ = await receive_body(request, MAX_UPLOAD_SIZE * JSON_ESCAPE_EXPANSION + JSON_BODY_OVERHEAD)
+        payload = parse_text_payload(body)
+        content = payload["content"]
+        extension = TEXT_FORMATS[payload["format"]]
+        filename = payload.get("filename") or filename
+        theme = payload.get("theme") or theme
+        encoded = content.encode("utf-8")
+        if len(encoded) > MAX_UPLOAD_SIZE:
+            raise HTTPException(status_code=413, detail=f"File size exceeds {MAX_UPLOAD_SIZE // (1024 * 1024)}MB limit")
+        content_hash = await asyncio.to_thread(lambda: hashlib.sha256(encoded).hexdigest())
+    elif media_type in TEXT_MEDIA_TYPES:
+        if charset not in ("utf-8", "utf8", "us-ascii"):
+            raise HTTPException(status_code=415, detail=f"Unsupported charset '{charset}'. Send UTF-8 text.")
+        content, content_hash = await receive_body(request, MAX_UPLOAD_SIZE)
+        extension = TEXT_MEDIA_TYPES[media_type]
+    else:
+        raise HTTPException(
+            status_code=415,
+            detail="Send text/markdown, text/plain or application/json (use /convert/ for file uploads)",
+        )
+    
+    if not content:
+        raise HTTPException(status_code=400, detail="Document is empty")
+    
+    source_name = f"{Path(filename).stem or 'document'}{extension}"
+    logger.info("Converting text body: %s (%s)", source_name, media_type)
+    return await convert_to_pdf_response(request, background_tasks, content, source_name, content_hash, theme)
+
 @app.post("/bulk-convert", summary="Bulk File Conversion", tags=["Tools"])
-async def bulk_convert():
+async def bulk_convert(
+    force: bool = Query(False, description="Re-render every file, even unchanged ones"),
+    prune: bool = Query(False, description="Delete outputs whose input file was removed"),
+    include: Optional[list[str]] = Query(None, description="Only convert paths matching these globs"),
+    exclude: Optional[list[str]] = Query(None, description="Skip paths (and directories) matching these globs"),
+    stream: Optional[Literal["sse", "ndjson"]] = STREAM_QUERY,
+):
     """
     Convert multiple files from local directory in a single operation.
     
-    Scans `data/input` directory for `.md` and `.txt` files,
-    converts them to PDF, and saves results to `data/output`.
+    Scans the `data/input` tree recursively for `.md`, `.markdown` and
+    `.txt` files, converts them to PDF, and saves results to `data/output`
+    (keeping the subdirectory layout). `include` / `exclude` take glob
+    patterns matched against the path below `data/input`, e.g.
+    `exclude=drafts/*`.
+
+    Nodes sharing the input volume can split the tree without coordination:
+    with `PDF_SHARD_COUNT=n`, a node converts only the files whose path hash
+    falls in its `PDF_SHARD_INDEX` and keeps its own manifest.
+    
+    Runs are incremental: `data/output/.bulk-manifest.json` records each
+    input's content hash, the render options and the PDF it produced, and
+    files whose content, options and PDF are unchanged are reported as
+    `unchanged` instead of being re-rendered. `force=true` rebuilds
+    everything; `prune=true` also deletes previously generated PDFs whose
+    input no longer exists.
     
-    This endpoint is designed for batch processing workflows where
-    multiple documents need to be converted efficiently.
+    Files are converted in parallel (`PDF_BATCH_WORKERS`, default one per
+    render worker), each under a per-file timeout (`PDF_BATCH_FILE_TIMEOUT`).
     
     Returns a detailed summary of processing results including
-    success/failure status for each file.
+    success/failure status for each file, in input order, plus
+    throughput (files/s, MB/s).
+
+    With `stream=sse` or `stream=ndjson` the response is instead a stream
+    of per-file events as conversions start and finish (`started`,
+    `succeeded` with `output`, `size_bytes` and `duration_s`, `unchanged`,
+    `failed` with `error`), ending with a `completed` event holding the
+    summary without the per-file results.
     """
     try:
         logger.info("Bulk conversion initiated via API")
@@ -260,57 +566,65 @@ async def bulk_convert():
         input_dir.mkdir(parents=True, exist_ok=True)
         output_dir.mkdir(parents=True, exist_ok=True)
         
-        # Create adapters
-        fs_adapter = LocalFileSystemAdapter()
-        pdf_adapter = Xhtml2PdfAdapter()
-        archiver = FileSystemArchiver()
-        service = ConversionService(pdf_adapter, fs_adapter, archiver)
+        service = get_service()
         
-        # Discover files
-        files = fs_adapter.list_files(str(input_dir), [".md", ".txt"])
+        # Discover files lazily; the batch pulls them as workers free up
+        scan = FileScan(
+            include=tuple(include or ()),
+            exclude=tuple(exclude or ()),
+            shard_index=settings.shard_index,
+            shard_count=settings.shard_count,
+        )
+        files = service.fs.scan_files(str(input_dir), scan)
+        first = next(files, None)
         
-        if not files:
-            logger.warning(f"No files found in {input_dir}")
+        if first is None and not stream:
+            logger.warning("No files found in %s", input_dir)
             return {
                 "message": "No files found to process", 
                 "processed": 0,
                 "results": []
             }
         
-        logger.info(f"Found {len(files)} file(s) to process")
+        if scan.sharded:
+            logger.info("Processing shard %s/%s of %s", scan.shard_index, scan.shard_count, input_dir)
         
-        results = []
-        success_count = 0
+        # Convert in parallel without holding the event loop
+        batch = BatchConverter(
+            service,
+            workers=settings.batch_workers or get_container().render_workers,
+            file_timeout=settings.batch_file_timeout_s,
+        )
+        run_args = (
+            itertools.chain([first], files) if first is not None else iter(()), str(output_dir), not force, prune,
+            str(input_dir), manifest_name(scan.shard_index, scan.shard_count),
+        )
         
-        for input_path in files:
-            p_in = Path(input_path)
-            output_filename = f"{p_in.stem}.pdf"
-            output_path = output_dir / output_filename
+        if stream:
+            progress = ProgressStream(stream)
             
-            try:
-                service.convert_file(str(input_path), str(output_path))
-                results.append({
-                    "file": p_in.name,
-                    "status": "success",
-                    "error": None
-                })
-                success_count += 1
-            except Exception as conv_error:
-                logger.error(f"Failed to convert {p_in.name}: {str(conv_error)}")
-                results.append({
-                    "file": p_in.name,
-                    "status": "error",
-                    "error": str(conv_error)
-                })
+            def on_result(item):
+                event, data = batch_item_event(item)
+                progress.emit_threadsafe(event, **data)
+            
+            async def run_batch() -> dict:
+                summary = await asyncio.to_thread(
+                    batch.run, *run_args, on_start=lambda name: progress.emit_threadsafe("started", file=name),
+                    on_result=on_result,
+                )
+                totals = summary.to_dict()
+                del totals["results"]
+                return totals
+            
+            return StreamingResponse(
+                progress.run(run_batch()), media_type=progress.media_type, headers=STREAM_HEADERS
+            )
         
-        logger.info(f"Bulk conversion completed: {success_count}/{len(files)} successful")
+        summary = await asyncio.to_thread(batch.run, *run_args)
         
         return {
             "message": "Bulk conversion completed",
-            "processed": len(files),
-            "successful": success_count,
-            "failed": len(files) - success_count,
-            "results": results
+            **summary.to_dict()
         }
         
     except Exception as e:
@@ -321,10 +635,95 @@ async def bulk_convert():
         )
 
 
-@app.post("/convert/multiple", summary="Convert Multiple Files", tags=["Conversion"])
+MANIFEST_NAME = "manifest.json"
+
+
+MULTIPLE_UPLOAD_LIMITS = UploadLimits(
+    max_file_size=MAX_UPLOAD_SIZE,
+    allowed_extensions=SUPPORTED_EXTENSIONS,
+    max_files=20,
+    max_total_size=50 * 1024 * 1024,
+    skip_invalid=True,
+)
+
+
+def stream_multiple(
+    request: Request,
+    service: ConversionService,
+    uploads: list[ReceivedUpload],
+    results: list[dict],
+    jobs: list[tuple],
+    theme: Optional[str],
+    stream_format: str,
+    keep_results: bool = False,
+) -> StreamingResponse:
+    """
+    /convert/multiple as a progress stream. With keep_results, finished
+    PDFs are kept as job results (spilled to disk above the spill
+    threshold, at most as many as the job queue holds); otherwise they are
+    dropped once reported.
+    """
+    progress = ProgressStream(stream_format)
+    job_manager = get_job_manager()
+    spill_threshold = settings.spill_threshold_bytes if keep_results else None
+    
+    def keep(filename: str, converted: ConversionResult) -> dict:
+        if keep_results:
+            try:
+                job = job_manager.add_finished(filename, converted)
+                return {"job_id": job.id, "result_url": str(request.url_for("get_job_result", job_id=job.id))}
+            except JobQueueFullError:
+                pass
+        if converted.content is None and converted.file_path:
+            cleanup_file(converted.file_path)
+        return {}
+    
+    async def convert_and_report(result, output_filename, content, content_hash):
+        progress.emit("started", file=result["file"])
+        started = time.perf_counter()
+        try:
+            converted = await service.convert_content_async(
+                content, result["file"], theme=theme, content_hash=content_hash, spill_threshold=spill_threshold
+            )
+        except Exception as e:
+            logger.error("Failed to convert %s: %s", result["file"], e)
+            result.update({"status": "error", "error": str(e)})
+            progress.emit(
+                "failed", file=result["file"], error=str(e), duration_s=round(time.perf_counter() - started, 4)
+            )
+            return
+        result.update({"status": "success", "output": output_filename})
+        progress.emit(
+            "succeeded",
+            file=result["file"],
+            output=output_filename,
+            size_bytes=converted.size_bytes,
+            duration_s=round(time.perf_counter() - started, 4),
+            **keep(result["file"], converted),
+        )
+    
+    async def convert_all() -> dict:
+        for result in results:
+            if result["status"] == "skipped":
+                progress.emit("skipped", file=result["file"], error=result["error"])
+        await asyncio.gather(*(convert_and_report(*job) for job in jobs))
+        successful = sum(1 for r in results if r["status"] == "success")
+        logger.info("Multi-file conversion completed: %s/%s successful", successful, len(uploads))
+        return {"processed": len(uploads), "successful": successful, "failed": len(uploads) - successful}
+    
+    return StreamingResponse(progress.run(convert_all()), media_type=progress.media_type, headers=STREAM_HEADERS)
+
+
+@app.post(
+    "/convert/multiple", summary="Convert Multiple Files", tags=["Conversion"],
+    openapi_extra=multipart_body("files", multiple=True)
+)
 async def convert_multiple_files(
-    background_tasks: BackgroundTasks, 
-    files: List[UploadFile] = File(...)
+    request: Request,
+    compress: bool = False,
+    theme: Optional[str] = THEME_QUERY,
+    stream: Optional[Literal["sse", "ndjson"]] = STREAM_QUERY,
+    keep_results: bool = Query(False, description="With `stream`: keep each PDF as a job result (`result_url`)"),
 ):
     """
     Upload multiple text or markdown files and receive a ZIP containing all PDFs.
@@ -332,133 +731,196 @@ async def convert_multiple_files(
     **Supported formats**: `.md`, `.markdown`, `.txt`
     
     **Process**:
-    1. Each file is validated (type and size)
-    2. All valid files are converted to PDF
-    3. PDFs are packaged into a ZIP file
-    4. ZIP is returned and temporary files are cleaned up
+    1. Files are streamed in and validated (type and size) as they arrive;
+       data of skipped files is dropped instead of buffered
+    2. All valid files are converted to PDF concurrently
+    3. The ZIP is streamed: each PDF entry is sent as soon as it is rendered
+    4. A trailing `manifest.json` entry lists the per-file results
+    
+    Entries are STORED (PDFs are already compressed); pass `compress=true`
+    to DEFLATE them instead.
     
     **Limits**:
     - Max 20 files per request
     - Max 10MB per file
-    - Total max 50MB per request
+    - Total max 50MB per request (files beyond it are skipped)
+    - Request bodies larger than 20 x 10MB are rejected with `413`
     
-    **Response**: `application/zip` containing all generated PDFs
+    **Response**: `application/zip` containing all generated PDFs and `manifest.json`
+    
+    **Progress stream**: with `stream=sse` or `stream=ndjson` no ZIP is
+    built; instead an event is sent per file as it is `skipped`, `started`,
+    `succeeded` (with `size_bytes` and `duration_s`) or `failed`, then a
+    `completed` event with the totals. Add `keep_results=true` to also get
+    a `result_url` per succeeded file serving the PDF like a job result
+    until it expires; no URL is given while as many results as the job
+    queue holds are already retained.
     """
-    MAX_FILES = 20
-    MAX_FILE_SIZE = 10 * 1024 * 1024  # 10MB
-    MAX_TOTAL_SIZE = 50 * 1024 * 1024  # 50MB
-    ALLOWED_EXTENSIONS = ['.md', '.markdown', '.txt']
+    validate_theme(theme)
     
-    # Validate file count
-    if len(files) > MAX_FILES:
-        raise HTTPException(
-            status_code=400,
-            detail=f"Too many files. Maximum {MAX_FILES} files allowed."
-        )
+    uploads = await receive_uploads(request, MULTIPLE_UPLOAD_LIMITS)
     
-    if len(files) == 0:
+    if len(uploads) == 0:
         raise HTTPException(
             status_code=400,
             detail="No files provided."
         )
     
-    logger.info(f"Multi-file conversion initiated: {len(files)} files")
-    
-    temp_dir = tempfile.mkdtemp()
-    zip_path = os.path.join(temp_dir, "converted_pdfs.zip")
+    logger.info("Multi-file conversion initiated: %s files", len(uploads))
     
     try:
         service = get_service()
         results = []
-        total_size = 0
+        jobs = []
         
-        with zipfile.ZipFile(zip_path, 'w', zipfile.ZIP_DEFLATED) as zf:
-            for upload_file in files:
-                filename = upload_file.filename
-                ext = Path(filename).suffix.lower()
-                
-                # Validate extension
-                if ext not in ALLOWED_EXTENSIONS:
-                    results.append({
-                        "file": filename,
-                        "status": "skipped",
-                        "error": f"Unsupported format: {ext}"
-                    })
-                    continue
-                
-                # Read content
-                content = await upload_file.read()
-                file_size = len(content)
-                
-                if file_size == 0:
-                    results.append({
-                        "file": filename,
-                        "status": "skipped",
-                        "error": "File is empty"
-                    })
-                    continue
-                
-                total_size += file_size
-                
-                # Validate sizes
-                if file_size > MAX_FILE_SIZE:
-                    results.append({
-                        "file": filename,
-                        "status": "skipped",
-                        "error": "File exceeds 10MB limit"
-                    })
-                    continue
-                
-                if total_size > MAX_TOTAL_SIZE:
-                    results.append({
-                        "file": filename,
-                        "status": "skipped",
-                        "error": "Total request size exceeds 50MB limit"
-                    })
-                    continue
-                
-                # Create temp input file
-                input_path = os.path.join(temp_dir, filename)
-                output_filename = f"{Path(filename).stem}.pdf"
-                output_path = os.path.join(temp_dir, output_filename)
-                
-                try:
-                    with open(input_path, 'wb') as f:
-                        f.write(content)
-                    
-                    service.convert_file(input_path, output_path)
-                    
-                    # Add to ZIP
-                    zf.write(output_path, output_filename)
-                    
-                    results.append({
-                        "file": filename,
-                        "status": "success",
-                        "output": output_filename
-                    })
-                    
-                except Exception as conv_err:
-                    logger.error(f"Failed to convert {filename}: {str(conv_err)}")
-                    results.append({
-                        "file": filename,
-                        "status": "error",
-                        "error": str(conv_err)
-                    })
-        
-        success_count = sum(1 for r in results if r["status"] == "success")
-        logger.info(f"Multi-file conversion completed: {success_count}/{len(files)} successful")
-        
-        # Schedule cleanup
-        background_tasks.add_task(shutil.rmtree, temp_dir, ignore_errors=True)
-        
-        return FileResponse(
-            zip_path,
-            media_type='application/zip',
-            filename='converted_pdfs.zip',
-            headers={"X-Conversion-Results": str(success_count) + "/" + str(len(files))}
-        )
+        for upload in uploads:
+            filename = upload.filename
+            
+            # Rejected while streaming (type, size, total)
+            if upload.error:
+                results.append({
+                    "file": filename,
+                    "status": "skipped",
+                    "error": upload.error
+                })
+                continue
+            
+            if upload.size == 0:
+                results.append({
+                    "file": filename,
+                    "status": "skipped",
+                    "error": "File is empty"
+                })
+                continue
+            
+            content = await upload.read()
+            output_filename = f"{Path(filename).stem}.pdf"
+            result = {"file": filename, "status": "pending"}
+            results.append(result)
+            jobs.append((result, output_filename, content, upload.sha256))
         
     except Exception as e:
-        shutil.rmtree(temp_dir, ignore_errors=True)
         logger.exception("Multi-file conversion failed")
         raise HTTPException(status_code=500, detail=str(e))
+    finally:
+        for upload in uploads:
+            upload.close()
+    
+    if stream:
+        return stream_multiple(request, service, uploads, results, jobs, theme, stream, keep_results)
+    
+    async def convert_job(job):
+        result, output_filename, content, content_hash = job
+        try:
+            return job, await service.convert_content_async(
+                content, result["file"], theme=theme, content_hash=content_hash
+            )
+        except Exception as conv_err:
+            return job, conv_err
+    
+    async def zip_chunks():
+        writer = ZipStreamWriter(zipfile.ZIP_DEFLATED if compress else zipfile.ZIP_STORED)
+        # Render all accepted files concurrently; emit each entry as it finishes
+        tasks = [asyncio.ensure_future(convert_job(job)) for job in jobs]
+        try:
+            for next_done in asyncio.as_completed(tasks):
+                (result, output_filename, _, _), outcome = await next_done
+                if isinstance(outcome, Exception):
+                    logger.error("Failed to convert %s: %s", result['file'], outcome)
+                    result.update({"status": "error", "error": str(outcome)})
+                    continue
+                entry_name = writer.reserve(output_filename)
+                result.update({"status": "success", "output": entry_name})
+                yield writer.add(entry_name, outcome.content)
+            
+            success_count = sum(1 for r in results if r["status"] == "success")
+            logger.info("Multi-file conversion completed: %s/%s successful", success_count, len(uploads))
+            
+            # Per-file results travel in a trailing manifest entry
+            manifest = {
+                "processed": len(uploads),
+                "successful": success_count,
+                "failed": len(uploads) - success_count,
+                "results": results
+            }
+            yield writer.add(writer.reserve(MANIFEST_NAME), json.dumps(manifest, indent=2).encode('utf-8'))
+            yield writer.close()
+        finally:
+            # Client went away or rendering failed: stop outstanding renders
+            for task in tasks:
+                task.cancel()
+    
+    return StreamingResponse(
+        zip_chunks(),
+        media_type='application/zip',
+        headers={"Content-Disposition": 'attachment; filename="converted_pdfs.zip"'}
+    )
+
+
+# =============================================================================
+# Asynchronous Jobs
+# =============================================================================
+
+@app.post(
+    "/jobs", summary="Submit Conversion Job", tags=["Jobs"], status_code=202,
+    openapi_extra=multipart_body("file")
+)
+async def submit_job(request: Request):
+    """
+    Queue a single text or markdown file for conversion and return immediately.
+    
+    Poll `GET /jobs/{job_id}` for status and download the PDF from
+    `GET /jobs/{job_id}/result` once it has succeeded.
+    
+    **Limits**: same as `/convert/`. When the job queue is full the request
+    is rejected with `429 Too Many Requests` and a `Retry-After` header.
+    Finished jobs expire after `PDF_JOB_RESULT_TTL` seconds.
+    """
+    upload, file_content = await read_validated_upload(request)
+    
+    try:
+        job = get_job_manager().submit(file_content, upload.filename)
+    except JobQueueFullError as e:
+        raise HTTPException(
+            status_code=429,
+            detail=str(e),
+            headers={"Retry-After": str(settings.job_retry_after_s)}
+        )
+    
+    return {
+        **job.to_dict(),
+        "status_url": str(request.url_for("get_job", job_id=job.id)),
+        "result_url": str(request.url_for("get_job_result", job_id=job.id)),
+    }
+
+
+@app.get("/jobs/{job_id}", summary="Job Status", tags=["Jobs"], name="get_job")
+async def get_job(job_id: str):
+    """Return the status of a conversion job."""
+    job = get_job_manager().get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job not found or expired")
+    return job.to_dict()
+
+
+@app.get("/jobs/{job_id}/result", summary="Download Job Result", tags=["Jobs"], name="get_job_result")
+async def get_job_result(job_id: str, request: Request, background_tasks: BackgroundTasks):
+    """
+    Download the PDF of a succeeded job.
+    
+    Returns `409 Conflict` while the job is still queued or running and
+    `422` if it failed.
+    """
+    job = get_job_manager().get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job not found or expired")
+    if job.status == JobStatus.FAILED:
+        raise HTTPException(status_code=422, detail=f"Job failed: {job.error}")
+    if job.status != JobStatus.SUCCEEDED:
+        raise HTTPException(
+            status_code=409,
+            detail=f"Job is {job.status.value}",
+            headers={"Retry-After": str(settings.job_retry_after_s)}
+        )
+    # The job keeps ownership of spilled files until it expires
+    return pdf_response(job.result, job.output_filename, background_tasks, cleanup=False, request=request)
@@ -1,21 +1,26 @@
 import typer
 import os
-from src.adapters.driven.fs_adapter import LocalFileSystemAdapter
-from src.adapters.driven.pdf_adapter import Xhtml2PdfAdapter
-from src.application.service import ConversionService
+from typing import TYPE_CHECKING
+from src.infrastructure.config import settings
+
+# The render stack (xhtml2pdf, ReportLab, markdown) takes most of a second to
+# import; commands load it only when they actually convert, so --help and
+# argument errors stay fast
+if TYPE_CHECKING:
+    from src.application.service import ConversionService
 
 app = typer.Typer(help="Hexagonal Text-to-PDF Converter CLI")
 
-def get_service() -> ConversionService:
-    # Manual Dependency Injection
-    fs_adapter = LocalFileSystemAdapter()
-    pdf_adapter = Xhtml2PdfAdapter()
-    return ConversionService(pdf_adapter, fs_adapter)
+def get_service() -> "ConversionService":
+    from src.infrastructure.container import Container
+    # Single in-process conversion: no render pool, history or cache needed
+    return Container(with_executor=False, with_archiver=False, with_cache=False).service
 
 @app.command()
 def convert(
     input_path: str = typer.Argument(..., help="Path to the source file (.md or .txt)"),
     output_path: str = typer.Option(None, "--output", "-o", help="Path to the output PDF file. Defaults to input_filename.pdf"),
+    theme: str = typer.Option(None, "--theme", "-t", help="Document theme (e.g. default, compact)"),
 ):
     """
     Convert a Markdown or Text file to PDF.
@@ -33,11 +38,27 @@ def convert(
     
     try:
         typer.secho(f"Converting '{input_path}' to '{output_path}'...", fg=typer.colors.BLUE)
-        result_path = service.convert_file(input_path, output_path)
+        result_path = service.convert_file(input_path, output_path, theme=theme)
         typer.secho(f"Success! PDF generated at: {result_path}", fg=typer.colors.GREEN, bold=True)
     except Exception as e:
         typer.secho(f"Error during conversion: {e}", fg=typer.colors.RED)
         raise typer.Exit(code=1)
 
+@app.command("import-history")
+def import_history(
+    metadata_dir: str = typer.Option("data/archive/metadata", "--from", help="Directory of daily JSONL history files"),
+    db_path: str = typer.Option(settings.archive_db, "--db", help="SQLite history database"),
+):
+    """
+    Import JSONL conversion history into the SQLite history store (each file once).
+    """
+    from src.adapters.driven.sqlite_archiver import SQLiteArchiver
+    archiver = SQLiteArchiver(db_path)
+    try:
+        imported = archiver.import_jsonl(metadata_dir)
+    finally:
+        archiver.close()
+    typer.secho(f"Imported {imported} history record(s) into {db_path}", fg=typer.colors.GREEN)
+
 if __name__ == "__main__":
     app()
@@ -0,0 +1,83 @@
+"""
+HTTP validators and byte ranges for generated PDFs.
+
+PDFs render reproducibly, so the render key (content hash, format and
+render options) identifies the exact bytes and serves as a strong ETag.
+A client that already holds them gets 304 before anything is rendered;
+a client resuming a download asks for a byte range, guarded by If-Range.
+Only single ranges are served; multi-range requests get the whole body.
+"""
+import re
+from typing import Iterator, Optional
+
+_RANGE = re.compile(r"^\s*bytes\s*=\s*(\d*)\s*-\s*(\d*)\s*$", re.IGNORECASE)
+_CHUNK_SIZE = 64 * 1024
+
+
+class RangeNotSatisfiable(Exception):
+    """The requested range starts beyond the end of the body."""
+
+
+def make_etag(render_key: str) -> str:
+    return f'"{render_key}"'
+
+
+def _opaque(tag: str) -> str:
+    tag = tag.strip()
+    return tag[2:] if tag.startswith("W/") else tag
+
+
+def none_match(if_none_match: Optional[str], etag: str) -> bool:
+    """True when If-None-Match is * or lists etag (weak comparison)."""
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    return any(_opaque(tag) == _opaque(etag) for tag in if_none_match.split(","))
+
+
+def byte_range(
+    range_header: Optional[str], size: int, etag: Optional[str] = None, if_range: Optional[str] = None
+) -> Optional[tuple[int, int]]:
+    """
+    The (first, last) byte positions to send, or None for the whole body.
+    A Range that does not parse, spans several ranges or is guarded by an
+    If-Range other than the current strong etag is ignored. Raises
+    RangeNotSatisfiable when the range starts at or past size.
+    """
+    if not range_header:
+        return None
+    if if_range is not None and (etag is None or if_range.strip() != etag or etag.startswith("W/")):
+        return None
+    match = _RANGE.match(range_header)
+    if match is None:
+        return None
+    first, last = match.groups()
+    if not first:
+        if not last:
+            return None
+        # Suffix range: the final `last` bytes
+        length = int(last)
+        if length == 0:
+            raise RangeNotSatisfiable()
+        return max(0, size - length), size - 1
+    first = int(first)
+    if last and int(last) < first:
+        return None
+    if first >= size:
+        raise RangeNotSatisfiable()
+    return first, min(int(last), size - 1) if last else size - 1
+
+
+def iter_file_range(path: str, first: int, last: int) -> Iterator[bytes]:
+    """Reads bytes first..last (inclusive) of a file in chunks."""
+    remaining = last - first + 1
+    with open(path, "rb") as f:
+        f.seek(first)
+        while remaining > 0:
+            chunk = f.read(min(_CHUNK_SIZE, remaining))
+            if not chunk:
+                break
+            remaining -= len(chunk)
+            yield chunk
+
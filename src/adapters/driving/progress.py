@@ -0,0 +1,81 @@
+"""
+Per-file progress streams for batch conversions.
+
+Instead of one response once the whole batch is done, streamed batch
+endpoints send an event as each file starts and finishes, followed by a
+final ``completed`` event with the totals. Events are encoded either as
+server-sent events (``text/event-stream``) or as newline-delimited JSON
+(``application/x-ndjson``, each object carrying its ``event`` name).
+"""
+import asyncio
+import json
+from typing import Any, AsyncIterator, Awaitable, Optional
+
+from src.application.batch import BatchItemResult
+from src.infrastructure.logger import logger
+
+STREAM_MEDIA_TYPES = {"sse": "text/event-stream", "ndjson": "application/x-ndjson"}
+# Keep proxies from buffering the stream
+STREAM_HEADERS = {"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+
+# BatchItemResult.status -> event name
+_ITEM_EVENTS = {"success": "succeeded", "unchanged": "unchanged", "error": "failed"}
+
+
+def encode_event(event: str, data: dict, stream_format: str) -> bytes:
+    if stream_format == "sse":
+        return f"event: {event}\ndata: {json.dumps(data)}\n\n".encode("utf-8")
+    return (json.dumps({"event": event, **data}) + "\n").encode("utf-8")
+
+
+def batch_item_event(item: BatchItemResult) -> tuple[str, dict]:
+    """The event reporting a finished bulk conversion item."""
+    if item.status == "error":
+        data: dict[str, Any] = {"file": item.file, "error": item.error}
+    else:
+        data = {"file": item.file, "output": item.output, "size_bytes": item.output_bytes}
+    data["duration_s"] = item.duration_s
+    return _ITEM_EVENTS.get(item.status, item.status), data
+
+
+class ProgressStream:
+    """
+    Collects events from the event loop (emit) or from worker threads
+    (emit_threadsafe) and yields them encoded while a producer runs.
+    Create it on the event loop.
+    """
+
+    def __init__(self, stream_format: str):
+        self.stream_format = stream_format
+        self.media_type = STREAM_MEDIA_TYPES[stream_format]
+        self._loop = asyncio.get_running_loop()
+        self._queue: asyncio.Queue[Optional[tuple[str, dict]]] = asyncio.Queue()
+
+    def emit(self, event: str, **data: Any) -> None:
+        self._queue.put_nowait((event, data))
+
+    def emit_threadsafe(self, event: str, **data: Any) -> None:
+        self._loop.call_soon_threadsafe(self._queue.put_nowait, (event, data))
+
+    async def run(self, producer: Awaitable[dict]) -> AsyncIterator[bytes]:
+        """
+        Yields events until producer finishes, then a ``completed`` event
+        with the dict it returned (or an ``error`` event if it raised).
+        The producer is cancelled if the client goes away.
+        """
+        task = asyncio.ensure_future(producer)
+        # Thread-side events are queued before the producer's result arrives
+        task.add_done_callback(lambda _: self._queue.put_nowait(None))
+        try:
+            while (item := await self._queue.get()) is not None:
+                yield encode_event(*item, self.stream_format)
+            try:
+                totals = task.result()
+            except Exception as e:
+                logger.exception("Streamed batch conversion failed")
+                yield encode_event("error", {"error": str(e)}, self.stream_format)
+            else:
+                yield encode_event("completed", totals, self.stream_format)
+        finally:
+            if not task.done():
+                task.cancel()
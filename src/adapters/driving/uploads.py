@@ -0,0 +1,326 @@
+"""
+Streaming multipart upload reader.
+
+FastAPI's ``UploadFile`` parameters are only filled in once the whole
+request body has been received and spooled, so size limits checked in the
+handler fire after an oversized upload has already been transferred. This
+module reads the body chunk by chunk as it arrives instead:
+
+- requests whose ``Content-Length`` already exceeds the limit are rejected
+  before any of the body is read,
+- each file part is counted and SHA-256 hashed incrementally and the
+  request is rejected (or the part skipped) the moment a limit is crossed,
+- file data is spooled to memory up to a threshold, then to a temporary
+  file; disk writes and reads run in a worker thread, off the event loop.
+"""
+import asyncio
+import hashlib
+from dataclasses import dataclass, field
+from pathlib import Path
+from tempfile import SpooledTemporaryFile
+from typing import Optional
+
+from fastapi import HTTPException, Request
+from multipart.multipart import MultipartParser, parse_options_header
+
+from src.infrastructure.logger import logger
+
+# Room for boundaries, part headers and small form fields
+MULTIPART_OVERHEAD = 64 * 1024
+SPOOL_MAX_SIZE = 1024 * 1024
+
+
+@dataclass
+class ReceivedUpload:
+    """A file part read from the request body."""
+    field_name: str
+    filename: str
+    size: int = 0
+    # Bytes accepted by the reader and not yet written
+    pending: int = 0
+    # Why the part was not kept (too large, unsupported type), if so
+    error: Optional[str] = None
+    _hash: "hashlib._Hash" = field(default_factory=hashlib.sha256, repr=False)
+    _file: SpooledTemporaryFile = field(
+        default_factory=lambda: SpooledTemporaryFile(max_size=SPOOL_MAX_SIZE), repr=False
+    )
+
+    @property
+    def sha256(self) -> str:
+        return self._hash.hexdigest()
+
+    @property
+    def in_memory(self) -> bool:
+        # The spooled file rolls over to disk once it grows past max_size
+        return self.size <= SPOOL_MAX_SIZE
+
+    async def write(self, data: bytes) -> None:
+        self._hash.update(data)
+        self.size += len(data)
+        if self.in_memory:
+            self._file.write(data)
+        else:
+            # Rolling over to (or appending to) the temp file is disk I/O
+            await asyncio.to_thread(self._file.write, data)
+
+    def discard(self, error: str) -> None:
+        """Stops keeping this part's data (it is skipped)."""
+        self.error = error
+        self._file.close()
+
+    async def read(self) -> bytes:
+        """Returns the received content."""
+        if self.in_memory:
+            self._file.seek(0)
+            return self._file.read()
+
+        def read_spooled() -> bytes:
+            self._file.seek(0)
+            return self._file.read()
+        return await asyncio.to_thread(read_spooled)
+
+    def close(self) -> None:
+        self._file.close()
+
+
+@dataclass
+class UploadLimits:
+    """
+    Args:
+        max_file_size: Largest accepted file part
+        allowed_extensions: Accepted file suffixes (lowercase)
+        max_files: Most file parts per request
+        max_total_size: Most bytes kept across all file parts
+        skip_invalid: Skip offending parts (recording why) instead of
+            rejecting the whole request
+        max_body_size: Hard cap on the request body
+    """
+    max_file_size: int
+    allowed_extensions: tuple[str, ...]
+    max_files: int = 1
+    max_total_size: Optional[int] = None
+    skip_invalid: bool = False
+    max_body_size: Optional[int] = None
+
+    @property
+    def body_limit(self) -> int:
+        if self.max_body_size is not None:
+            return self.max_body_size
+        return self.max_file_size * self.max_files + MULTIPART_OVERHEAD
+
+
+class _UploadReader:
+    """Feeds request chunks to python-multipart and applies limits per part."""
+
+    def __init__(self, limits: UploadLimits, charset: str):
+        self.limits = limits
+        self.charset = charset
+        self.uploads: list[ReceivedUpload] = []
+        self.kept_bytes = 0
+        self._current: Optional[ReceivedUpload] = None
+        self._header_name = b""
+        self._header_value = b""
+        self._disposition = b""
+        self._pending: list[tuple[ReceivedUpload, bytes]] = []
+
+    def _reject(self, status_code: int, detail: str):
+        logger.warning("Upload rejected: %s", detail)
+        raise HTTPException(status_code=status_code, detail=detail)
+
+    def on_part_begin(self) -> None:
+        self._current = None
+        self._disposition = b""
+
+    def on_header_field(self, data: bytes, start: int, end: int) -> None:
+        self._header_name += data[start:end]
+
+    def on_header_value(self, data: bytes, start: int, end: int) -> None:
+        self._header_value += data[start:end]
+
+    def on_header_end(self) -> None:
+        if self._header_name.lower() == b"content-disposition":
+            self._disposition = self._header_value
+        self._header_name = b""
+        self._header_value = b""
+
+    def on_headers_finished(self) -> None:
+        _, options = parse_options_header(self._disposition)
+        if b"filename" not in options:
+            # Plain form fields are ignored
+            return
+        if len(self.uploads) >= self.limits.max_files:
+            self._reject(400, f"Too many files. Maximum {self.limits.max_files} files allowed.")
+        upload = ReceivedUpload(
+            field_name=options.get(b"name", b"").decode(self.charset, "replace"),
+            filename=options[b"filename"].decode(self.charset, "replace"),
+        )
+        self.uploads.append(upload)
+        self._current = upload
+
+        ext = Path(upload.filename).suffix.lower()
+        if ext not in self.limits.allowed_extensions:
+            if not self.limits.skip_invalid:
+                self._reject(
+                    400,
+                    f"Unsupported file type '{ext}'. Only .md, .markdown, and .txt are supported."
+                )
+            upload.discard(f"Unsupported format: {ext}")
+
+    def on_part_data(self, data: bytes, start: int, end: int) -> None:
+        upload = self._current
+        if upload is None or upload.error:
+            return
+        chunk = data[start:end]
+        size = upload.size + upload.pending + len(chunk)
+        limit_mb = self.limits.max_file_size // (1024 * 1024)
+        if size > self.limits.max_file_size:
+            if not self.limits.skip_invalid:
+                self._reject(413, f"File size exceeds {limit_mb}MB limit")
+            self._drop(upload, f"File exceeds {limit_mb}MB limit")
+            return
+        total = self.limits.max_total_size
+        if total is not None and self.kept_bytes + len(chunk) > total:
+            self._drop(upload, f"Total request size exceeds {total // (1024 * 1024)}MB limit")
+            return
+        self.kept_bytes += len(chunk)
+        upload.pending += len(chunk)
+        self._pending.append((upload, chunk))
+
+    def _drop(self, upload: ReceivedUpload, error: str) -> None:
+        # Bytes already kept for this part no longer count towards the total
+        self.kept_bytes -= upload.size + upload.pending
+        upload.pending = 0
+        self._pending = [(u, c) for u, c in self._pending if u is not upload]
+        upload.discard(error)
+
+    def on_part_end(self) -> None:
+        self._current = None
+
+    async def flush(self) -> None:
+        """Writes the chunks collected by the (synchronous) parser callbacks."""
+        pending, self._pending = self._pending, []
+        for upload, chunk in pending:
+            if not upload.error:
+                upload.pending -= len(chunk)
+                await upload.write(chunk)
+
+    def close(self) -> None:
+        for upload in self.uploads:
+            upload.close()
+
+
+async def receive_uploads(request: Request, limits: UploadLimits) -> list[ReceivedUpload]:
+    """
+    Reads the multipart body of request, enforcing limits while it streams in.
+
+    Raises HTTPException 413 when the body or a file is too large (unless
+    limits.skip_invalid) and 400 for malformed bodies or disallowed files.
+    The caller owns the returned uploads and should close() them.
+    """
+    content_length = request.headers.get("content-length")
+    if content_length and content_length.isdigit() and int(content_length) > limits.body_limit:
+        logger.warning("Upload rejected from Content-Length: %s bytes", content_length)
+        raise HTTPException(status_code=413, detail="Request body too large")
+
+    content_type, params = parse_options_header(request.headers.get("content-type", ""))
+    boundary = params.get(b"boundary")
+    if content_type != b"multipart/form-data" or not boundary:
+        raise HTTPException(status_code=400, detail="Expected a multipart/form-data upload")
+    charset = params.get(b"charset", b"utf-8").decode("latin-1")
+
+    reader = _UploadReader(limits, charset)
+    parser = MultipartParser(boundary, {
+        "on_part_begin": reader.on_part_begin,
+        "on_part_data": reader.on_part_data,
+        "on_part_end": reader.on_part_end,
+        "on_header_field": reader.on_header_field,
+        "on_header_value": reader.on_header_value,
+        "on_header_end": reader.on_header_end,
+        "on_headers_finished": reader.on_headers_finished,
+    })
+    received = 0
+    try:
+        async for chunk in request.stream():
+            received += len(chunk)
+            # Covers chunked bodies and lying Content-Length headers
+            if received > limits.body_limit:
+                raise HTTPException(status_code=413, detail="Request body too large")
+            parser.write(chunk)
+            await reader.flush()
+        parser.finalize()
+    except HTTPException:
+        reader.close()
+        raise
+    except Exception as e:
+        reader.close()
+        logger.warning("Malformed multipart upload: %s", e)
+        raise HTTPException(status_code=400, detail="Malformed multipart upload")
+    return reader.uploads
+
+
+def body_media_type(request: Request) -> tuple[str, str]:
+    """The request's media type (lowercase) and charset (utf-8 when not given)."""
+    content_type, params = parse_options_header(request.headers.get("content-type", ""))
+    return content_type.decode("latin-1").lower(), params.get(b"charset", b"utf-8").decode("latin-1").lower()
+
+
+async def receive_body(request: Request, max_size: int) -> tuple[bytes, str]:
+    """
+    Reads a plain (non-multipart) request body into memory with its SHA-256,
+    enforcing max_size as it streams in (413 up front from Content-Length,
+    or as soon as the received bytes cross it).
+    """
+    content_length = request.headers.get("content-length")
+    if content_length and content_length.isdigit() and int(content_length) > max_size:
+        logger.warning("Body rejected from Content-Length: %s bytes", content_length)
+        raise HTTPException(status_code=413, detail=f"Request body exceeds {max_size // (1024 * 1024)}MB limit")
+
+    digest = hashlib.sha256()
+    chunks: list[bytes] = []
+    received = 0
+    async for chunk in request.stream():
+        received += len(chunk)
+        if received > max_size:
+            raise HTTPException(status_code=413, detail=f"Request body exceeds {max_size // (1024 * 1024)}MB limit")
+        digest.update(chunk)
+        chunks.append(chunk)
+    return b"".join(chunks), digest.hexdigest()
+
+
+def multipart_body(field_name: str, multiple: bool = False) -> dict:
+    """OpenAPI requestBody for handlers that read uploads with receive_uploads()."""
+    file_schema = {"type": "string", "format": "binary"}
+    return {
+        "requestBody": {
+            "required": True,
+            "content": {
+                "multipart/form-data": {
+                    "schema": {
+                        "type": "object",
+                        "required": [field_name],
+                        "properties": {
+                            field_name: {"type": "array", "items": file_schema} if multiple else file_schema
+                        },
+                    }
+                }
+            },
+        }
+    }
+
+
+def text_body(media_types: tuple[str, ...]) -> dict:
+    """OpenAPI requestBody for handlers that take a document as the raw body or as JSON."""
+    text_schema = {"type": "string"}
+    json_schema = {
+        "type": "object",
+        "required": ["content"],
+        "properties": {
+            "content": {"type": "string"},
+            "format": {"type": "string", "enum": ["markdown", "text"], "default": "markdown"},
+            "filename": {"type": "string"},
+            "theme": {"type": "string"},
+        },
+    }
+    content = {media_type: {"schema": text_schema} for media_type in media_types}
+    content["application/json"] = {"schema": json_schema}
+    return {"requestBody": {"required": True, "content": content}}
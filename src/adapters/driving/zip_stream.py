@@ -0,0 +1,67 @@
+"""
+Incremental ZIP writer for streaming HTTP responses.
+
+zipfile falls back to data descriptors when its target is not seekable,
+so every entry can be emitted as soon as it is added and the central
+directory is written once at the end. Nothing is buffered beyond the
+entry currently being written.
+"""
+import zipfile
+
+
+class _ChunkSink:
+    """Non-seekable, write-only file object collecting zipfile output."""
+
+    def __init__(self):
+        self._chunks: list[bytes] = []
+
+    def write(self, data) -> int:
+        self._chunks.append(bytes(data))
+        return len(data)
+
+    def flush(self) -> None:
+        pass
+
+    def drain(self) -> bytes:
+        data = b"".join(self._chunks)
+        self._chunks.clear()
+        return data
+
+
+class ZipStreamWriter:
+    """
+    Builds a ZIP archive chunk by chunk.
+
+    Usage:
+        writer = ZipStreamWriter()
+        yield writer.add(writer.reserve("a.pdf"), pdf_bytes)
+        yield writer.close()
+
+    PDFs are already compressed, so entries are STORED by default.
+    """
+
+    def __init__(self, compression: int = zipfile.ZIP_STORED):
+        self._sink = _ChunkSink()
+        self._zip = zipfile.ZipFile(self._sink, mode="w", compression=compression)
+        self._names: set[str] = set()
+
+    def add(self, name: str, data: bytes) -> bytes:
+        """Writes one entry and returns the bytes to send for it."""
+        self._names.add(name)
+        self._zip.writestr(name, data)
+        return self._sink.drain()
+
+    def close(self) -> bytes:
+        """Writes the central directory and returns the final bytes."""
+        self._zip.close()
+        return self._sink.drain()
+
+    def reserve(self, name: str) -> str:
+        """Returns an entry name not used yet (two uploads may share a stem)."""
+        candidate, counter = name, 1
+        while candidate in self._names:
+            stem, dot, ext = name.rpartition(".")
+            candidate = f"{stem} ({counter}){dot}{ext}" if dot else f"{name} ({counter})"
+            counter += 1
+        self._names.add(candidate)
+        return candidate
@@ -0,0 +1,236 @@
+"""
+Batch conversion engine shared by /bulk-convert and scripts/process_local.py.
+
+Files are converted concurrently by a fixed number of workers, each file
+under its own timeout, and results are reported in input order together
+with throughput figures for the whole run. Incremental runs consult the
+output directory's build manifest and skip inputs whose PDF is current.
+
+Inputs may be a lazy scan of a large tree: only a small window of files is
+in flight at a time, and with an input root the outputs mirror the input
+directory layout.
+"""
+import os
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field, asdict
+from pathlib import Path
+from typing import Callable, Iterable, Optional
+from src.application.manifest import MANIFEST_NAME, BuildManifest
+from src.application.service import ConversionService
+from src.infrastructure.logger import logger
+
+
+@dataclass
+class BatchItemResult:
+    file: str
+    status: str
+    error: Optional[str] = None
+    output: Optional[str] = None
+    input_bytes: int = 0
+    output_bytes: int = 0
+    duration_s: float = 0.0
+
+
+@dataclass
+class BatchSummary:
+    results: list[BatchItemResult] = field(default_factory=list)
+    elapsed_s: float = 0.0
+    workers: int = 1
+    # Outputs deleted because their input is gone (incremental runs with prune)
+    pruned: list[str] = field(default_factory=list)
+
+    @property
+    def processed(self) -> int:
+        return len(self.results)
+
+    @property
+    def successful(self) -> int:
+        return sum(1 for r in self.results if r.status == "success")
+
+    @property
+    def unchanged(self) -> int:
+        return sum(1 for r in self.results if r.status == "unchanged")
+
+    @property
+    def failed(self) -> int:
+        return sum(1 for r in self.results if r.status == "error")
+
+    @property
+    def files_per_second(self) -> float:
+        return self.processed / self.elapsed_s if self.elapsed_s > 0 else 0.0
+
+    @property
+    def mb_per_second(self) -> float:
+        total_mb = sum(r.input_bytes for r in self.results) / (1024 * 1024)
+        return total_mb / self.elapsed_s if self.elapsed_s > 0 else 0.0
+
+    def to_dict(self) -> dict:
+        return {
+            "processed": self.processed,
+            "successful": self.successful,
+            "failed": self.failed,
+            "unchanged": self.unchanged,
+            "pruned": self.pruned,
+            "throughput": self.throughput(),
+            "results": [asdict(r) for r in self.results],
+        }
+
+    def throughput(self) -> dict:
+        return {
+            "workers": self.workers,
+            "elapsed_s": round(self.elapsed_s, 3),
+            "files_per_s": round(self.files_per_second, 3),
+            "mb_per_s": round(self.mb_per_second, 3),
+        }
+
+
+class BatchConverter:
+    """
+    Converts many files in parallel through a ConversionService.
+
+    Each worker thread drives one conversion at a time; when the service has
+    a RenderExecutor the renders themselves run in its process pool, so
+    ``workers`` should match the pool size to keep every core busy.
+    """
+
+    def __init__(self, service: ConversionService, workers: int = 1, file_timeout: Optional[float] = None):
+        self.service = service
+        self.workers = max(1, workers)
+        self.file_timeout = file_timeout
+
+    def convert_one(
+        self,
+        input_path: str,
+        output_dir: str,
+        manifest: Optional[BuildManifest] = None,
+        options: str = "",
+        input_root: Optional[str] = None,
+        on_start: Optional[Callable[[str], None]] = None,
+    ) -> BatchItemResult:
+        """
+        Converts one file into output_dir, skipping it when the manifest says
+        it is current. With input_root, the output keeps the input's path
+        below the root (sub/doc.md -> output_dir/sub/doc.pdf). on_start is
+        called with the file's name just before it is rendered.
+        """
+        p_in = Path(input_path)
+        if input_root is None:
+            name = p_in.name
+            output_path = Path(output_dir) / f"{p_in.stem}.pdf"
+        else:
+            relative = Path(os.path.relpath(p_in, input_root))
+            name = relative.as_posix()
+            output_path = Path(output_dir) / relative.with_suffix(".pdf")
+        start = time.perf_counter()
+        input_bytes = self._size(p_in)
+        try:
+            state = None
+            if manifest is not None:
+                state = manifest.input_state(str(p_in))
+                if manifest.is_current(str(p_in), str(output_path), options, state):
+                    return BatchItemResult(
+                        file=name,
+                        status="unchanged",
+                        output=self._output_name(output_path, output_dir),
+                        input_bytes=input_bytes,
+                        output_bytes=self._size(output_path),
+                        duration_s=round(time.perf_counter() - start, 4),
+                    )
+            output_path.parent.mkdir(parents=True, exist_ok=True)
+            if on_start:
+                on_start(name)
+            self.service.convert_file(str(p_in), str(output_path), timeout=self.file_timeout)
+            if manifest is not None:
+                manifest.record(str(p_in), str(output_path), options, state)
+            return BatchItemResult(
+                file=name,
+                status="success",
+                output=self._output_name(output_path, output_dir),
+                input_bytes=input_bytes,
+                output_bytes=self._size(output_path),
+                duration_s=round(time.perf_counter() - start, 4),
+            )
+        except Exception as e:
+            logger.error("Failed to convert %s: %s", name, e)
+            if manifest is not None:
+                manifest.forget(str(p_in))
+            return BatchItemResult(
+                file=name,
+                status="error",
+                error=str(e),
+                input_bytes=input_bytes,
+                duration_s=round(time.perf_counter() - start, 4),
+            )
+
+    @staticmethod
+    def _size(path: Path) -> int:
+        try:
+            return os.path.getsize(path)
+        except OSError:
+            return 0
+
+    @staticmethod
+    def _output_name(output_path: Path, output_dir: str) -> str:
+        return Path(os.path.relpath(output_path, output_dir)).as_posix()
+
+    def run(
+        self,
+        files: Iterable[str],
+        output_dir: str,
+        incremental: bool = False,
+        prune: bool = False,
+        input_root: Optional[str] = None,
+        manifest_name: str = MANIFEST_NAME,
+        on_start: Optional[Callable[[str], None]] = None,
+        on_result: Optional[Callable[[BatchItemResult], None]] = None,
+    ) -> BatchSummary:
+        """
+        Converts files into output_dir; results keep the input order.
+
+        incremental skips inputs whose content, render options and output
+        PDF are unchanged since the run recorded in the output directory's
+        build manifest (manifest_name; one per shard). prune (incremental
+        only) also deletes the recorded outputs of inputs that no longer
+        exist. files is consumed lazily.
+
+        For progress reporting, on_start(name) is called when a file starts
+        rendering and on_result(result) as soon as a file is done (in
+        completion order, from worker threads).
+        """
+        logger.info("Batch conversion started with %s worker(s)", self.workers)
+        manifest = BuildManifest.load(output_dir, manifest_name) if incremental else None
+        options = self.service.render_options_key() if incremental else ""
+        seen: set[str] = set()
+        results: list[BatchItemResult] = []
+        start = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="batch") as pool:
+            # A few files per worker in flight: enough to keep workers busy
+            # without a pending future for every file of a huge scan
+            in_flight = deque()
+            for path in files:
+                if prune:
+                    seen.add(BuildManifest.key(path))
+                future = pool.submit(self.convert_one, path, output_dir, manifest, options, input_root, on_start)
+                if on_result:
+                    future.add_done_callback(lambda done: on_result(done.result()))
+                in_flight.append(future)
+                if len(in_flight) >= self.workers * 4:
+                    # Collected in submission order regardless of completion order
+                    results.append(in_flight.popleft().result())
+            results.extend(future.result() for future in in_flight)
+        pruned = []
+        if manifest is not None:
+            if prune:
+                pruned = manifest.prune(seen)
+            manifest.save()
+        summary = BatchSummary(
+            results=results, elapsed_s=time.perf_counter() - start, workers=self.workers, pruned=pruned
+        )
+        logger.info(
+            "Batch conversion completed: %s/%s successful, %s unchanged, %s pruned (%.2f files/s, %.2f MB/s)",
+            summary.successful, summary.processed, summary.unchanged, len(pruned),
+            summary.files_per_second, summary.mb_per_second
+        )
+        return summary
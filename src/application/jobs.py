@@ -0,0 +1,197 @@
+"""
+Asynchronous conversion jobs.
+
+Clients submit a document, receive a job ID immediately and poll for the
+result later, so long renders never hold an HTTP connection open. Jobs
+wait in a bounded in-process queue drained by a fixed number of worker
+tasks; when the queue is full new submissions are rejected instead of
+piling up. Finished jobs are kept for a limited time and then expired.
+"""
+import asyncio
+import os
+import time
+import uuid
+from dataclasses import dataclass
+from enum import Enum
+from typing import Callable, Optional
+from src.application.service import ConversionService
+from src.domain.exceptions import JobQueueFullError
+from src.domain.model import ConversionResult
+from src.infrastructure.logger import logger
+
+
+class JobStatus(str, Enum):
+    QUEUED = "queued"
+    RUNNING = "running"
+    SUCCEEDED = "succeeded"
+    FAILED = "failed"
+
+
+@dataclass
+class Job:
+    id: str
+    filename: str
+    content: Optional[bytes]
+    status: JobStatus = JobStatus.QUEUED
+    created_at: float = 0.0
+    started_at: Optional[float] = None
+    finished_at: Optional[float] = None
+    error: Optional[str] = None
+    result: Optional[ConversionResult] = None
+
+    @property
+    def output_filename(self) -> str:
+        return f"{os.path.splitext(self.filename)[0]}.pdf"
+
+    def to_dict(self) -> dict:
+        return {
+            "job_id": self.id,
+            "file": self.filename,
+            "status": self.status.value,
+            "created_at": self.created_at,
+            "started_at": self.started_at,
+            "finished_at": self.finished_at,
+            "size_bytes": self.result.size_bytes if self.result else None,
+            "error": self.error,
+        }
+
+
+class JobManager:
+    """
+    Bounded job queue with a fixed pool of async workers.
+
+    Args:
+        service_factory: Returns the ConversionService used to run jobs
+        workers: Number of jobs rendered concurrently
+        queue_size: Maximum number of jobs waiting to start
+        result_ttl: Seconds a finished job (and its PDF) is retained
+        spill_threshold: Forwarded to ConversionService.convert_content_async
+            (also the size above which add_finished callers should spill)
+    """
+
+    def __init__(
+        self,
+        service_factory: Callable[[], ConversionService],
+        workers: int = 2,
+        queue_size: int = 100,
+        result_ttl: float = 600,
+        spill_threshold: Optional[int] = None,
+    ):
+        self.service_factory = service_factory
+        self.workers = max(1, workers)
+        self.queue_size = queue_size
+        self.result_ttl = result_ttl
+        self.spill_threshold = spill_threshold
+        self._jobs: dict[str, Job] = {}
+        # IDs of retained results recorded by add_finished
+        self._added: set[str] = set()
+        self._queue: Optional[asyncio.Queue] = None
+        self._tasks: list[asyncio.Task] = []
+
+    @property
+    def started(self) -> bool:
+        return bool(self._tasks)
+
+    def start(self) -> None:
+        """Starts worker tasks on the running event loop (idempotent)."""
+        if self.started:
+            return
+        self._queue = asyncio.Queue(maxsize=self.queue_size)
+        self._tasks = [asyncio.create_task(self._worker(i)) for i in range(self.workers)]
+        self._tasks.append(asyncio.create_task(self._sweeper()))
+        logger.info("Job manager started: %s worker(s), queue size %s", self.workers, self.queue_size)
+
+    async def stop(self) -> None:
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+        for job in list(self._jobs.values()):
+            self._discard(job)
+        self._jobs.clear()
+        self._added.clear()
+
+    def queue_depth(self) -> int:
+        return self._queue.qsize() if self._queue else 0
+
+    def submit(self, content: bytes, filename: str) -> Job:
+        """Enqueues a conversion; raises JobQueueFullError when saturated."""
+        self.start()
+        job = Job(id=uuid.uuid4().hex, filename=filename, content=content, created_at=time.time())
+        try:
+            self._queue.put_nowait(job)
+        except asyncio.QueueFull:
+            logger.warning("Job queue full (%s), rejecting %s", self.queue_size, filename)
+            raise JobQueueFullError("Job queue is full, retry later")
+        self._jobs[job.id] = job
+        logger.info("Job %s queued: %s", job.id, filename)
+        return job
+
+    def add_finished(self, filename: str, result: ConversionResult) -> Job:
+        """
+        Records a conversion rendered elsewhere (e.g. a streamed batch) as a
+        succeeded job, so its PDF can be fetched like a job result until it
+        expires. At most queue_size such results are retained at once;
+        raises JobQueueFullError beyond that (the caller keeps the result).
+        """
+        self.start()
+        self._expire()
+        if len(self._added) >= self.queue_size:
+            logger.warning("Retained results full (%s), not keeping %s", self.queue_size, filename)
+            raise JobQueueFullError("Too many conversion results are retained, retry later")
+        now = time.time()
+        job = Job(
+            id=uuid.uuid4().hex, filename=filename, content=None, status=JobStatus.SUCCEEDED,
+            created_at=now, started_at=now, finished_at=now, result=result,
+        )
+        self._jobs[job.id] = job
+        self._added.add(job.id)
+        return job
+
+    def get(self, job_id: str) -> Optional[Job]:
+        self._expire()
+        return self._jobs.get(job_id)
+
+    async def _worker(self, index: int) -> None:
+        while True:
+            job = await self._queue.get()
+            job.status = JobStatus.RUNNING
+            job.started_at = time.time()
+            try:
+                service = self.service_factory()
+                job.result = await service.convert_content_async(
+                    job.content, job.filename, spill_threshold=self.spill_threshold
+                )
+                job.status = JobStatus.SUCCEEDED
+                logger.info("Job %s succeeded", job.id)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                job.status = JobStatus.FAILED
+                job.error = str(e)
+                logger.error("Job %s failed: %s", job.id, e)
+            finally:
+                job.content = None  # Source no longer needed
+                job.finished_at = time.time()
+                self._queue.task_done()
+
+    async def _sweeper(self) -> None:
+        while True:
+            await asyncio.sleep(min(self.result_ttl, 60))
+            self._expire()
+
+    def _expire(self) -> None:
+        cutoff = time.time() - self.result_ttl
+        for job in list(self._jobs.values()):
+            if job.finished_at is not None and job.finished_at < cutoff:
+                self._discard(job)
+                del self._jobs[job.id]
+                self._added.discard(job.id)
+
+    def _discard(self, job: Job) -> None:
+        # Spilled results live in temp files owned by the job
+        if job.result and job.result.content is None and job.result.file_path:
+            try:
+                os.remove(job.result.file_path)
+            except OSError:
+                pass
@@ -0,0 +1,169 @@
+"""
+Build manifest for incremental batch conversion.
+
+Kept next to the outputs (``<output_dir>/.bulk-manifest.json``), it maps
+each converted input to the SHA-256 of its bytes, the render options used
+and a fingerprint (size, mtime) of the PDF it produced. A later run skips
+an input whose content and options are unchanged and whose PDF is still
+the one recorded. Inputs whose size and mtime did not change are not even
+re-hashed, so an unchanged tree costs one stat per file.
+
+Sharded runs keep one manifest per shard (``.bulk-manifest.<i>-of-<n>.json``),
+so nodes sharing an output directory never overwrite each other's entries.
+"""
+import hashlib
+import json
+import os
+import threading
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from src.infrastructure.logger import logger
+
+MANIFEST_NAME = ".bulk-manifest.json"
+MANIFEST_VERSION = 1
+
+
+def manifest_name(shard_index: int = 0, shard_count: int = 1) -> str:
+    if shard_count <= 1:
+        return MANIFEST_NAME
+    return f".bulk-manifest.{shard_index}-of-{shard_count}.json"
+
+
+@dataclass
+class ManifestEntry:
+    content_hash: str
+    options: str
+    output: str
+    input_size: int
+    input_mtime_ns: int
+    output_size: int
+    output_mtime_ns: int
+
+
+@dataclass(frozen=True)
+class InputState:
+    content_hash: str
+    size: int
+    mtime_ns: int
+
+
+def file_sha256(path: Path, chunk_size: int = 1024 * 1024) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class BuildManifest:
+    """
+    Input -> (content hash, options, output fingerprint) map of one output dir.
+
+    Safe to update from concurrent batch workers; written atomically by save().
+    """
+
+    def __init__(self, output_dir: str, name: str = MANIFEST_NAME):
+        self.path = Path(output_dir) / name
+        self.entries: dict[str, ManifestEntry] = {}
+        self._lock = threading.Lock()
+
+    @classmethod
+    def load(cls, output_dir: str, name: str = MANIFEST_NAME) -> "BuildManifest":
+        manifest = cls(output_dir, name)
+        try:
+            data = json.loads(manifest.path.read_text(encoding="utf-8"))
+            if data.get("version") == MANIFEST_VERSION:
+                manifest.entries = {key: ManifestEntry(**entry) for key, entry in data["entries"].items()}
+        except FileNotFoundError:
+            pass
+        except (ValueError, TypeError, KeyError) as e:
+            # A damaged manifest only costs a full rebuild
+            logger.warning("Ignoring unreadable build manifest %s: %s", manifest.path, e)
+        return manifest
+
+    @staticmethod
+    def key(input_path: str) -> str:
+        return Path(input_path).as_posix()
+
+    def _output_name(self, output_path: str) -> str:
+        """Output path relative to the manifest's directory."""
+        return Path(os.path.relpath(output_path, self.path.parent)).as_posix()
+
+    def input_state(self, input_path: str) -> InputState:
+        """
+        Hash and stat of the input, taken before it is converted. The
+        recorded hash is reused while size and mtime are unchanged.
+        """
+        stat = os.stat(input_path)
+        entry = self.entries.get(self.key(input_path))
+        if entry and (entry.input_size, entry.input_mtime_ns) == (stat.st_size, stat.st_mtime_ns):
+            content_hash = entry.content_hash
+        else:
+            content_hash = file_sha256(Path(input_path))
+        return InputState(content_hash, stat.st_size, stat.st_mtime_ns)
+
+    def is_current(self, input_path: str, output_path: str, options: str, state: InputState) -> bool:
+        """True when output_path is the intact output of this exact input and options."""
+        entry = self.entries.get(self.key(input_path))
+        if entry is None or entry.options != options or entry.output != self._output_name(output_path):
+            return False
+        if entry.content_hash != state.content_hash:
+            return False
+        try:
+            output = os.stat(output_path)
+        except OSError:
+            return False
+        return (output.st_size, output.st_mtime_ns) == (entry.output_size, entry.output_mtime_ns)
+
+    def record(self, input_path: str, output_path: str, options: str, state: InputState) -> None:
+        """Records a successful conversion of input_path (as it was in state) into output_path."""
+        output = os.stat(output_path)
+        entry = ManifestEntry(
+            content_hash=state.content_hash,
+            options=options,
+            output=self._output_name(output_path),
+            input_size=state.size,
+            input_mtime_ns=state.mtime_ns,
+            output_size=output.st_size,
+            output_mtime_ns=output.st_mtime_ns,
+        )
+        with self._lock:
+            self.entries[self.key(input_path)] = entry
+
+    def forget(self, input_path: str) -> None:
+        with self._lock:
+            self.entries.pop(self.key(input_path), None)
+
+    def prune(self, inputs: set[str]) -> list[str]:
+        """
+        Deletes recorded outputs whose input is not in inputs and no longer
+        exists; returns the deleted output names. Files the manifest did not
+        produce are never touched.
+        """
+        pruned = []
+        with self._lock:
+            for key in list(self.entries):
+                if key in inputs or os.path.exists(key):
+                    continue
+                entry = self.entries.pop(key)
+                output_path = self.path.parent / entry.output
+                # Another input may have produced the same output name since
+                if any(other.output == entry.output for other in self.entries.values()):
+                    continue
+                try:
+                    output_path.unlink()
+                    pruned.append(entry.output)
+                except FileNotFoundError:
+                    pass
+        return pruned
+
+    def save(self) -> None:
+        with self._lock:
+            data = {
+                "version": MANIFEST_VERSION,
+                "entries": {key: asdict(entry) for key, entry in sorted(self.entries.items())},
+            }
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.path.with_name(self.path.name + ".tmp")
+        tmp_path.write_text(json.dumps(data, indent=2) + "\n", encoding="utf-8")
+        os.replace(tmp_path, self.path)
@@ -1,17 +1,109 @@
+import asyncio
+import hashlib
+import time
+from concurrent.futures import TimeoutError as FutureTimeoutError
 from datetime import datetime
 import os
 from pathlib import Path
-from typing import Optional
-from src.domain.model import ConversionRequest, SourceFormat
-from src.domain.ports import PDFConverterPort, FileSystemPort, ArchiverPort
-from src.domain.exceptions import UnsupportedFormatError, ConversionError
+from typing import Awaitable, Callable, Optional
+from src.domain.model import ConversionRequest, ConversionResult, SourceFormat
+from src.domain.ports import PDFConverterPort, FileSystemPort, ArchiverPort, RenderCachePort, SectionRendererPort
+from src.domain.exceptions import UnsupportedFormatError, ConversionError, ThemeNotFoundError
+from src.application.singleflight import SingleFlight
+from src.infrastructure.executor import RenderExecutor
 from src.infrastructure.logger import logger
+from src.infrastructure.metrics import ConversionTrace, timed, trace_conversion
+
+
+# Converter installed in a render worker by install_worker_converter. Jobs
+# submitted with converter=None use it, so the converter (and the themes,
+# templates and parsers it caches) is unpickled once per worker instead of
+# once per job.
+_worker_converter: Optional[PDFConverterPort] = None
+
+
+def warm_up_converter(converter: PDFConverterPort) -> None:
+    """Loads the render stack (fonts, themes, parsers) in this process."""
+    warm_up = getattr(converter, "warm_up", None)
+    if warm_up:
+        warm_up()
+
+
+def install_worker_converter(converter: PDFConverterPort) -> None:
+    """Pool initializer: keeps converter for this worker's jobs and warms it up."""
+    global _worker_converter
+    _worker_converter = converter
+    warm_up_converter(converter)
+
+
+def _installed_in_workers(executor: Optional[RenderExecutor], converter: PDFConverterPort) -> bool:
+    return (
+        getattr(executor, "initializer", None) is install_worker_converter
+        and getattr(executor, "initargs", ())[:1] == (converter,)
+    )
+
+
+def _converter(converter: Optional[PDFConverterPort]) -> PDFConverterPort:
+    return converter if converter is not None else _worker_converter
+
+
+def _render(converter: Optional[PDFConverterPort], request: ConversionRequest, output_dir: str) -> ConversionResult:
+    """Module-level render entry point so it can be pickled into pool workers."""
+    return _converter(converter).convert(request, output_dir)
+
+
+def _render_in_memory(
+    converter: Optional[PDFConverterPort], request: ConversionRequest, spill_threshold: Optional[int]
+) -> ConversionResult:
+    """In-memory counterpart of _render for pool workers."""
+    return _converter(converter).render(request, spill_threshold)
+
+
+def _render_section(converter: Optional[SectionRendererPort], request: ConversionRequest) -> ConversionResult:
+    return _converter(converter).render_section(request)
+
+
+def _number_section(converter: Optional[SectionRendererPort], request: ConversionRequest, pdf: bytes, first_page: int) -> bytes:
+    return _converter(converter).number_section(request, pdf, first_page)
+
+
+def _merge_sections(
+    converter: Optional[SectionRendererPort],
+    request: ConversionRequest,
+    sections: list[bytes],
+    output_dir: Optional[str],
+    spill_threshold: Optional[int],
+) -> ConversionResult:
+    return _converter(converter).merge_sections(request, sections, output_dir, spill_threshold)
+
 
 class ConversionService:
-    def __init__(self, converter: PDFConverterPort, fs: FileSystemPort, archiver: Optional[ArchiverPort] = None):
+    def __init__(
+        self,
+        converter: PDFConverterPort,
+        fs: FileSystemPort,
+        archiver: Optional[ArchiverPort] = None,
+        executor: Optional[RenderExecutor] = None,
+        cache: Optional[RenderCachePort] = None,
+        section_chars: int = 0,
+    ):
         self.converter = converter
         self.fs = fs
         self.archiver = archiver
+        self.executor = executor
+        self.cache = cache
+        # What jobs carry to the workers: nothing when the workers already
+        # hold this converter, the converter itself otherwise
+        self._job_converter = None if _installed_in_workers(executor, converter) else converter
+        # Documents of at least twice this many characters are rendered as
+        # parallel sections of at least this size (0 disables). Splitting
+        # only pays off with several workers to share the sections, and
+        # needs a converter that can render sections.
+        parallel = executor is not None and executor.max_workers > 1
+        sectioned = parallel and isinstance(converter, SectionRendererPort)
+        self.section_chars = section_chars if sectioned else 0
+        # Identical renders (same cache key) running at once share one render
+        self.flights = SingleFlight()
 
     def __get_format(self, path: str) -> SourceFormat:
         ext = Path(path).suffix.lower()
@@ -20,43 +112,453 @@ class ConversionService:
         elif ext == '.txt':
             return SourceFormat.TEXT
         else:
-            logger.error(f"Unsupported extension: {ext} for file {path}")
+            logger.error("Unsupported extension: %s for file %s", ext, path)
             raise UnsupportedFormatError(f"Unsupported file format: {ext}")
 
-    def convert_file(self, input_path: str, output_path: str) -> str:
-        """
-        Orchestrates the conversion of a file to PDF.
-        """
-        logger.info(f"Starting conversion job: {input_path} -> {output_path}")
+    def _check_theme(self, theme: Optional[str]) -> None:
+        if theme is not None and theme not in self.converter.themes_available():
+            logger.error("Unknown theme requested: %s", theme)
+            raise ThemeNotFoundError(f"Unknown theme: {theme}")
+
+    def _build_request(
+        self,
+        content: str | bytes,
+        filename: str,
+        theme: Optional[str] = None,
+        content_hash: Optional[str] = None,
+        trace: Optional[ConversionTrace] = None,
+    ) -> ConversionRequest:
+        """Builds a request from content already held in memory."""
+        trace = trace or ConversionTrace()
+        with trace.stage("detect_format"):
+            source_format = self.__get_format(filename)
+        trace.source_format = source_format.value
+        self._check_theme(theme)
+        if isinstance(content, bytes):
+            try:
+                content = content.decode('utf-8')
+            except UnicodeDecodeError:
+                raise UnsupportedFormatError(f"File is not valid UTF-8 text: {filename}")
+        return ConversionRequest(
+            content=content,
+            source_format=source_format,
+            output_filename=f"{Path(filename).stem}.pdf",
+            created_at=datetime.now(),
+            theme=theme,
+            precomputed_hash=content_hash
+        )
+
+    def _prepare(
+        self,
+        input_path: str,
+        output_path: str,
+        theme: Optional[str] = None,
+        trace: Optional[ConversionTrace] = None,
+    ) -> tuple[ConversionRequest, str]:
+        """Reads the source and builds the request (steps 1-3)."""
+        trace = trace or ConversionTrace()
+        logger.info("Starting conversion job: %s -> %s", input_path, output_path)
+        self._check_theme(theme)
         
         # 1. Read Content
-        content = self.fs.read_file(input_path)
+        with trace.stage("read"):
+            content = self.fs.read_file(input_path)
         
         # 2. Determine Format
-        source_format = self.__get_format(input_path)
+        with trace.stage("detect_format"):
+            source_format = self.__get_format(input_path)
+        trace.source_format = source_format.value
         
         # 3. Create Request
         request = ConversionRequest(
             content=content,
             source_format=source_format,
             output_filename=os.path.basename(output_path),
-            created_at=datetime.now()
+            created_at=datetime.now(),
+            theme=theme
         )
         
-        # 4. Convert
         output_dir = os.path.dirname(output_path)
         if not output_dir:
             output_dir = "."
-            
-        result = self.converter.convert(request, output_dir)
-        
+        return request, output_dir
+
+    def render_options_key(self, theme: Optional[str] = None) -> str:
+        """Identifies the render options (theme and converter settings) that shape the output."""
+        key = f"{theme or ''}:{self.converter.options_key()}"
+        # Sectioned documents start each section on a new page
+        return f"{key}:sections={self.section_chars}" if self.section_chars else key
+
+    def _key(self, content_hash: str, source_format: SourceFormat, theme: Optional[str]) -> str:
+        """Content hash + source format + render options."""
+        if not self.converter.applies_themes(source_format):
+            # The theme is ignored (e.g. plain text): one key for all themes
+            theme = None
+        raw = f"{content_hash}:{source_format.value}:{self.render_options_key(theme)}"
+        return hashlib.sha256(raw.encode('utf-8')).hexdigest()
+
+    def _cache_key(self, request: ConversionRequest) -> str:
+        return self._key(request.content_hash, request.source_format, request.theme)
+
+    def render_key(self, content_hash: str, filename: str, theme: Optional[str] = None) -> str:
+        """
+        Identifies the PDF that content with this SHA-256 and file name
+        renders to, without reading or rendering it. Renders are
+        reproducible, so equal keys mean byte-identical PDFs (usable as a
+        strong ETag).
+        """
+        self._check_theme(theme)
+        return self._key(content_hash, self.__get_format(filename), theme)
+
+    def _from_cache(self, request: ConversionRequest, output_dir: str) -> Optional[ConversionResult]:
+        """Materialises a cached PDF at the output path, or returns None on a miss."""
+        if not self.cache:
+            return None
+        data = self.cache.get(self._cache_key(request))
+        if data is None:
+            return None
+        filename = request.output_filename
+        if not filename.endswith('.pdf'):
+            filename += ".pdf"
+        file_path = self.fs.save_file(os.path.join(output_dir, filename), data)
+        logger.info("Render cache hit for %s", request.output_filename)
+        return ConversionResult(file_path=file_path, size_bytes=len(data), success=True)
+
+    def _to_cache(self, request: ConversionRequest, result: ConversionResult) -> None:
+        if self.cache and result.success:
+            data = result.content if result.content is not None else self.fs.read_bytes(result.file_path)
+            self.cache.put(self._cache_key(request), data)
+
+    def _from_cache_in_memory(self, request: ConversionRequest) -> Optional[ConversionResult]:
+        if not self.cache:
+            return None
+        data = self.cache.get(self._cache_key(request))
+        if data is None:
+            return None
+        logger.info("Render cache hit for %s", request.output_filename)
+        return ConversionResult(file_path="", size_bytes=len(data), success=True, content=data)
+
+    def _finalize(
+        self, request: ConversionRequest, result: ConversionResult, trace: Optional[ConversionTrace] = None
+    ) -> str:
+        """Archives the run and maps failures to domain errors (step 5)."""
+        trace = trace or ConversionTrace()
+        # Render stages are timed by the converter (possibly in a worker process)
+        for stage, seconds in result.timings.items():
+            trace.stages[stage] = trace.stages.get(stage, 0.0) + seconds
         # 5. Archive (Project History)
         if self.archiver:
-            self.archiver.archive(request, result)
+            with trace.stage("archive"):
+                self.archiver.archive(request, result)
         
         if not result.success:
-            logger.error(f"Conversion failed: {result.error_message}")
+            logger.error("Conversion failed: %s", result.error_message)
             raise ConversionError(f"Conversion failed: {result.error_message}")
             
-        logger.info(f"Conversion successful. Size: {result.size_bytes} bytes")
+        logger.info("Conversion successful. Size: %s bytes", result.size_bytes)
         return result.file_path
+
+    def _sections(self, request: ConversionRequest) -> Optional[list[ConversionRequest]]:
+        """The request's sections when it is large enough to render in parallel."""
+        if not self.section_chars:
+            return None
+        sections = self.converter.split_sections(request, self.section_chars)
+        return sections if len(sections) > 1 else None
+
+    def _render_sections(
+        self,
+        request: ConversionRequest,
+        sections: list[ConversionRequest],
+        output_dir: Optional[str] = None,
+        spill_threshold: Optional[int] = None,
+        timeout: Optional[float] = None,
+    ) -> ConversionResult:
+        """
+        Renders sections side by side in the executor's workers, numbers
+        each section's pages from its first page once all page counts are
+        known, and merges them into the request's PDF (written to
+        output_dir, or in memory).
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+
+        def run_all(calls: list[tuple]) -> list:
+            futures = [self.executor.submit(*call) for call in calls]
+            try:
+                return [
+                    future.result(timeout=None if deadline is None else max(0.0, deadline - time.monotonic()))
+                    for future in futures
+                ]
+            finally:
+                for future in futures:
+                    future.cancel()
+
+        logger.info("Rendering %s in %s sections", request.output_filename, len(sections))
+        timings: dict[str, float] = {}
+        try:
+            rendered = run_all([(_render_section, self._job_converter, section) for section in sections])
+            for part in rendered:
+                if not part.success:
+                    return part
+                for stage, seconds in part.timings.items():
+                    timings[stage] = timings.get(stage, 0.0) + seconds
+
+            first_pages, pages = [], 0
+            for part in rendered:
+                first_pages.append(pages + 1)
+                pages += part.page_count
+            with timed(timings, "number_pages"):
+                numbered = run_all([
+                    (_number_section, self._job_converter, section, part.content, first_page)
+                    for section, part, first_page in zip(sections, rendered, first_pages)
+                ])
+            with timed(timings, "merge"):
+                [result] = run_all([
+                    (_merge_sections, self._job_converter, request, numbered, output_dir, spill_threshold)
+                ])
+        except FutureTimeoutError:
+            logger.error("Conversion timed out after %ss: %s", timeout, request.output_filename)
+            raise ConversionError(f"Conversion timed out after {timeout}s")
+        except ConversionError:
+            # A section broke a render limit
+            raise
+        except Exception as e:
+            return ConversionResult(
+                file_path="", size_bytes=0, success=False, error_message=str(e), created_at=request.created_at
+            )
+        result.timings = timings
+        result.page_count = pages
+        return result
+
+    def _render_file(self, request: ConversionRequest, output_dir: str, timeout: Optional[float]) -> ConversionResult:
+        sections = self._sections(request)
+        if sections:
+            return self._render_sections(request, sections, output_dir, timeout=timeout)
+        if not self.executor:
+            return self.converter.convert(request, output_dir)
+        future = self.executor.submit(_render, self._job_converter, request, output_dir)
+        try:
+            return future.result(timeout=timeout)
+        except FutureTimeoutError:
+            future.cancel()
+            logger.error("Conversion timed out after %ss: %s", timeout, request.output_filename)
+            raise ConversionError(f"Conversion timed out after {timeout}s")
+
+    def _render_in_memory(self, request: ConversionRequest, spill_threshold: Optional[int]) -> ConversionResult:
+        sections = self._sections(request)
+        if sections:
+            return self._render_sections(request, sections, spill_threshold=spill_threshold)
+        if self.executor:
+            return self.executor.submit(_render_in_memory, self._job_converter, request, spill_threshold).result()
+        return self.converter.render(request, spill_threshold)
+
+    async def _render_file_async(self, request: ConversionRequest, output_dir: str) -> ConversionResult:
+        sections = await asyncio.to_thread(self._sections, request)
+        if sections:
+            return await asyncio.to_thread(self._render_sections, request, sections, output_dir)
+        if self.executor:
+            return await self.executor.run(_render, self._job_converter, request, output_dir)
+        return await asyncio.to_thread(self.converter.convert, request, output_dir)
+
+    async def _render_in_memory_async(
+        self, request: ConversionRequest, spill_threshold: Optional[int]
+    ) -> ConversionResult:
+        sections = await asyncio.to_thread(self._sections, request)
+        if sections:
+            return await asyncio.to_thread(self._render_sections, request, sections, None, spill_threshold)
+        if self.executor:
+            return await self.executor.run(_render_in_memory, self._job_converter, request, spill_threshold)
+        return await asyncio.to_thread(self.converter.render, request, spill_threshold)
+
+    def _shareable(self, result: ConversionResult) -> ConversionResult:
+        """A copy of result other callers can use: the PDF in memory, no render timings."""
+        if not result.success:
+            return ConversionResult(
+                file_path="", size_bytes=0, success=False, error_message=result.error_message
+            )
+        data = result.content if result.content is not None else self.fs.read_bytes(result.file_path)
+        return ConversionResult(
+            file_path="", size_bytes=len(data), success=True, content=data, page_count=result.page_count
+        )
+
+    def _save_shared(self, request: ConversionRequest, shared: ConversionResult, output_dir: str) -> ConversionResult:
+        """Writes a shared PDF to this caller's output path."""
+        if not shared.success:
+            return shared
+        filename = request.output_filename
+        if not filename.endswith('.pdf'):
+            filename += ".pdf"
+        file_path = self.fs.save_file(os.path.join(output_dir, filename), shared.content)
+        return ConversionResult(
+            file_path=file_path, size_bytes=shared.size_bytes, success=True, page_count=shared.page_count
+        )
+
+    def _render_once(
+        self,
+        request: ConversionRequest,
+        render: Callable[[], ConversionResult],
+        trace: ConversionTrace,
+        timeout: Optional[float] = None,
+    ) -> ConversionResult:
+        """
+        Runs render() unless an identical render is already in flight, in
+        which case that render's outcome is shared (in memory) and
+        trace.coalesced is set.
+        """
+        key = self._cache_key(request)
+        future, leader = self.flights.join(key)
+        if not leader:
+            trace.coalesced = True
+            logger.info("Joining in-flight render of identical content: %s", request.output_filename)
+            try:
+                return future.result(timeout=timeout)
+            except FutureTimeoutError:
+                raise ConversionError(f"Conversion timed out after {timeout}s")
+        try:
+            result = render()
+        except BaseException as e:
+            self.flights.fail(key, e)
+            raise
+        self.flights.complete(key, lambda: self._shareable(result))
+        return result
+
+    async def _render_once_async(
+        self,
+        request: ConversionRequest,
+        render: Callable[[], Awaitable[ConversionResult]],
+        trace: ConversionTrace,
+    ) -> ConversionResult:
+        """Async variant of _render_once."""
+        key = self._cache_key(request)
+        future, leader = self.flights.join(key)
+        if not leader:
+            trace.coalesced = True
+            logger.info("Joining in-flight render of identical content: %s", request.output_filename)
+            # Shielded: a cancelled follower must not cancel the shared render
+            return await asyncio.shield(asyncio.wrap_future(future))
+        try:
+            result = await render()
+        except BaseException as e:
+            self.flights.fail(key, e)
+            raise
+        await asyncio.to_thread(self.flights.complete, key, lambda: self._shareable(result))
+        return result
+
+    def convert_file(
+        self, input_path: str, output_path: str, timeout: Optional[float] = None, theme: Optional[str] = None
+    ) -> str:
+        """
+        Orchestrates the conversion of a file to PDF.
+
+        timeout bounds the wait for a pooled render in seconds; it has no
+        effect when no executor is configured.
+        """
+        with trace_conversion() as trace:
+            request, output_dir = self._prepare(input_path, output_path, theme, trace)
+            
+            # 4. Convert (skipped on a render cache hit)
+            with trace.stage("cache"):
+                result = self._from_cache(request, output_dir)
+            trace.cache_hit = result is not None
+            if result is None:
+                with trace.stage("render"):
+                    result = self._render_once(
+                        request, lambda: self._render_file(request, output_dir, timeout), trace, timeout
+                    )
+                if trace.coalesced:
+                    result = self._save_shared(request, result, output_dir)
+                else:
+                    self._to_cache(request, result)
+            
+            return self._finalize(request, result, trace)
+
+    def convert_content(
+        self,
+        content: str | bytes,
+        filename: str,
+        spill_threshold: Optional[int] = None,
+        theme: Optional[str] = None,
+        content_hash: Optional[str] = None,
+    ) -> ConversionResult:
+        """
+        Converts content held in memory without touching the file system.
+
+        theme selects a document theme (see PDFConverterPort.themes_available).
+        The PDF is returned in result.content, unless it exceeds
+        spill_threshold bytes, in which case it is spilled to a temp file
+        referenced by result.file_path (the caller owns that file).
+        content_hash is the SHA-256 of the UTF-8 content, when the caller
+        already computed it (saves hashing the content again).
+        """
+        with trace_conversion() as trace:
+            request = self._build_request(content, filename, theme, content_hash, trace)
+            logger.info("Starting in-memory conversion job: %s", filename)
+            
+            with trace.stage("cache"):
+                result = self._from_cache_in_memory(request)
+            trace.cache_hit = result is not None
+            if result is None:
+                with trace.stage("render"):
+                    result = self._render_once(
+                        request, lambda: self._render_in_memory(request, spill_threshold), trace
+                    )
+                if not trace.coalesced:
+                    self._to_cache(request, result)
+            
+            self._finalize(request, result, trace)
+            return result
+
+    async def convert_content_async(
+        self,
+        content: str | bytes,
+        filename: str,
+        spill_threshold: Optional[int] = None,
+        theme: Optional[str] = None,
+        content_hash: Optional[str] = None,
+    ) -> ConversionResult:
+        """Async variant of convert_content for event-loop callers."""
+        with trace_conversion() as trace:
+            request = self._build_request(content, filename, theme, content_hash, trace)
+            logger.info("Starting in-memory conversion job: %s", filename)
+            
+            with trace.stage("cache"):
+                result = await asyncio.to_thread(self._from_cache_in_memory, request)
+            trace.cache_hit = result is not None
+            if result is None:
+                with trace.stage("render"):
+                    result = await self._render_once_async(
+                        request, lambda: self._render_in_memory_async(request, spill_threshold), trace
+                    )
+                if not trace.coalesced:
+                    await asyncio.to_thread(self._to_cache, request, result)
+            
+            await asyncio.to_thread(self._finalize, request, result, trace)
+            return result
+
+    async def convert_file_async(self, input_path: str, output_path: str, theme: Optional[str] = None) -> str:
+        """
+        Async variant of convert_file for event-loop callers.
+
+        File I/O runs in a thread and the render runs in the executor's
+        process pool (or a thread when no executor is configured), so the
+        event loop is never blocked by a conversion.
+        """
+        with trace_conversion() as trace:
+            request, output_dir = await asyncio.to_thread(
+                self._prepare, input_path, output_path, theme, trace
+            )
+            
+            # 4. Convert (skipped on a render cache hit)
+            with trace.stage("cache"):
+                result = await asyncio.to_thread(self._from_cache, request, output_dir)
+            trace.cache_hit = result is not None
+            if result is None:
+                with trace.stage("render"):
+                    result = await self._render_once_async(
+                        request, lambda: self._render_file_async(request, output_dir), trace
+                    )
+                if trace.coalesced:
+                    result = await asyncio.to_thread(self._save_shared, request, result, output_dir)
+                else:
+                    await asyncio.to_thread(self._to_cache, request, result)
+            
+            return await asyncio.to_thread(self._finalize, request, result, trace)
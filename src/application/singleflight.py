@@ -0,0 +1,68 @@
+"""
+Single-flight coalescing of identical concurrent work.
+
+The first caller for a key runs the work; callers arriving with the same
+key while it runs wait for it and share its outcome instead of repeating
+it. Once the work finishes the key is released, so later callers start
+afresh (by then the render cache normally answers them).
+"""
+import threading
+from concurrent.futures import Future
+from typing import Any, Callable
+
+from src.domain.exceptions import ConversionError
+
+
+class _Flight:
+    def __init__(self):
+        self.future: Future = Future()
+        self.followers = 0
+
+
+class SingleFlight:
+    """Tracks in-flight work by key; thread-safe and usable from event loops."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._flights: dict[str, _Flight] = {}
+
+    def join(self, key: str) -> tuple[Future, bool]:
+        """
+        Returns the future of the work in flight for key and whether the
+        caller leads it. The leader must call complete() or fail() exactly
+        once; followers wait on the future (and must not cancel it).
+        """
+        with self._lock:
+            flight = self._flights.get(key)
+            if flight is None:
+                flight = self._flights[key] = _Flight()
+                return flight.future, True
+            flight.followers += 1
+            return flight.future, False
+
+    def _release(self, key: str) -> _Flight:
+        with self._lock:
+            return self._flights.pop(key)
+
+    def complete(self, key: str, share: Callable[[], Any]) -> int:
+        """
+        Releases key and hands share() to its followers; share is only
+        called when someone is waiting. Returns the number of followers.
+        """
+        flight = self._release(key)
+        if not flight.followers:
+            flight.future.set_result(None)
+            return 0
+        try:
+            flight.future.set_result(share())
+        except Exception as e:
+            flight.future.set_exception(e)
+        return flight.followers
+
+    def fail(self, key: str, error: BaseException) -> None:
+        """Releases key, raising error in its followers."""
+        flight = self._release(key)
+        if not isinstance(error, Exception):
+            # The leader was cancelled or interrupted; that is not the followers' fault
+            error = ConversionError("Identical in-flight conversion was abandoned")
+        flight.future.set_exception(error)
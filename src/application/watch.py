@@ -0,0 +1,145 @@
+"""
+Watch mode: keeps an output directory in step with an input directory.
+
+A DirectoryWatcherPort reports changed paths; each path waits until it has
+been quiet for the debounce period (editors and copies write in bursts),
+then goes to a pool of conversion workers. Conversions go through the
+same BatchConverter and build manifest as incremental bulk runs, so a
+touched-but-unchanged file is not re-rendered and a restart only catches
+up on what changed while the watcher was down. Like bulk runs, the whole
+tree is watched, outputs mirror the input paths below input_root, and
+only the files a scan selects (include/exclude globs, shard) are
+converted.
+"""
+import os
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Callable, Iterable, Optional
+from src.application.batch import BatchConverter, BatchItemResult
+from src.application.manifest import MANIFEST_NAME, BuildManifest
+from src.domain.ports import DirectoryWatcherPort
+from src.infrastructure.logger import logger
+
+
+class WatchConverter:
+    """
+    Converts new and changed files of a watched directory continuously.
+
+    Args:
+        batch: Converter used for every file (its workers size the pool)
+        watcher: Change notifications for input_dir
+        input_dir / output_dir: Source and destination directories
+        list_files: Lists the selected files of input_dir (initial catch-up),
+            e.g. a FileScan scanner
+        debounce: Seconds a file must stay unchanged before it is converted
+        prune: Delete the outputs of deleted inputs
+        on_result: Called with each conversion result (e.g. for reporting)
+        input_root: Mirror input paths below this root in output_dir
+        manifest_name: Build manifest file name (one per shard)
+        selects: Whether a reported path belongs to the selection of
+            list_files; other changes are ignored
+    """
+
+    def __init__(
+        self,
+        batch: BatchConverter,
+        watcher: DirectoryWatcherPort,
+        input_dir: str,
+        output_dir: str,
+        list_files: Callable[[], Iterable[str]],
+        debounce: float = 0.5,
+        prune: bool = False,
+        on_result: Optional[Callable[[BatchItemResult], None]] = None,
+        input_root: Optional[str] = None,
+        manifest_name: str = MANIFEST_NAME,
+        selects: Optional[Callable[[str], bool]] = None,
+    ):
+        self.batch = batch
+        self.watcher = watcher
+        self.input_dir = input_dir
+        self.output_dir = output_dir
+        self.list_files = list_files
+        self.debounce = debounce
+        self.prune = prune
+        self.on_result = on_result
+        self.input_root = input_root
+        self.manifest_name = manifest_name
+        self.selects = selects
+        # path -> monotonic time at which it has been quiet long enough
+        self._due: dict[str, float] = {}
+        self._running: dict[str, Future] = {}
+
+    def run(self, stop: threading.Event) -> None:
+        """Catches up on existing files, then converts changes until stop is set."""
+        os.makedirs(self.output_dir, exist_ok=True)
+        summary = self.batch.run(
+            self.list_files(), self.output_dir, incremental=True, prune=self.prune,
+            input_root=self.input_root, manifest_name=self.manifest_name,
+        )
+        logger.info(
+            "Watch catch-up: %s converted, %s unchanged, %s failed",
+            summary.successful, summary.unchanged, summary.failed
+        )
+        manifest = BuildManifest.load(self.output_dir, self.manifest_name)
+        options = self.batch.service.render_options_key()
+        dirty = False
+        try:
+            with ThreadPoolExecutor(max_workers=self.batch.workers, thread_name_prefix="watch") as pool:
+                try:
+                    while not stop.is_set():
+                        dirty |= self._step(pool, manifest, options)
+                        # Persist progress whenever the watcher goes idle
+                        if dirty and not self._running and not self._due:
+                            manifest.save()
+                            dirty = False
+                finally:
+                    # Conversions already running finish; queued ones are dropped
+                    for future in self._running.values():
+                        future.cancel()
+        finally:
+            self._collect_finished()
+            manifest.save()
+            self.watcher.close()
+
+    def _step(self, pool: ThreadPoolExecutor, manifest: BuildManifest, options: str) -> bool:
+        """Takes in changes and starts due conversions; True when the manifest changed."""
+        now = time.monotonic()
+        # Paths waiting on a running conversion are rechecked at the 0.5s tick
+        waiting = [due - now for path, due in self._due.items() if path not in self._running]
+        timeout = min([0.5, *waiting])
+        for path in self.watcher.wait_for_changes(max(0.0, timeout)):
+            # Deleted paths always count: pruning checks what is really gone
+            if self.selects is not None and os.path.exists(path) and not self.selects(path):
+                continue
+            # Every event restarts the file's quiet period
+            self._due[path] = time.monotonic() + self.debounce
+
+        changed = self._collect_finished()
+        now = time.monotonic()
+        for path, due in list(self._due.items()):
+            # A file still converting is picked up again once it finishes
+            if due > now or path in self._running:
+                continue
+            del self._due[path]
+            if os.path.isfile(path):
+                self._running[path] = pool.submit(
+                    self.batch.convert_one, path, self.output_dir, manifest, options, self.input_root
+                )
+            elif self.prune:
+                for name in manifest.prune(set()):
+                    logger.info("Pruned %s (input deleted)", name)
+                changed = True
+        return changed
+
+    def _collect_finished(self) -> bool:
+        finished = [path for path, future in self._running.items() if future.done()]
+        for path in finished:
+            future = self._running.pop(path)
+            if future.cancelled():
+                continue
+            result = future.result()
+            logger.info("Watch: %s -> %s", result.file, result.status)
+            if self.on_result:
+                self.on_result(result)
+        return bool(finished)
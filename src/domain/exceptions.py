@@ -13,3 +13,19 @@ class ConversionError(DomainError):
 class FileAccessError(DomainError):
     """Raised when the file system cannot be accessed."""
     pass
+
+class JobQueueFullError(DomainError):
+    """Raised when the conversion job queue cannot accept more work."""
+    pass
+
+class ThemeNotFoundError(DomainError):
+    """Raised when a requested document theme does not exist."""
+    pass
+
+class RenderLimitError(ConversionError):
+    """Raised when a render is stopped by a resource limit or its worker dies."""
+
+    def __init__(self, message: str, limit: str):
+        super().__init__(message)
+        # wall_time, cpu_time, memory or worker_crash
+        self.limit = limit
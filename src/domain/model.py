@@ -1,3 +1,4 @@
+import hashlib
 from dataclasses import dataclass, field
 from enum import Enum
 from datetime import datetime
@@ -7,12 +8,26 @@ class SourceFormat(str, Enum):
     MARKDOWN = "md"
     TEXT = "txt"
 
+# Input file suffixes the service can convert
+SOURCE_EXTENSIONS = ('.md', '.markdown', '.txt')
+
 @dataclass
 class ConversionRequest:
     content: str
     source_format: SourceFormat
     output_filename: str
     created_at: datetime = field(default_factory=datetime.now)
+    # Document theme (None = converter default)
+    theme: Optional[str] = None
+    # SHA-256 of the UTF-8 content when already known (e.g. hashed during upload)
+    precomputed_hash: Optional[str] = field(default=None, repr=False)
+
+    @property
+    def content_hash(self) -> str:
+        """SHA-256 of the source content, used for caching and history."""
+        if self.precomputed_hash is None:
+            self.precomputed_hash = hashlib.sha256(self.content.encode('utf-8')).hexdigest()
+        return self.precomputed_hash
 
 @dataclass
 class ConversionResult:
@@ -21,3 +36,62 @@ class ConversionResult:
     success: bool
     created_at: datetime = field(default_factory=datetime.now)
     error_message: Optional[str] = None
+    # In-memory PDF bytes (set when rendered without a file_path)
+    content: Optional[bytes] = None
+    # Seconds spent per render stage (e.g. preprocess, html, pdf_render)
+    timings: dict[str, float] = field(default_factory=dict)
+    # Pages of the PDF, when the converter counted them (sectioned renders)
+    page_count: Optional[int] = None
+
+@dataclass
+class HistoryQuery:
+    """Filters for conversion history, newest first, paginated by cursor."""
+    content_hash: Optional[str] = None
+    success: Optional[bool] = None
+    # Inclusive ISO dates (YYYY-MM-DD)
+    date_from: Optional[str] = None
+    date_to: Optional[str] = None
+    limit: int = 50
+    # Opaque position returned as HistoryPage.next_cursor
+    cursor: Optional[int] = None
+
+@dataclass
+class HistoryPage:
+    records: list[dict]
+    # None when there are no more records
+    next_cursor: Optional[int] = None
+
+def shard_of(relative_path: str, shard_count: int) -> int:
+    """
+    Stable shard number of a path relative to the scanned root. Uses a
+    content hash (not hash(), which is salted per process) so every node
+    assigns every file to the same shard.
+    """
+    digest = hashlib.blake2b(relative_path.encode('utf-8'), digest_size=8).digest()
+    return int.from_bytes(digest, 'big') % shard_count
+
+@dataclass(frozen=True)
+class FileScan:
+    """
+    Selects the files of an input tree. Patterns are fnmatch globs matched
+    against the path relative to the root with '/' separators ('*' also
+    matches '/'); a directory matching an exclude pattern is not entered.
+    """
+    extensions: tuple[str, ...] = SOURCE_EXTENSIONS
+    # Empty = every file with a matching extension
+    include: tuple[str, ...] = ()
+    exclude: tuple[str, ...] = ()
+    # This node processes the files with shard_of(path, shard_count) == shard_index
+    shard_index: int = 0
+    shard_count: int = 1
+
+    def __post_init__(self):
+        if self.shard_count < 1 or not 0 <= self.shard_index < self.shard_count:
+            raise ValueError(f"Invalid shard {self.shard_index}/{self.shard_count}")
+
+    @property
+    def sharded(self) -> bool:
+        return self.shard_count > 1
+
+    def in_shard(self, relative_path: str) -> bool:
+        return not self.sharded or shard_of(relative_path, self.shard_count) == self.shard_index
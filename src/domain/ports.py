@@ -1,5 +1,8 @@
 from abc import ABC, abstractmethod
-from src.domain.model import ConversionRequest, ConversionResult
+from typing import Iterator, Optional
+from src.domain.model import (
+    ConversionRequest, ConversionResult, FileScan, HistoryPage, HistoryQuery, SourceFormat
+)
 
 class PDFConverterPort(ABC):
     """
@@ -9,6 +12,65 @@ class PDFConverterPort(ABC):
     def convert(self, request: ConversionRequest, output_dir: str) -> ConversionResult:
         pass
 
+    @abstractmethod
+    def render(self, request: ConversionRequest, spill_threshold: Optional[int] = None) -> ConversionResult:
+        """
+        Renders the request in memory and returns the PDF bytes in result.content.
+        Outputs larger than spill_threshold bytes are spilled to a temp file
+        and returned via result.file_path instead.
+        """
+        pass
+
+    def options_key(self) -> str:
+        """Identifies the render options that affect output (used in cache keys)."""
+        return type(self).__name__
+
+    def themes_available(self) -> list[str]:
+        """Names of the document themes a request may select."""
+        return []
+
+    def applies_themes(self, source_format: SourceFormat) -> bool:
+        """Whether a theme changes the output for this source format."""
+        return bool(self.themes_available())
+
+class SectionRendererPort(ABC):
+    """
+    Driven Port: Implemented by converters that can render a large request
+    as independent sections and stitch them back together.
+    """
+    @abstractmethod
+    def split_sections(self, request: ConversionRequest, min_chars: int) -> list[ConversionRequest]:
+        """
+        Splits a large request into sections of at least min_chars that
+        render independently, each starting on a new page. Requests that
+        cannot be split come back as [request].
+        """
+        pass
+
+    @abstractmethod
+    def render_section(self, request: ConversionRequest) -> ConversionResult:
+        """Renders one section without page numbers (PDF in result.content, pages in result.page_count)."""
+        pass
+
+    @abstractmethod
+    def number_section(self, request: ConversionRequest, pdf: bytes, first_page: int) -> bytes:
+        """Adds the page footers to a rendered section, numbered from first_page."""
+        pass
+
+    @abstractmethod
+    def merge_sections(
+        self,
+        request: ConversionRequest,
+        sections: list[bytes],
+        output_dir: Optional[str] = None,
+        spill_threshold: Optional[int] = None,
+    ) -> ConversionResult:
+        """
+        Concatenates numbered sections into the request's PDF: written to
+        output_dir like convert(), or returned like render() when None.
+        """
+        pass
+
 class FileSystemPort(ABC):
     """
     Driven Port: Interface for file system operations (reading source).
@@ -18,6 +80,11 @@ class FileSystemPort(ABC):
         """Reads the content of a file."""
         pass
     
+    @abstractmethod
+    def read_bytes(self, path: str) -> bytes:
+        """Reads the raw bytes of a file."""
+        pass
+
     @abstractmethod
     def save_file(self, path: str, content: bytes) -> str:
         """Saves bytes to a file path."""
@@ -28,6 +95,14 @@ class FileSystemPort(ABC):
         """Lists files in a directory matching extensions."""
         pass
 
+    @abstractmethod
+    def scan_files(self, directory: str, scan: FileScan) -> Iterator[str]:
+        """
+        Yields the files below directory (recursively) selected by scan,
+        lazily and in a stable order.
+        """
+        pass
+
 class ArchiverPort(ABC):
     """
     Driven Port: Interface for archiving processing history.
@@ -36,3 +111,42 @@ class ArchiverPort(ABC):
     def archive(self, request: ConversionRequest, result: ConversionResult) -> None:
         """Archives the input and output for project history."""
         pass
+
+class HistoryQueryPort(ABC):
+    """
+    Driven Port: Interface for querying archived conversion history.
+    """
+    @abstractmethod
+    def query(self, query: HistoryQuery) -> HistoryPage:
+        """Returns one page of history records matching the query, newest first."""
+        pass
+
+class DirectoryWatcherPort(ABC):
+    """
+    Driven Port: Interface for change notifications on an input directory.
+    """
+    @abstractmethod
+    def wait_for_changes(self, timeout: float) -> set[str]:
+        """
+        Blocks up to timeout seconds and returns the paths created, modified
+        or deleted since the last call (empty on timeout).
+        """
+        pass
+
+    def close(self) -> None:
+        """Releases watch resources."""
+        pass
+
+class RenderCachePort(ABC):
+    """
+    Driven Port: Interface for caching rendered PDFs by content key.
+    """
+    @abstractmethod
+    def get(self, key: str) -> Optional[bytes]:
+        """Returns the cached PDF bytes for key, or None on a miss."""
+        pass
+
+    @abstractmethod
+    def put(self, key: str, data: bytes) -> None:
+        """Stores PDF bytes under key, evicting older entries if needed."""
+        pass
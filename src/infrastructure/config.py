@@ -0,0 +1,118 @@
+"""
+Runtime configuration for Text-to-PDF Service.
+
+All tunables are read from environment variables so the same image can be
+sized differently per deployment (Docker, local, CI).
+"""
+import os
+from dataclasses import dataclass
+from typing import Optional
+
+
+def _env_int(name: str, default: Optional[int]) -> Optional[int]:
+    """Read an integer environment variable, falling back to default."""
+    value = os.getenv(name)
+    if value is None or value.strip() == "":
+        return default
+    return int(value)
+
+
+@dataclass(frozen=True)
+class Settings:
+    # Render worker processes (None = one per CPU core)
+    render_workers: Optional[int] = None
+    # Renders allowed to wait for a worker before callers are held back
+    render_queue_size: Optional[int] = None
+    # Parallel batch conversion (None = match render workers)
+    batch_workers: Optional[int] = None
+    batch_file_timeout_s: Optional[int] = 300
+    # Per-render limits enforced in the worker (0 disables each): wall time,
+    # CPU seconds and resident memory; a render over a limit fails and its
+    # worker is replaced. Workers are also recycled after max_jobs renders or
+    # once their memory grew by recycle_mb since start-up.
+    render_timeout_s: int = 120
+    render_cpu_s: int = 60
+    render_memory_mb: int = 1024
+    render_max_jobs: int = 200
+    render_recycle_mb: int = 256
+    # Markdown documents of at least twice this many characters are split at
+    # top-level headings and rendered as parallel sections (0 disables)
+    section_chars: int = 50_000
+    # This node's slice of the bulk input tree when several nodes share it
+    shard_index: int = 0
+    shard_count: int = 1
+    # Asynchronous job API
+    job_workers: Optional[int] = None
+    job_queue_size: int = 100
+    job_result_ttl_s: int = 600
+    job_retry_after_s: int = 5
+    # Rendered-PDF cache budgets (0 disables a tier)
+    cache_memory_mb: int = 64
+    cache_disk_mb: int = 512
+    cache_dir: str = "data/cache"
+    # In-memory PDFs larger than this spill to a temp file (None = never)
+    spill_threshold_mb: Optional[int] = None
+    # Conversion history: records (and MB of their source text) waiting for
+    # the background writer, and how long one may wait before it is written
+    archive_queue_size: int = 10000
+    archive_queue_mb: int = 64
+    archive_flush_ms: int = 1000
+    # History store: "sqlite" (indexed, queryable via /history) or "jsonl"
+    archive_backend: str = "sqlite"
+    archive_db: str = "data/archive/history.db"
+    # Watch mode: quiet period before a changed file is converted, and the
+    # scan interval when inotify is unavailable
+    watch_debounce_ms: int = 500
+    watch_poll_ms: int = 1000
+    # Logging: "text" or "json" (one JSON object per line), records waiting
+    # for the log writer thread, access-log sampling such as "INFO=0.1", and
+    # the directory of service.log
+    log_format: str = "text"
+    log_queue_size: int = 10000
+    log_sample: str = ""
+    log_dir: str = "logs"
+
+    @property
+    def spill_threshold_bytes(self) -> Optional[int]:
+        if self.spill_threshold_mb is None:
+            return None
+        return self.spill_threshold_mb * 1024 * 1024
+
+    @classmethod
+    def from_env(cls) -> "Settings":
+        return cls(
+            render_workers=_env_int("PDF_RENDER_WORKERS", None),
+            render_queue_size=_env_int("PDF_RENDER_QUEUE_SIZE", None),
+            batch_workers=_env_int("PDF_BATCH_WORKERS", None),
+            batch_file_timeout_s=_env_int("PDF_BATCH_FILE_TIMEOUT", 300),
+            render_timeout_s=_env_int("PDF_RENDER_TIMEOUT", 120),
+            render_cpu_s=_env_int("PDF_RENDER_CPU_S", 60),
+            render_memory_mb=_env_int("PDF_RENDER_MEMORY_MB", 1024),
+            render_max_jobs=_env_int("PDF_RENDER_MAX_JOBS", 200),
+            render_recycle_mb=_env_int("PDF_RENDER_RECYCLE_MB", 256),
+            section_chars=_env_int("PDF_SECTION_CHARS", 50_000),
+            shard_index=_env_int("PDF_SHARD_INDEX", 0),
+            shard_count=_env_int("PDF_SHARD_COUNT", 1),
+            job_workers=_env_int("PDF_JOB_WORKERS", None),
+            job_queue_size=_env_int("PDF_JOB_QUEUE_SIZE", 100),
+            job_result_ttl_s=_env_int("PDF_JOB_RESULT_TTL", 600),
+            job_retry_after_s=_env_int("PDF_JOB_RETRY_AFTER", 5),
+            cache_memory_mb=_env_int("PDF_CACHE_MEMORY_MB", 64),
+            cache_disk_mb=_env_int("PDF_CACHE_DISK_MB", 512),
+            cache_dir=os.getenv("PDF_CACHE_DIR", "data/cache"),
+            spill_threshold_mb=_env_int("PDF_SPILL_THRESHOLD_MB", None),
+            archive_queue_size=_env_int("PDF_ARCHIVE_QUEUE_SIZE", 10000),
+            archive_queue_mb=_env_int("PDF_ARCHIVE_QUEUE_MB", 64),
+            archive_flush_ms=_env_int("PDF_ARCHIVE_FLUSH_MS", 1000),
+            archive_backend=os.getenv("PDF_ARCHIVE_BACKEND", "sqlite"),
+            archive_db=os.getenv("PDF_ARCHIVE_DB", "data/archive/history.db"),
+            watch_debounce_ms=_env_int("PDF_WATCH_DEBOUNCE_MS", 500),
+            watch_poll_ms=_env_int("PDF_WATCH_POLL_MS", 1000),
+            log_format=os.getenv("PDF_LOG_FORMAT", "text"),
+            log_queue_size=_env_int("PDF_LOG_QUEUE_SIZE", 10000),
+            log_sample=os.getenv("PDF_LOG_SAMPLE", ""),
+            log_dir=os.getenv("PDF_LOG_DIR", "logs"),
+        )
+
+
+settings = Settings.from_env()
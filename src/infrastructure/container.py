@@ -0,0 +1,136 @@
+"""
+Application Container - Composition root for long-lived components.
+
+Adapters, the render cache, the render pool and the ConversionService are
+built once per process and shared by every request, instead of being
+rebuilt (and re-running their setup) on each call. All shared components
+are safe to use from concurrent threads.
+"""
+import threading
+from typing import Optional
+from src.adapters.driven.archive_writer import BufferedArchiver
+from src.adapters.driven.fs_adapter import LocalFileSystemAdapter
+from src.adapters.driven.format_router import FormatRouter
+from src.adapters.driven.fs_archiver import FileSystemArchiver
+from src.adapters.driven.pdf_adapter import Xhtml2PdfAdapter
+from src.adapters.driven.render_cache import TieredRenderCache
+from src.adapters.driven.sqlite_archiver import SQLiteArchiver
+from src.adapters.driven.text_pdf_adapter import StreamingTextAdapter
+from src.application.service import ConversionService, install_worker_converter, warm_up_converter
+from src.domain.model import SourceFormat
+from src.domain.ports import HistoryQueryPort
+from src.infrastructure.config import Settings, settings as default_settings
+from src.infrastructure.executor import RenderExecutor
+from src.infrastructure.worker_pool import WorkerLimits
+from src.infrastructure.logger import logger
+
+
+def build_archiver(settings: Settings) -> BufferedArchiver:
+    """History store selected by PDF_ARCHIVE_BACKEND."""
+    writer = {
+        "queue_size": settings.archive_queue_size,
+        "queue_chars": settings.archive_queue_mb * 1024 * 1024,
+        "flush_interval": settings.archive_flush_ms / 1000,
+    }
+    if settings.archive_backend == "jsonl":
+        return FileSystemArchiver(**writer)
+    if settings.archive_backend == "sqlite":
+        return SQLiteArchiver(settings.archive_db, **writer)
+    raise ValueError(f"Unknown archive backend '{settings.archive_backend}'")
+
+
+class Container:
+    """
+    Holds the process-wide service graph.
+
+    Args:
+        settings: Runtime configuration
+        with_executor: Render in a process pool (API, batch) or in-process (CLI)
+        with_archiver: Record conversion history
+        with_cache: Reuse previously rendered PDFs
+    """
+
+    def __init__(
+        self,
+        settings: Settings = default_settings,
+        with_executor: bool = True,
+        with_archiver: bool = True,
+        with_cache: bool = True,
+    ):
+        self.settings = settings
+        self.fs = LocalFileSystemAdapter()
+        # Plain text skips HTML layout and streams straight to PDF
+        self.converter = FormatRouter(
+            Xhtml2PdfAdapter(), {SourceFormat.TEXT: StreamingTextAdapter()}
+        )
+        self.archiver: Optional[BufferedArchiver] = build_archiver(settings) if with_archiver else None
+        self.cache: Optional[TieredRenderCache] = None
+        if with_cache:
+            self.cache = TieredRenderCache(
+                memory_budget_bytes=settings.cache_memory_mb * 1024 * 1024,
+                disk_dir=settings.cache_dir,
+                disk_budget_bytes=settings.cache_disk_mb * 1024 * 1024,
+            )
+        self.executor: Optional[RenderExecutor] = None
+        if with_executor:
+            self.executor = RenderExecutor(
+                settings.render_workers,
+                settings.render_queue_size,
+                initializer=install_worker_converter,
+                initargs=(self.converter,),
+                limits=WorkerLimits(
+                    timeout_s=settings.render_timeout_s,
+                    cpu_s=settings.render_cpu_s,
+                    memory_mb=settings.render_memory_mb,
+                    max_jobs=settings.render_max_jobs,
+                    recycle_growth_mb=settings.render_recycle_mb,
+                ),
+            )
+        self.service = ConversionService(
+            self.converter, self.fs, self.archiver, self.executor, self.cache, settings.section_chars
+        )
+
+    @property
+    def render_workers(self) -> int:
+        return self.executor.max_workers if self.executor else 1
+
+    @property
+    def history(self) -> Optional[HistoryQueryPort]:
+        """The archiver, when its store can be queried."""
+        return self.archiver if isinstance(self.archiver, HistoryQueryPort) else None
+
+    def warm_up(self) -> None:
+        """Starts render workers and primes the in-process renderer."""
+        if self.executor:
+            self.executor.start()
+        else:
+            warm_up_converter(self.converter)
+        logger.info("Application container warmed up")
+
+    def shutdown(self) -> None:
+        if self.executor:
+            self.executor.shutdown()
+        if self.archiver:
+            # Writes history records still queued
+            self.archiver.close()
+
+
+_container: Optional[Container] = None
+_container_lock = threading.Lock()
+
+
+def get_container() -> Container:
+    """Returns the process-wide container, building it on first use."""
+    global _container
+    with _container_lock:
+        if _container is None:
+            _container = Container()
+        return _container
+
+
+def shutdown_container() -> None:
+    global _container
+    with _container_lock:
+        if _container is not None:
+            _container.shutdown()
+            _container = None
@@ -0,0 +1,181 @@
+"""
+Render Executor - Process pool for CPU-bound PDF rendering.
+
+xhtml2pdf renders hold the GIL for their whole duration, so running them
+inside an ``async def`` handler stalls the event loop. The executor moves
+renders into worker processes and bounds how many may be queued at once,
+so bursts wait for a free slot instead of piling up unbounded work.
+"""
+import asyncio
+import os
+import threading
+from collections import deque
+from concurrent.futures import Future
+from typing import Any, Callable, Optional
+
+from src.infrastructure.logger import logger
+from src.infrastructure.worker_pool import SupervisedProcessPool, WorkerLimits
+
+
+class RenderExecutor:
+    """
+    Bounded process pool for render jobs.
+
+    At most ``max_workers`` jobs run concurrently and at most ``max_pending``
+    additional jobs wait in the pool queue. Callers beyond that block (sync)
+    or await (async) until a slot is released. Each job runs under
+    ``limits``; a job that breaks one fails with RenderLimitError and its
+    worker is replaced.
+    """
+
+    def __init__(
+        self,
+        max_workers: Optional[int] = None,
+        max_pending: Optional[int] = None,
+        initializer: Optional[Callable[..., None]] = None,
+        initargs: tuple = (),
+        limits: WorkerLimits = WorkerLimits(),
+    ):
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self.max_pending = max_pending if max_pending is not None else self.max_workers * 2
+        # Runs once in every worker process (e.g. to warm up the renderer)
+        self.initializer = initializer
+        self.initargs = initargs
+        self.limits = limits
+        self._slots = threading.BoundedSemaphore(self.max_workers + self.max_pending)
+        self._pool: Optional[SupervisedProcessPool] = None
+        self._lock = threading.Lock()
+        # Jobs submitted and not finished, and callers waiting for a slot
+        self._outstanding = 0
+        self._waiting = 0
+        self._count_lock = threading.Lock()
+        # Async callers waiting for a slot, woken one per released slot
+        self._waiters: deque[tuple[asyncio.AbstractEventLoop, asyncio.Future]] = deque()
+        self._waiters_lock = threading.Lock()
+
+    def _get_pool(self) -> SupervisedProcessPool:
+        # Workers are spawned lazily so importing the API stays cheap
+        with self._lock:
+            if self._pool is None:
+                self._pool = SupervisedProcessPool(
+                    self.max_workers,
+                    self.limits,
+                    initializer=self.initializer,
+                    initargs=self.initargs,
+                )
+                logger.info("Render pool started with %s worker(s)", self.max_workers)
+            return self._pool
+
+    def start(self) -> None:
+        """
+        Starts the workers now instead of on first use. Returns at once:
+        each worker is spawned and initialized by its supervisor thread, and
+        jobs submitted meanwhile wait until a worker is ready.
+        """
+        self._get_pool()
+
+    def _count(self, outstanding: int = 0, waiting: int = 0) -> None:
+        with self._count_lock:
+            self._outstanding += outstanding
+            self._waiting += waiting
+
+    def stats(self) -> dict:
+        """Renders running in workers and renders queued (in the pool or waiting for a slot)."""
+        with self._count_lock:
+            running = min(self._outstanding, self.max_workers)
+            return {"running": running, "queued": self._outstanding - running + self._waiting}
+
+    def _release(self, _future: Future) -> None:
+        self._count(outstanding=-1)
+        self._slots.release()
+        self._wake_one()
+
+    def _wake_one(self) -> None:
+        """Tells the longest-waiting async caller that a slot may be free."""
+        with self._waiters_lock:
+            while self._waiters:
+                loop, waiter = self._waiters.popleft()
+                try:
+                    loop.call_soon_threadsafe(self._wake, waiter)
+                    return
+                except RuntimeError:
+                    # Its event loop is closed
+                    continue
+
+    def _wake(self, waiter: asyncio.Future) -> None:
+        if waiter.done():
+            # Cancelled meanwhile: the wake-up goes to the next caller
+            self._wake_one()
+        else:
+            waiter.set_result(None)
+
+    def _forget(self, loop: asyncio.AbstractEventLoop, waiter: asyncio.Future) -> None:
+        with self._waiters_lock:
+            try:
+                self._waiters.remove((loop, waiter))
+                return
+            except ValueError:
+                pass
+        # Already woken: pass the wake-up on instead of losing it
+        self._wake_one()
+
+    async def _acquire_async(self) -> None:
+        """
+        Waits for a slot on the event loop. Unlike waiting in a thread, a
+        cancelled caller takes no thread and never acquires a slot late.
+        """
+        if self._slots.acquire(blocking=False):
+            return
+        loop = asyncio.get_running_loop()
+        self._count(waiting=1)
+        try:
+            while True:
+                waiter = loop.create_future()
+                with self._waiters_lock:
+                    self._waiters.append((loop, waiter))
+                # A slot released before the waiter was queued woke nobody
+                if self._slots.acquire(blocking=False):
+                    self._forget(loop, waiter)
+                    return
+                try:
+                    await waiter
+                except asyncio.CancelledError:
+                    self._forget(loop, waiter)
+                    raise
+                # Sync callers may have taken the slot first; then wait again
+                if self._slots.acquire(blocking=False):
+                    return
+        finally:
+            self._count(waiting=-1)
+
+    def _submit_acquired(self, fn: Callable[..., Any], *args: Any) -> Future:
+        try:
+            future = self._get_pool().submit(fn, *args)
+        except Exception:
+            self._slots.release()
+            raise
+        self._count(outstanding=1)
+        future.add_done_callback(self._release)
+        return future
+
+    def submit(self, fn: Callable[..., Any], *args: Any) -> Future:
+        """Submit a job, blocking while the queue is full."""
+        self._count(waiting=1)
+        try:
+            self._slots.acquire()
+        finally:
+            self._count(waiting=-1)
+        return self._submit_acquired(fn, *args)
+
+    async def run(self, fn: Callable[..., Any], *args: Any) -> Any:
+        """Run a job in the pool and await its result without blocking the loop."""
+        await self._acquire_async()
+        return await asyncio.wrap_future(self._submit_acquired(fn, *args))
+
+    def shutdown(self, wait: bool = True) -> None:
+        with self._lock:
+            if self._pool is not None:
+                self._pool.shutdown(wait=wait, cancel_futures=True)
+                self._pool = None
+                logger.info("Render pool stopped")
+
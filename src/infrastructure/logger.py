@@ -4,16 +4,35 @@ Logging configuration for Text-to-PDF Service.
 Provides:
 - Console output with colors (INFO+)
 - File output with rotation (DEBUG+)
+- Optional JSON-lines output (PDF_LOG_FORMAT=json)
+- Per-level sampling of the access log (PDF_LOG_SAMPLE, e.g. "INFO=0.1")
+
+Logging calls only enqueue the record; a listener thread owns the console
+and file handlers, so request handlers never wait on log I/O.
 """
+import atexit
+import copy
+import json
 import logging
+import math
+import queue
 import sys
-from logging.handlers import RotatingFileHandler
+import threading
+from datetime import datetime
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
 from pathlib import Path
+from typing import Optional
+from src.infrastructure.config import Settings, settings as default_settings
+from src.infrastructure.metrics import registry
+
+LOG_RECORDS_DROPPED = registry.counter(
+    "pdf_log_records_dropped_total", "Log records dropped because the log queue was full"
+)
 
 
 class ColoredFormatter(logging.Formatter):
     """Custom formatter with ANSI color codes for console output."""
-    
+
     COLORS = {
         'DEBUG':    '\033[36m',   # Cyan
         'INFO':     '\033[32m',   # Green
@@ -22,47 +41,183 @@ class ColoredFormatter(logging.Formatter):
         'CRITICAL': '\033[35m',   # Magenta
     }
     RESET = '\033[0m'
-    
+
     def format(self, record):
         color = self.COLORS.get(record.levelname, self.RESET)
+        # Color a copy: every handler sees the same record, so mutating it
+        # would leak escape codes into the log file
+        record = logging.makeLogRecord(record.__dict__)
         record.levelname = f"{color}{record.levelname:8}{self.RESET}"
         return super().format(record)
 
 
-# Ensure logs directory exists
-log_dir = Path("logs")
-log_dir.mkdir(exist_ok=True)
-log_file = log_dir / "service.log"
+# Attributes every LogRecord has; anything else was passed via ``extra``
+_RECORD_ATTRIBUTES = set(logging.makeLogRecord({}).__dict__) | {"message", "asctime", "taskName"}
 
-# Create logger
-logger = logging.getLogger("text_to_pdf_service")
-logger.setLevel(logging.DEBUG)
 
-# Prevent duplicate handlers if module is reloaded
-if not logger.handlers:
+class JsonFormatter(logging.Formatter):
+    """One JSON object per line, including fields passed via ``extra``."""
+
+    def format(self, record):
+        entry = {
+            "timestamp": datetime.fromtimestamp(record.created).isoformat(timespec="milliseconds"),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+            "function": record.funcName,
+            "line": record.lineno,
+        }
+        if record.exc_info and not record.exc_text:
+            record.exc_text = self.formatException(record.exc_info)
+        if record.exc_text:
+            entry["exception"] = record.exc_text
+        for key, value in record.__dict__.items():
+            if key not in _RECORD_ATTRIBUTES:
+                entry[key] = value
+        return json.dumps(entry, default=str)
+
+
+class SamplingFilter(logging.Filter):
+    """
+    Keeps a fixed fraction of records per level, e.g. {"INFO": 0.1} keeps
+    the 1st, 11th, 21st... INFO record. Unlisted levels are always kept.
+    """
+
+    def __init__(self, rates: dict[str, float]):
+        super().__init__()
+        self.rates = {level.upper(): rate for level, rate in rates.items()}
+        self._seen: dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    def filter(self, record):
+        rate = self.rates.get(record.levelname)
+        if rate is None or rate >= 1:
+            return True
+        if rate <= 0:
+            return False
+        with self._lock:
+            seen = self._seen[record.levelname] = self._seen.get(record.levelname, 0) + 1
+        # Deterministic: exactly ceil(seen * rate) of the first `seen` records pass
+        return math.ceil(seen * rate) > math.ceil((seen - 1) * rate)
+
+
+def parse_sample_rates(spec: str) -> dict[str, float]:
+    """Parses "INFO=0.1,DEBUG=0" into {"INFO": 0.1, "DEBUG": 0.0}."""
+    rates = {}
+    for part in filter(None, (item.strip() for item in spec.split(","))):
+        level, _, rate = part.partition("=")
+        rates[level.strip().upper()] = float(rate)
+    return rates
+
+
+class LazyRotatingFileHandler(RotatingFileHandler):
+    """Creates the log directory and file on the first record, not at import."""
+
+    def __init__(self, filename: Path, **kwargs):
+        super().__init__(filename, delay=True, **kwargs)
+
+    def _open(self):
+        Path(self.baseFilename).parent.mkdir(parents=True, exist_ok=True)
+        return super()._open()
+
+
+class DroppingQueueHandler(QueueHandler):
+    """Enqueues records without blocking; drops (and counts) them when the queue is full."""
+
+    def __init__(self, log_queue: queue.Queue):
+        super().__init__(log_queue)
+        self.dropped = 0
+
+    def prepare(self, record):
+        # Merge the message now, but keep the traceback in exc_text (not in
+        # the message) so the listener's formatter decides how to render it
+        record = copy.copy(record)
+        record.message = record.msg = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            if not record.exc_text:
+                record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+    def enqueue(self, record):
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+            LOG_RECORDS_DROPPED.inc()
+
+
+def build_handlers(settings: Settings, log_file: Path) -> list[logging.Handler]:
+    """Console (INFO+) and rotating file (DEBUG+) handlers, run by the listener."""
     # Console Handler (INFO+) with colors
     console_handler = logging.StreamHandler(sys.stdout)
     console_handler.setLevel(logging.INFO)
-    console_formatter = ColoredFormatter(
-        '%(asctime)s | %(levelname)s | %(name)s | %(message)s',
-        datefmt='%Y-%m-%d %H:%M:%S'
-    )
-    console_handler.setFormatter(console_formatter)
-    
+
     # File Handler (DEBUG+) with rotation - no colors
-    file_handler = RotatingFileHandler(
-        log_file, 
+    file_handler = LazyRotatingFileHandler(
+        log_file,
         maxBytes=10*1024*1024,  # 10MB
         backupCount=5,
         encoding='utf-8'
     )
     file_handler.setLevel(logging.DEBUG)
-    file_formatter = logging.Formatter(
-        '%(asctime)s | %(levelname)-8s | %(name)s | %(funcName)s:%(lineno)d | %(message)s'
-    )
-    file_handler.setFormatter(file_formatter)
-    
-    logger.addHandler(console_handler)
-    logger.addHandler(file_handler)
 
-logger.info("Logger initialized successfully")
+    if settings.log_format == "json":
+        console_handler.setFormatter(JsonFormatter())
+        file_handler.setFormatter(JsonFormatter())
+    else:
+        console_handler.setFormatter(ColoredFormatter(
+            '%(asctime)s | %(levelname)s | %(name)s | %(message)s',
+            datefmt='%Y-%m-%d %H:%M:%S'
+        ))
+        file_handler.setFormatter(logging.Formatter(
+            '%(asctime)s | %(levelname)-8s | %(name)s | %(funcName)s:%(lineno)d | %(message)s'
+        ))
+    return [console_handler, file_handler]
+
+
+def stop_file_logging() -> None:
+    """
+    Stops writing this process's records to the log file; console output
+    stays. Render worker processes call it on start-up so that only the
+    parent process writes (and rotates) service.log.
+    """
+    if listener is None:
+        return
+    listener.stop()
+    for handler in listener.handlers:
+        if isinstance(handler, RotatingFileHandler):
+            handler.close()
+    listener.handlers = tuple(h for h in listener.handlers if not isinstance(h, RotatingFileHandler))
+    listener.start()
+
+
+# Created with the first record written to it
+log_dir = Path(default_settings.log_dir)
+log_file = log_dir / "service.log"
+
+# Create logger
+logger = logging.getLogger("text_to_pdf_service")
+logger.setLevel(logging.DEBUG)
+
+# One line per HTTP request; the high-volume stream that sampling targets
+access_logger = logger.getChild("access")
+
+# Owns the handlers; None when the module was reloaded
+listener: Optional[QueueListener] = None
+
+# Prevent duplicate handlers if module is reloaded
+if not logger.handlers:
+    log_queue: queue.Queue = queue.Queue(maxsize=default_settings.log_queue_size)
+    queue_handler = DroppingQueueHandler(log_queue)
+    logger.addHandler(queue_handler)
+
+    listener = QueueListener(log_queue, *build_handlers(default_settings, log_file), respect_handler_level=True)
+    listener.start()
+    # Runs before logging's own shutdown hook (atexit is LIFO): drain, then close
+    atexit.register(listener.stop)
+
+    sample_rates = parse_sample_rates(default_settings.log_sample)
+    if sample_rates:
+        access_logger.addFilter(SamplingFilter(sample_rates))
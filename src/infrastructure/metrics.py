@@ -0,0 +1,205 @@
+"""
+Metrics - In-process counters, histograms and gauges in Prometheus format.
+
+A deliberately small implementation of the Prometheus text exposition
+format (no extra dependency). Conversion stages that run inside render
+worker processes are timed there, travel back on
+``ConversionResult.timings`` and are observed here, in the process that
+serves ``/metrics``.
+"""
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from typing import Callable, Iterator, Optional
+
+# Seconds; spans cache hits (sub-ms) to very large renders
+DEFAULT_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format_labels(names: tuple[str, ...], values: tuple[str, ...], extra: str = "") -> str:
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if not float(value).is_integer() else str(int(value))
+
+
+class Counter:
+    def __init__(self, name: str, documentation: str, labels: tuple[str, ...] = ()):
+        self.name, self.documentation, self.labels = name, documentation, tuple(labels)
+        self._values: dict[tuple[str, ...], float] = {}
+        self._lock = threading.Lock()
+
+    def inc(self, amount: float = 1, **labels: str) -> None:
+        key = tuple(str(labels[name]) for name in self.labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def value(self, **labels: str) -> float:
+        return self._values.get(tuple(str(labels[name]) for name in self.labels), 0)
+
+    def expose(self) -> list[str]:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} counter"]
+        with self._lock:
+            for key, value in sorted(self._values.items()):
+                lines.append(f"{self.name}{_format_labels(self.labels, key)} {_format_value(value)}")
+        return lines
+
+
+class Histogram:
+    def __init__(
+        self, name: str, documentation: str, labels: tuple[str, ...] = (), buckets: tuple[float, ...] = DEFAULT_BUCKETS
+    ):
+        self.name, self.documentation, self.labels = name, documentation, tuple(labels)
+        self.buckets = tuple(sorted(buckets))
+        # label values -> (per-bucket counts, sum, count)
+        self._series: dict[tuple[str, ...], list] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value: float, **labels: str) -> None:
+        key = tuple(str(labels[name]) for name in self.labels)
+        with self._lock:
+            series = self._series.get(key)
+            if series is None:
+                series = self._series[key] = [[0] * len(self.buckets), 0.0, 0]
+            for index, bound in enumerate(self.buckets):
+                if value <= bound:
+                    series[0][index] += 1
+                    break
+            series[1] += value
+            series[2] += 1
+
+    def count(self, **labels: str) -> int:
+        series = self._series.get(tuple(str(labels[name]) for name in self.labels))
+        return series[2] if series else 0
+
+    def expose(self) -> list[str]:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} histogram"]
+        with self._lock:
+            for key, (counts, total, count) in sorted(self._series.items()):
+                cumulative = 0
+                for bound, bucket_count in zip(self.buckets, counts):
+                    cumulative += bucket_count
+                    le = _format_labels(self.labels, key, f'le="{_format_value(bound)}"')
+                    lines.append(f"{self.name}_bucket{le} {cumulative}")
+                le = _format_labels(self.labels, key, 'le="+Inf"')
+                lines.append(f"{self.name}_bucket{le} {count}")
+                lines.append(f"{self.name}_sum{_format_labels(self.labels, key)} {_format_value(total)}")
+                lines.append(f"{self.name}_count{_format_labels(self.labels, key)} {count}")
+        return lines
+
+
+class Gauge:
+    """Gauge read from a callback at scrape time (queue depths, pool state)."""
+
+    def __init__(self, name: str, documentation: str, read: Callable[[], float]):
+        self.name, self.documentation, self.read = name, documentation, read
+
+    def expose(self) -> list[str]:
+        try:
+            value = self.read()
+        except Exception:
+            return []
+        return [
+            f"# HELP {self.name} {self.documentation}",
+            f"# TYPE {self.name} gauge",
+            f"{self.name} {_format_value(value)}",
+        ]
+
+
+class MetricsRegistry:
+    def __init__(self):
+        self._metrics: dict[str, object] = {}
+        self._lock = threading.Lock()
+
+    def _register(self, metric):
+        with self._lock:
+            # Re-registering (e.g. a rebuilt app) replaces the old instrument
+            self._metrics[metric.name] = metric
+        return metric
+
+    def counter(self, name: str, documentation: str, labels: tuple[str, ...] = ()) -> Counter:
+        return self._register(Counter(name, documentation, labels))
+
+    def histogram(self, name: str, documentation: str, labels: tuple[str, ...] = ()) -> Histogram:
+        return self._register(Histogram(name, documentation, labels))
+
+    def gauge(self, name: str, documentation: str, read: Callable[[], float]) -> Gauge:
+        return self._register(Gauge(name, documentation, read))
+
+    def expose(self) -> str:
+        """Renders every metric in the Prometheus text format (version 0.0.4)."""
+        with self._lock:
+            metrics = list(self._metrics.values())
+        lines = []
+        for metric in metrics:
+            lines.extend(metric.expose())
+        return "\n".join(lines) + "\n"
+
+
+registry = MetricsRegistry()
+
+CONVERSIONS = registry.counter(
+    "pdf_conversions_total", "Conversions by source format and outcome", ("format", "outcome")
+)
+CONVERSION_SECONDS = registry.histogram(
+    "pdf_conversion_seconds", "End-to-end conversion time", ("format", "outcome")
+)
+STAGE_SECONDS = registry.histogram(
+    "pdf_conversion_stage_seconds",
+    "Time per conversion stage: read, detect_format, cache, render (wall time incl. pool queueing) "
+    "and, inside it, preprocess, html and pdf_render; then archive",
+    ("stage", "format"),
+)
+HTTP_REQUEST_SECONDS = registry.histogram(
+    "http_request_duration_seconds", "HTTP request latency by route", ("method", "path", "status")
+)
+
+
+@contextmanager
+def timed(timings: dict[str, float], stage: str) -> Iterator[None]:
+    """Adds the duration of the block to timings[stage] (seconds)."""
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        timings[stage] = timings.get(stage, 0.0) + time.perf_counter() - started
+
+
+@dataclass
+class ConversionTrace:
+    """Stage timings and labels collected while one conversion runs."""
+    source_format: str = "unknown"
+    cache_hit: bool = False
+    # Shared the outcome of an identical render already in flight
+    coalesced: bool = False
+    stages: dict[str, float] = field(default_factory=dict)
+
+    def stage(self, name: str):
+        return timed(self.stages, name)
+
+
+@contextmanager
+def trace_conversion(trace: Optional[ConversionTrace] = None) -> Iterator[ConversionTrace]:
+    """Records a conversion's stages, outcome and total time when the block exits."""
+    trace = trace or ConversionTrace()
+    started = time.perf_counter()
+    outcome = "failure"
+    try:
+        yield trace
+        outcome = "cache_hit" if trace.cache_hit else "coalesced" if trace.coalesced else "success"
+    finally:
+        CONVERSIONS.inc(format=trace.source_format, outcome=outcome)
+        CONVERSION_SECONDS.observe(time.perf_counter() - started, format=trace.source_format, outcome=outcome)
+        for stage, seconds in trace.stages.items():
+            STAGE_SECONDS.observe(seconds, stage=stage, format=trace.source_format)
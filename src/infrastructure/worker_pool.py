@@ -0,0 +1,329 @@
+"""
+Supervised Process Pool - Render workers with per-job resource limits.
+
+Unlike ProcessPoolExecutor, where one runaway job can only be waited for
+and a dead worker breaks the whole pool, every worker here is owned by a
+supervisor thread that can kill and replace it without touching the
+others:
+
+- wall-clock timeout per job: the worker is killed and replaced;
+- CPU time per job: a soft RLIMIT_CPU raised for each job, so the
+  worker interrupts itself with SIGXCPU;
+- memory: the supervisor polls the worker's RSS and kills it above the
+  ceiling; RLIMIT_AS (at twice the ceiling) stops allocation spikes that
+  are faster than the poll;
+- recycling: a worker is replaced after a number of jobs, after its RSS
+  grew by more than a threshold since start-up, and after any violation.
+
+Violations fail the job's future with RenderLimitError; the pool keeps
+serving other jobs.
+"""
+import math
+import multiprocessing
+import os
+import queue
+import resource
+import signal
+import threading
+import time
+from concurrent.futures import Future
+from dataclasses import dataclass
+from typing import Any, Callable, Optional
+
+from src.domain.exceptions import RenderLimitError
+from src.infrastructure.logger import logger, stop_file_logging
+from src.infrastructure.metrics import registry
+
+RENDER_LIMIT_VIOLATIONS = registry.counter(
+    "pdf_render_limit_violations_total",
+    "Render jobs stopped by a resource limit (wall_time, cpu_time, memory, worker_crash)",
+    ("limit",),
+)
+RENDER_WORKER_RECYCLES = registry.counter(
+    "pdf_render_worker_recycles_total", "Render workers replaced, by reason", ("reason",)
+)
+
+_MB = 1024 * 1024
+_STOP = object()
+# How often the supervisor checks a busy worker's memory
+_WATCH_INTERVAL = 0.25
+
+
+@dataclass(frozen=True)
+class WorkerLimits:
+    """Per-job limits and recycling thresholds (None or 0 disables each)."""
+    timeout_s: Optional[float] = None
+    cpu_s: Optional[int] = None
+    memory_mb: Optional[int] = None
+    max_jobs: Optional[int] = None
+    recycle_growth_mb: Optional[int] = None
+
+
+def _rss_bytes(pid: Optional[int] = None) -> Optional[int]:
+    """Resident set size of a process (Linux /proc), or None when unknown."""
+    try:
+        with open(f"/proc/{pid or 'self'}/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError):
+        return None
+
+
+class _CpuTimeExceeded(BaseException):
+    """Raised by the SIGXCPU handler; a BaseException so converters cannot swallow it."""
+
+
+_job_running = False
+
+
+def _on_cpu_limit(signum, frame) -> None:
+    if _job_running:
+        raise _CpuTimeExceeded()
+
+
+def _cpu_seconds() -> float:
+    usage = resource.getrusage(resource.RUSAGE_SELF)
+    return usage.ru_utime + usage.ru_stime
+
+
+def _set_cpu_limit(seconds: Optional[float]) -> None:
+    _, hard = resource.getrlimit(resource.RLIMIT_CPU)
+    soft = resource.RLIM_INFINITY if seconds is None else math.ceil(seconds)
+    if hard != resource.RLIM_INFINITY and (soft == resource.RLIM_INFINITY or soft > hard):
+        soft = hard
+    resource.setrlimit(resource.RLIMIT_CPU, (soft, hard))
+
+
+def _worker_main(conn, initializer: Optional[Callable[..., None]], initargs: tuple, limits: WorkerLimits) -> None:
+    """Worker process loop: run (fn, args) jobs from conn until told to stop."""
+    global _job_running
+    # Ctrl+C is the parent's business; it stops workers through the pipe
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    # The parent alone writes and rotates the log file
+    stop_file_logging()
+    if limits.memory_mb:
+        try:
+            _, hard = resource.getrlimit(resource.RLIMIT_AS)
+            ceiling = 2 * limits.memory_mb * _MB
+            if hard == resource.RLIM_INFINITY or ceiling <= hard:
+                resource.setrlimit(resource.RLIMIT_AS, (ceiling, hard))
+        except (ValueError, OSError, AttributeError):
+            pass
+    if limits.cpu_s:
+        signal.signal(signal.SIGXCPU, _on_cpu_limit)
+    if initializer:
+        initializer(*initargs)
+    conn.send(("ready", None, _rss_bytes()))
+
+    while True:
+        try:
+            job = conn.recv()
+        except EOFError:
+            break
+        if job is None:
+            break
+        fn, args = job
+        try:
+            if limits.cpu_s:
+                _set_cpu_limit(_cpu_seconds() + limits.cpu_s)
+            _job_running = True
+            reply = ("ok", fn(*args))
+        except _CpuTimeExceeded:
+            reply = ("limit", "cpu_time")
+        except MemoryError:
+            reply = ("limit", "memory")
+        except Exception as e:
+            reply = ("error", e)
+        finally:
+            _job_running = False
+            if limits.cpu_s:
+                _set_cpu_limit(None)
+        try:
+            conn.send((*reply, _rss_bytes()))
+        except Exception as e:
+            # The result or exception could not be pickled
+            conn.send(("error", RuntimeError(f"{type(e).__name__}: {e}"), _rss_bytes()))
+
+
+class _Worker:
+    def __init__(self, ctx, initializer, initargs: tuple, limits: WorkerLimits):
+        self.conn, child_conn = ctx.Pipe()
+        self.process = ctx.Process(
+            target=_worker_main, args=(child_conn, initializer, initargs, limits), daemon=True
+        )
+        self.process.start()
+        child_conn.close()
+        self.jobs = 0
+        # Wait for start-up (imports, warm-up) before taking jobs
+        kind, _, rss = self.conn.recv()
+        self.baseline_rss = rss
+
+    def kill(self) -> None:
+        self.process.kill()
+        self.process.join()
+        self.conn.close()
+
+    def stop(self, timeout: float = 5.0) -> None:
+        try:
+            self.conn.send(None)
+        except OSError:
+            pass
+        self.process.join(timeout)
+        if self.process.is_alive():
+            self.process.kill()
+            self.process.join()
+        self.conn.close()
+
+
+class SupervisedProcessPool:
+    """
+    Process pool with one supervisor thread per worker.
+
+    Offers the subset of the Executor interface RenderExecutor needs:
+    submit() returns a concurrent.futures.Future, shutdown() stops it.
+    Workers start right away and run initializer(*initargs) once each.
+    """
+
+    def __init__(
+        self,
+        max_workers: int,
+        limits: WorkerLimits = WorkerLimits(),
+        initializer: Optional[Callable[..., None]] = None,
+        initargs: tuple = (),
+    ):
+        self.max_workers = max_workers
+        self.limits = limits
+        self.initializer = initializer
+        self.initargs = initargs
+        self._ctx = multiprocessing.get_context("spawn")
+        self._jobs: queue.Queue = queue.Queue()
+        self._shutdown = False
+        self._threads = [
+            threading.Thread(target=self._supervise, name=f"render-worker-{i}", daemon=True)
+            for i in range(max_workers)
+        ]
+        for thread in self._threads:
+            thread.start()
+
+    def submit(self, fn: Callable[..., Any], *args: Any) -> Future:
+        if self._shutdown:
+            raise RuntimeError("cannot schedule new jobs after shutdown")
+        future = Future()
+        self._jobs.put((future, fn, args))
+        return future
+
+    def shutdown(self, wait: bool = True, cancel_futures: bool = False) -> None:
+        self._shutdown = True
+        if cancel_futures:
+            while True:
+                try:
+                    item = self._jobs.get_nowait()
+                except queue.Empty:
+                    break
+                if item is not _STOP:
+                    item[0].cancel()
+        for _ in self._threads:
+            self._jobs.put(_STOP)
+        if wait:
+            for thread in self._threads:
+                thread.join()
+
+    def _spawn(self) -> Optional[_Worker]:
+        try:
+            return _Worker(self._ctx, self.initializer, self.initargs, self.limits)
+        except (EOFError, OSError) as e:
+            logger.error("Render worker failed to start: %s", e)
+            return None
+
+    def _supervise(self) -> None:
+        worker = self._spawn()
+        try:
+            while True:
+                item = self._jobs.get()
+                if item is _STOP:
+                    return
+                future, fn, args = item
+                if not future.set_running_or_notify_cancel():
+                    continue
+                if worker is None:
+                    worker = self._spawn()
+                    if worker is None:
+                        future.set_exception(RenderLimitError("Render worker could not be started", "worker_crash"))
+                        continue
+                recycle = self._run(worker, future, fn, args)
+                if recycle:
+                    RENDER_WORKER_RECYCLES.inc(reason=recycle)
+                    logger.info("Recycling render worker %s (%s)", worker.process.pid, recycle)
+                    if worker.process.is_alive():
+                        worker.stop()
+                    else:
+                        worker.conn.close()
+                    worker = self._spawn()
+        finally:
+            if worker is not None:
+                worker.stop()
+
+    def _run(self, worker: _Worker, future: Future, fn: Callable[..., Any], args: tuple) -> Optional[str]:
+        """Runs one job on worker; returns why the worker must be replaced, if it must."""
+        limits = self.limits
+        try:
+            worker.conn.send((fn, args))
+        except (OSError, EOFError) as e:
+            future.set_exception(RenderLimitError(f"Render worker is gone: {e}", "worker_crash"))
+            RENDER_LIMIT_VIOLATIONS.inc(limit="worker_crash")
+            return "worker_crash"
+        except Exception as e:
+            # Arguments that cannot be pickled never reach the worker
+            future.set_exception(e)
+            return None
+        worker.jobs += 1
+        deadline = time.monotonic() + limits.timeout_s if limits.timeout_s else None
+        memory_ceiling = limits.memory_mb * _MB if limits.memory_mb else None
+
+        violation = None
+        while True:
+            wait = _WATCH_INTERVAL if memory_ceiling else None
+            if deadline is not None:
+                remaining = max(0.0, deadline - time.monotonic())
+                wait = remaining if wait is None else min(wait, remaining)
+            if worker.conn.poll(wait):
+                try:
+                    kind, value, rss = worker.conn.recv()
+                except (EOFError, OSError):
+                    violation = "worker_crash"
+                break
+            if deadline is not None and time.monotonic() >= deadline:
+                violation = "wall_time"
+                break
+            if memory_ceiling:
+                rss = _rss_bytes(worker.process.pid)
+                if rss is not None and rss > memory_ceiling:
+                    violation = "memory"
+                    break
+
+        if violation is None and kind == "limit":
+            violation = value
+        if violation is not None:
+            if worker.process.is_alive():
+                worker.kill()
+            message = {
+                "wall_time": f"Render exceeded its time limit of {limits.timeout_s}s",
+                "cpu_time": f"Render exceeded its CPU time limit of {limits.cpu_s}s",
+                "memory": f"Render exceeded its memory limit of {limits.memory_mb} MB",
+                "worker_crash": f"Render worker exited unexpectedly (exit code {worker.process.exitcode})",
+            }[violation]
+            logger.warning("%s; worker %s replaced", message, worker.process.pid)
+            RENDER_LIMIT_VIOLATIONS.inc(limit=violation)
+            future.set_exception(RenderLimitError(message, violation))
+            return violation
+
+        if kind == "ok":
+            future.set_result(value)
+        else:
+            future.set_exception(value)
+
+        if limits.max_jobs and worker.jobs >= limits.max_jobs:
+            return "max_jobs"
+        if limits.recycle_growth_mb and rss is not None and worker.baseline_rss is not None \
+                and rss - worker.baseline_rss > limits.recycle_growth_mb * _MB:
+            return "memory_growth"
+        return None
@@ -0,0 +1,219 @@
+"""
+Conversion benchmarks: per-stage timings and peak memory.
+
+Each Markdown document is timed stage by stage (preprocess, Markdown to
+HTML, template, pisa render) and end to end through
+ConversionService.convert_file; plain text goes through the streaming
+text renderer. Times are the best of N runs; peak memory is measured in a
+separate tracemalloc run so tracing does not inflate the timings. CLI
+start-up (see startup.py) is reported as the "startup" document.
+
+Usage:
+    python -m tests.benchmarks.bench                    # run and compare
+    python -m tests.benchmarks.bench --update-baseline  # record a new baseline
+"""
+import argparse
+import io
+import json
+import os
+import platform
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime
+from pathlib import Path
+from typing import Callable, Optional
+
+from xhtml2pdf import pisa
+
+from src.adapters.driven.format_router import FormatRouter
+from src.adapters.driven.fs_adapter import LocalFileSystemAdapter
+from src.adapters.driven.pdf_adapter import Xhtml2PdfAdapter
+from src.adapters.driven.text_pdf_adapter import StreamingTextAdapter
+from src.application.service import ConversionService
+from src.domain.model import ConversionRequest, SourceFormat
+from tests.benchmarks.corpus import Document, generate_corpus
+from tests.benchmarks.startup import measure_startup
+
+BASELINE_PATH = Path(__file__).parent / "baseline.json"
+RESULTS_PATH = Path(os.getenv("PDF_BENCHMARK_OUTPUT", "data/benchmarks/results.json"))
+
+# A stage regresses when it is this many times slower / larger than baseline
+TIME_TOLERANCE = float(os.getenv("PDF_BENCHMARK_TIME_TOLERANCE", "2.0"))
+MEMORY_TOLERANCE = float(os.getenv("PDF_BENCHMARK_MEMORY_TOLERANCE", "1.25"))
+# Stages faster than this are timer noise and never flagged
+MIN_SECONDS = 0.01
+
+
+def measure(fn: Callable[[], object], repeats: int) -> dict:
+    """Best-of-repeats wall time and tracemalloc peak of fn."""
+    best = float("inf")
+    for _ in range(repeats):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    tracemalloc.start()
+    try:
+        fn()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return {"seconds": round(best, 4), "peak_mb": round(peak / (1024 * 1024), 2)}
+
+
+def _markdown_stages(adapter: Xhtml2PdfAdapter, document: Document, repeats: int) -> dict:
+    theme = adapter.themes.get(adapter.default_theme)
+    preprocessed = adapter._preprocess_markdown(document.content)
+    body = adapter._markdown().convert(preprocessed)
+    html = adapter.themes.render_html(theme, body)
+
+    def render_pdf():
+        token = adapter.themes.activate(theme)
+        try:
+            pisa.CreatePDF(src=html, dest=io.BytesIO())
+        finally:
+            adapter.themes.deactivate(token)
+
+    return {
+        "preprocess": measure(lambda: adapter._preprocess_markdown(document.content), repeats),
+        "markdown": measure(lambda: adapter._markdown().convert(preprocessed), repeats),
+        "template": measure(lambda: adapter.themes.render_html(theme, body), repeats),
+        "pisa": measure(render_pdf, repeats),
+    }
+
+
+def _text_stages(adapter: StreamingTextAdapter, document: Document, repeats: int) -> dict:
+    request = ConversionRequest(
+        content=document.content, source_format=document.source_format, output_filename=document.filename
+    )
+    return {"render": measure(lambda: adapter.render(request), repeats)}
+
+
+def run_benchmarks(profile: str = "quick", repeats: int = 3) -> dict:
+    """Runs the suite over the corpus and returns the results document."""
+    markdown_adapter = Xhtml2PdfAdapter()
+    text_adapter = StreamingTextAdapter()
+    # Same routing as the container, without pool, cache or archiver
+    service = ConversionService(
+        FormatRouter(markdown_adapter, {SourceFormat.TEXT: text_adapter}), LocalFileSystemAdapter()
+    )
+    # First render loads fonts and parsers; keep it out of the numbers
+    markdown_adapter.warm_up()
+
+    documents = {}
+    with tempfile.TemporaryDirectory() as workdir:
+        for document in generate_corpus(profile):
+            if document.source_format == SourceFormat.MARKDOWN:
+                stages = _markdown_stages(markdown_adapter, document, repeats)
+            else:
+                stages = _text_stages(text_adapter, document, repeats)
+
+            input_path = os.path.join(workdir, document.filename)
+            Path(input_path).write_text(document.content, encoding="utf-8")
+            output_path = os.path.join(workdir, f"{document.name}.pdf")
+            stages["convert_file"] = measure(lambda: service.convert_file(input_path, output_path), repeats)
+
+            documents[document.name] = {
+                "format": document.source_format.value,
+                "input_bytes": document.size_bytes,
+                "output_bytes": os.path.getsize(output_path),
+                "stages": stages,
+            }
+
+    documents["startup"] = {
+        "format": "cli", "input_bytes": 0, "output_bytes": 0, "stages": measure_startup(repeats)
+    }
+
+    return {
+        "meta": {
+            "profile": profile,
+            "repeats": repeats,
+            "python": platform.python_version(),
+            "machine": platform.machine(),
+            "created_at": datetime.now().isoformat(timespec="seconds"),
+        },
+        "documents": documents,
+    }
+
+
+def compare(
+    results: dict,
+    baseline: dict,
+    time_tolerance: float = TIME_TOLERANCE,
+    memory_tolerance: float = MEMORY_TOLERANCE,
+) -> list[str]:
+    """Returns one message per stage that regressed against the baseline."""
+    regressions = []
+    if results["meta"]["profile"] != baseline.get("meta", {}).get("profile"):
+        return [f"baseline was recorded with profile {baseline.get('meta', {}).get('profile')!r}"]
+    for name, document in results["documents"].items():
+        base_document = baseline.get("documents", {}).get(name)
+        if base_document is None:
+            continue
+        for stage, current in document["stages"].items():
+            base = base_document["stages"].get(stage)
+            if base is None:
+                continue
+            if current["seconds"] > max(base["seconds"], MIN_SECONDS) * time_tolerance:
+                regressions.append(
+                    f"{name}/{stage}: {current['seconds']:.3f}s vs baseline {base['seconds']:.3f}s "
+                    f"(x{current['seconds'] / max(base['seconds'], 1e-9):.2f})"
+                )
+            if base["peak_mb"] > 0 and current["peak_mb"] > max(base["peak_mb"], 1.0) * memory_tolerance:
+                regressions.append(
+                    f"{name}/{stage}: peak {current['peak_mb']:.1f}MB vs baseline {base['peak_mb']:.1f}MB"
+                )
+    return regressions
+
+
+def write_results(results: dict, path: Path) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps(results, indent=2) + "\n", encoding="utf-8")
+
+
+def load_baseline(path: Path = BASELINE_PATH) -> Optional[dict]:
+    if not path.exists():
+        return None
+    return json.loads(path.read_text(encoding="utf-8"))
+
+
+def format_table(results: dict) -> str:
+    lines = [f"{'document':<12} {'stage':<14} {'seconds':>9} {'peak MB':>9}"]
+    for name, document in results["documents"].items():
+        for stage, value in document["stages"].items():
+            lines.append(f"{name:<12} {stage:<14} {value['seconds']:>9.4f} {value['peak_mb']:>9.2f}")
+    return "\n".join(lines)
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Run the conversion benchmarks.")
+    parser.add_argument("--profile", choices=["quick", "full"], default="quick")
+    parser.add_argument("--repeats", type=int, default=3)
+    parser.add_argument("--output", type=Path, default=RESULTS_PATH, help="Where to write the results JSON")
+    parser.add_argument("--baseline", type=Path, default=BASELINE_PATH)
+    parser.add_argument("--update-baseline", action="store_true", help="Store these results as the new baseline")
+    args = parser.parse_args(argv)
+
+    results = run_benchmarks(args.profile, args.repeats)
+    print(format_table(results))
+    write_results(results, args.output)
+    print(f"\nResults written to {args.output}")
+
+    if args.update_baseline:
+        write_results(results, args.baseline)
+        print(f"Baseline updated: {args.baseline}")
+        return 0
+
+    baseline = load_baseline(args.baseline)
+    if baseline is None:
+        print("No baseline found; run with --update-baseline to record one.")
+        return 0
+    regressions = compare(results, baseline)
+    for regression in regressions:
+        print(f"REGRESSION {regression}")
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,115 @@
+"""
+Deterministic synthetic corpus for the conversion benchmarks.
+
+Every document is generated from a seeded RNG, so the same profile always
+yields byte-identical inputs and timings stay comparable across runs.
+"""
+import random
+from dataclasses import dataclass
+from src.domain.model import SourceFormat
+
+WORDS = (
+    "render pipeline document margin layout stream buffer worker queue cache "
+    "theme table column header paragraph section latency throughput memory "
+    "request response archive batch markdown text page footer frame style"
+).split()
+
+# Scale factors per profile: "quick" keeps a full run to well under a minute
+PROFILES = {
+    "quick": {"paragraphs": 40, "list_items": 200, "table_rows": 40, "code_blocks": 8, "log_mb": 2},
+    "full": {"paragraphs": 300, "list_items": 2000, "table_rows": 600, "code_blocks": 100, "log_mb": 16},
+}
+
+
+@dataclass(frozen=True)
+class Document:
+    name: str
+    content: str
+    source_format: SourceFormat
+
+    @property
+    def filename(self) -> str:
+        return f"{self.name}.{self.source_format.value}"
+
+    @property
+    def size_bytes(self) -> int:
+        return len(self.content.encode("utf-8"))
+
+
+def _sentence(rng: random.Random, words: int = 12) -> str:
+    text = " ".join(rng.choice(WORDS) for _ in range(words))
+    return text.capitalize() + "."
+
+
+def prose(rng: random.Random, paragraphs: int) -> str:
+    parts = []
+    for index in range(paragraphs):
+        if index % 10 == 0:
+            parts.append(f"## Section {index // 10 + 1}")
+        sentences = " ".join(_sentence(rng, rng.randint(8, 20)) for _ in range(rng.randint(3, 7)))
+        # Emphasis and inline code exercise the inline Markdown patterns
+        parts.append(sentences.replace(" cache ", " **cache** ").replace(" queue ", " `queue` "))
+    return "# Prose\n\n" + "\n\n".join(parts) + "\n"
+
+
+def long_lists(rng: random.Random, items: int) -> str:
+    lines = ["# Lists", "Intro line directly followed by a list:"]
+    for index in range(items):
+        if index % 5 == 4:
+            lines.append(f"    - nested {_sentence(rng, 4)}")
+        elif index % 50 < 25:
+            lines.append(f"- {_sentence(rng, rng.randint(3, 10))}")
+        else:
+            lines.append(f"{index % 50 - 24}. {_sentence(rng, rng.randint(3, 10))}")
+    return "\n".join(lines) + "\n"
+
+
+def wide_table(rng: random.Random, rows: int, columns: int = 12) -> str:
+    header = "| " + " | ".join(f"Column {c + 1}" for c in range(columns)) + " |"
+    divider = "|" + "---|" * columns
+    body = [
+        "| " + " | ".join(
+            rng.choice(WORDS) if c % 3 else f"{rng.uniform(0, 10_000):.2f}" for c in range(columns)
+        ) + " |"
+        for _ in range(rows)
+    ]
+    return "# Wide Table\n\n" + "\n".join([header, divider, *body]) + "\n"
+
+
+def fenced_code(rng: random.Random, blocks: int) -> str:
+    parts = ["# Code"]
+    for index in range(blocks):
+        body = "\n".join(
+            f"    {rng.choice(WORDS)}_{line} = {rng.choice(WORDS)}({rng.randint(0, 99)})"
+            for line in range(rng.randint(5, 25))
+        )
+        parts.append(f"Block {index}:\n\n```python\ndef block_{index}():\n{body}\n```")
+    return "\n\n".join(parts) + "\n"
+
+
+def text_log(rng: random.Random, megabytes: int) -> str:
+    levels = ("INFO", "INFO", "INFO", "DEBUG", "WARNING", "ERROR")
+    target = megabytes * 1024 * 1024
+    lines, size, second = [], 0, 0
+    while size < target:
+        second += rng.randint(0, 2)
+        line = (
+            f"2026-01-01 {second // 3600 % 24:02d}:{second // 60 % 60:02d}:{second % 60:02d} "
+            f"{rng.choice(levels):<7} worker[{rng.randint(1, 8)}] {_sentence(rng, rng.randint(6, 30))}"
+        )
+        lines.append(line)
+        size += len(line) + 1
+    return "\n".join(lines) + "\n"
+
+
+def generate_corpus(profile: str = "quick", seed: int = 1234) -> list[Document]:
+    """Builds the benchmark corpus for a profile ("quick" or "full")."""
+    scale = PROFILES[profile]
+    rng = random.Random(seed)
+    return [
+        Document("prose", prose(rng, scale["paragraphs"]), SourceFormat.MARKDOWN),
+        Document("lists", long_lists(rng, scale["list_items"]), SourceFormat.MARKDOWN),
+        Document("wide_table", wide_table(rng, scale["table_rows"]), SourceFormat.MARKDOWN),
+        Document("code", fenced_code(rng, scale["code_blocks"]), SourceFormat.MARKDOWN),
+        Document("log", text_log(rng, scale["log_mb"]), SourceFormat.TEXT),
+    ]
@@ -0,0 +1,57 @@
+"""
+CLI startup benchmarks.
+
+Each command runs in a fresh interpreter, so the numbers are the import
+and start-up cost a shell script pays per call. The render stack must
+stay out of these paths: it is imported only once a conversion runs.
+"""
+import json
+import os
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parents[2]
+
+# Modules that make up most of the import cost of a conversion
+RENDER_STACK = ("xhtml2pdf", "reportlab", "markdown", "pypdf")
+
+STARTUP_COMMANDS = {
+    "cli_import": ["-c", "import src.adapters.driving.cli"],
+    "cli_help": ["-m", "src.adapters.driving.cli", "--help"],
+    # Argument validation fails before anything is rendered
+    "cli_missing_input": ["-m", "src.adapters.driving.cli", "convert", "does-not-exist.md"],
+}
+
+
+def _run(args: list[str]) -> subprocess.CompletedProcess:
+    env = {**os.environ, "PYTHONPATH": str(REPO_ROOT)}
+    return subprocess.run(
+        [sys.executable, *args], cwd=REPO_ROOT, env=env, capture_output=True, text=True, timeout=60
+    )
+
+
+def measure_startup(repeats: int = 3) -> dict:
+    """Best-of-repeats wall time of each startup command (peak memory is not traced)."""
+    stages = {}
+    for name, args in STARTUP_COMMANDS.items():
+        best = float("inf")
+        for _ in range(repeats):
+            start = time.perf_counter()
+            _run(args)
+            best = min(best, time.perf_counter() - start)
+        stages[name] = {"seconds": round(best, 4), "peak_mb": 0.0}
+    return stages
+
+
+def loaded_render_modules(statement: str) -> list[str]:
+    """Render-stack packages imported after running statement in a fresh interpreter."""
+    probe = (
+        f"{statement}\n"
+        "import json, sys\n"
+        f"print(json.dumps(sorted({{m.split('.')[0] for m in sys.modules}} & set({RENDER_STACK!r}))))"
+    )
+    completed = _run(["-c", probe])
+    completed.check_returncode()
+    return json.loads(completed.stdout.strip().splitlines()[-1])
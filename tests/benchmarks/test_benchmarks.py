@@ -0,0 +1,44 @@
+import os
+import pytest
+from tests.benchmarks.bench import RESULTS_PATH, compare, format_table, load_baseline, run_benchmarks, write_results
+from tests.benchmarks.corpus import generate_corpus
+from tests.benchmarks.startup import loaded_render_modules
+
+def test_corpus_is_deterministic():
+    first, second = generate_corpus("quick"), generate_corpus("quick")
+    
+    assert [d.content for d in first] == [d.content for d in second]
+    assert {d.name for d in first} == {"prose", "lists", "wide_table", "code", "log"}
+    assert next(d for d in first if d.name == "log").size_bytes >= 2 * 1024 * 1024
+
+def test_compare_flags_slower_and_larger_stages():
+    def results(seconds, peak_mb):
+        return {
+            "meta": {"profile": "quick"},
+            "documents": {"prose": {"stages": {"pisa": {"seconds": seconds, "peak_mb": peak_mb}}}},
+        }
+    
+    assert compare(results(0.5, 2.0), results(0.4, 2.0)) == []
+    regressions = compare(results(1.0, 4.0), results(0.4, 2.0))
+    assert len(regressions) == 2
+    assert regressions[0].startswith("prose/pisa: 1.000s")
+    # Sub-10ms stages are noise and never flagged
+    assert compare(results(0.004, 0.0), results(0.001, 0.0)) == []
+
+def test_cli_import_does_not_load_render_stack():
+    assert loaded_render_modules("import src.adapters.driving.cli") == []
+    # Converting does load it
+    assert "xhtml2pdf" in loaded_render_modules("from src.adapters.driving.cli import get_service; get_service()")
+
+@pytest.mark.benchmark
+@pytest.mark.skipif(not os.getenv("PDF_BENCHMARK"), reason="set PDF_BENCHMARK=1 to run the benchmarks")
+def test_no_regression_against_baseline():
+    results = run_benchmarks("quick", repeats=3)
+    write_results(results, RESULTS_PATH)
+    baseline = load_baseline()
+    if baseline is None:
+        pytest.skip("no baseline recorded (python -m tests.benchmarks.bench --update-baseline)")
+    
+    regressions = compare(results, baseline)
+    
+    assert not regressions, "Performance regressions:\n" + "\n".join(regressions) + "\n\n" + format_table(results)
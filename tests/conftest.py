@@ -0,0 +1,5 @@
+import os
+import tempfile
+
+# Keep test runs (and the render workers they spawn) out of the real logs/ directory
+os.environ.setdefault("PDF_LOG_DIR", tempfile.mkdtemp(prefix="pdf-service-test-logs-"))
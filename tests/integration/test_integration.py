@@ -1,5 +1,9 @@
+import pickle
 import os
+from io import BytesIO
+from pypdf import PdfReader
 from src.adapters.driven.pdf_adapter import Xhtml2PdfAdapter
+from src.adapters.driven.text_pdf_adapter import StreamingTextAdapter
 from src.domain.model import ConversionRequest, SourceFormat
 
 def test_xhtml2pdf_adapter_creates_pdf(tmp_path):
@@ -20,3 +24,93 @@ def test_xhtml2pdf_adapter_creates_pdf(tmp_path):
     assert os.path.exists(result.file_path)
     assert result.size_bytes > 0
     assert result.file_path.endswith("test_output.pdf")
+
+def test_xhtml2pdf_adapter_renders_in_memory():
+    adapter = Xhtml2PdfAdapter()
+    
+    req = ConversionRequest(
+        content="# Integration Test\nTesting in-memory PDF generation.",
+        source_format=SourceFormat.MARKDOWN,
+        output_filename="test_output.pdf"
+    )
+    
+    result = adapter.render(req)
+    
+    assert result.success is True
+    assert result.content.startswith(b"%PDF")
+    assert result.size_bytes == len(result.content)
+
+def test_xhtml2pdf_adapter_spills_large_output():
+    adapter = Xhtml2PdfAdapter()
+    
+    req = ConversionRequest(
+        content="plain text",
+        source_format=SourceFormat.TEXT,
+        output_filename="test_output.pdf"
+    )
+    
+    result = adapter.render(req, spill_threshold=100)
+    
+    assert result.success is True
+    assert result.content is None
+    assert os.path.getsize(result.file_path) == result.size_bytes
+    os.remove(result.file_path)
+
+def test_xhtml2pdf_adapter_reuses_markdown_and_pickles():
+    adapter = Xhtml2PdfAdapter()
+    first = ConversionRequest(content="# One", source_format=SourceFormat.MARKDOWN, output_filename="a.pdf")
+    second = ConversionRequest(content="Two", source_format=SourceFormat.MARKDOWN, output_filename="b.pdf")
+    
+    assert "<h1>One</h1>" in adapter._build_html(first)
+    md = adapter._local.md
+    html = adapter._build_html(second)
+    
+    # Same parser instance, state reset between documents
+    assert adapter._local.md is md
+    assert "<h1>" not in html
+    assert pickle.loads(pickle.dumps(adapter)).render(second).success is True
+
+def test_xhtml2pdf_adapter_theme_selection():
+    adapter = Xhtml2PdfAdapter()
+    
+    default = adapter.render(ConversionRequest(
+        content="# Title\n\nBody text.", source_format=SourceFormat.MARKDOWN, output_filename="a.pdf"
+    ))
+    compact = adapter.render(ConversionRequest(
+        content="# Title\n\nBody text.", source_format=SourceFormat.MARKDOWN, output_filename="a.pdf",
+        theme="compact"
+    ))
+    
+    assert default.success and compact.success
+    assert default.content != compact.content
+
+def test_streaming_text_adapter_paginates_and_escapes():
+    adapter = StreamingTextAdapter()
+    lines = [f"line {i} (a\\b) <pre>" for i in range(adapter.lines_per_page + 5)]
+    req = ConversionRequest(content="\n".join(lines), source_format=SourceFormat.TEXT, output_filename="log.pdf")
+    
+    result = adapter.render(req)
+    
+    assert result.success is True
+    reader = PdfReader(BytesIO(result.content))
+    assert len(reader.pages) == 2
+    first_page = reader.pages[0].extract_text()
+    assert "line 0 (a\\b) <pre>" in first_page
+    assert "Page 1" in first_page
+    assert "line %d" % (adapter.lines_per_page + 4) in reader.pages[1].extract_text()
+
+def test_streaming_text_adapter_wraps_long_lines_and_writes_files(tmp_path):
+    adapter = StreamingTextAdapter()
+    req = ConversionRequest(
+        content="x" * (adapter.chars_per_line * 3) + "\tend\x00",
+        source_format=SourceFormat.TEXT,
+        output_filename="wide"
+    )
+    
+    result = adapter.convert(req, str(tmp_path))
+    
+    assert result.success is True
+    assert result.file_path.endswith("wide.pdf")
+    text = PdfReader(result.file_path).pages[0].extract_text()
+    assert "x" * adapter.chars_per_line in text
+    assert "end" in text
@@ -1,21 +1,22 @@
+import asyncio
+import hashlib
+import io
+import json
+import zipfile
+import time
 from fastapi.testclient import TestClient
-from unittest.mock import patch, MagicMock
+from unittest.mock import patch, MagicMock, AsyncMock
 from src.adapters.driving.api import app
+from src.domain.model import ConversionResult
 
 client = TestClient(app)
 
 def test_convert_success():
-    # Helper to simulate file creation for response
-    def mock_convert(inp, outp):
-        # We assume the API logic creates outp. 
-        # But we need it to exist for FileResponse
-        with open(outp, 'wb') as f:
-            f.write(b"pdf data")
-        return outp
-
     with patch("src.adapters.driving.api.get_service") as mock_get_service:
         mock_service = MagicMock()
-        mock_service.convert_file.side_effect = mock_convert
+        mock_service.convert_content_async = AsyncMock(return_value=ConversionResult(
+            file_path="", size_bytes=8, success=True, content=b"pdf data"
+        ))
         mock_get_service.return_value = mock_service
         
         response = client.post(
@@ -25,6 +26,7 @@ def test_convert_success():
         
         assert response.status_code == 200
         assert response.headers['content-type'] == 'application/pdf'
+        assert response.content == b"pdf data"
 
 def test_convert_invalid_type():
     response = client.post(
@@ -37,7 +39,7 @@ def test_convert_invalid_type():
 def test_convert_service_error():
     with patch("src.adapters.driving.api.get_service") as mock_get_service:
         mock_service = MagicMock()
-        mock_service.convert_file.side_effect = Exception("Service failed")
+        mock_service.convert_content_async = AsyncMock(side_effect=Exception("Service failed"))
         mock_get_service.return_value = mock_service
 
         response = client.post(
@@ -45,3 +47,312 @@ def test_convert_service_error():
             files={"file": ("test.md", b"# Content", "text/markdown")}
         )
         assert response.status_code == 500
+
+def test_job_submit_poll_and_download():
+    with patch("src.adapters.driving.api.get_service") as mock_get_service:
+        mock_service = MagicMock()
+        mock_service.convert_content_async = AsyncMock(return_value=ConversionResult(
+            file_path="", size_bytes=8, success=True, content=b"pdf data"
+        ))
+        mock_get_service.return_value = mock_service
+
+        with patch("src.infrastructure.container.Container.warm_up"), TestClient(app) as live_client:
+            response = live_client.post(
+                "/jobs",
+                files={"file": ("test.md", b"# Content", "text/markdown")}
+            )
+            assert response.status_code == 202
+            job_id = response.json()["job_id"]
+
+            for _ in range(50):
+                status = live_client.get(f"/jobs/{job_id}").json()["status"]
+                if status == "succeeded":
+                    break
+                time.sleep(0.01)
+            assert status == "succeeded"
+
+            result = live_client.get(f"/jobs/{job_id}/result")
+            assert result.status_code == 200
+            assert result.content == b"pdf data"
+
+def test_job_unknown_id():
+    response = client.get("/jobs/missing")
+    assert response.status_code == 404
+
+def test_convert_multiple_streams_zip_with_manifest():
+    with patch("src.adapters.driving.api.get_service") as mock_get_service:
+        mock_service = MagicMock()
+        mock_service.convert_content_async = AsyncMock(return_value=ConversionResult(
+            file_path="", size_bytes=8, success=True, content=b"pdf data"
+        ))
+        mock_get_service.return_value = mock_service
+
+        response = client.post(
+            "/convert/multiple",
+            files=[
+                ("files", ("a.md", b"# A", "text/markdown")),
+                ("files", ("a.txt", b"A", "text/plain")),
+                ("files", ("b.exe", b"bin", "application/octet-stream")),
+            ]
+        )
+
+    assert response.status_code == 200
+    with zipfile.ZipFile(io.BytesIO(response.content)) as zf:
+        assert sorted(zf.namelist()) == ["a (1).pdf", "a.pdf", "manifest.json"]
+        assert zf.getinfo("a.pdf").compress_type == zipfile.ZIP_STORED
+        manifest = json.loads(zf.read("manifest.json"))
+    assert manifest["successful"] == 2
+    assert manifest["results"][2]["status"] == "skipped"
+
+def test_convert_rejects_oversized_upload_before_rendering():
+    with patch("src.adapters.driving.api.get_service") as mock_get_service:
+        response = client.post(
+            "/convert/",
+            files={"file": ("big.txt", b"x" * (10 * 1024 * 1024 + 1), "text/plain")}
+        )
+    
+    assert response.status_code == 413
+    mock_get_service.return_value.convert_content_async.assert_not_called()
+
+def test_convert_rejects_chunked_upload_without_content_length():
+    boundary = "testboundary"
+    chunk = b"x" * (1024 * 1024)
+    
+    def body():
+        yield (
+            f'--{boundary}\r\nContent-Disposition: form-data; name="file"; filename="big.txt"\r\n'
+            f'Content-Type: text/plain\r\n\r\n'
+        ).encode()
+        for _ in range(50):
+            yield chunk
+        yield f"\r\n--{boundary}--\r\n".encode()
+    
+    response = client.post(
+        "/convert/",
+        content=body(),
+        headers={"Content-Type": f"multipart/form-data; boundary={boundary}"}
+    )
+    
+    assert response.status_code == 413
+
+def test_convert_multiple_skips_oversized_files():
+    with patch("src.adapters.driving.api.get_service") as mock_get_service:
+        mock_service = MagicMock()
+        mock_service.convert_content_async = AsyncMock(return_value=ConversionResult(
+            file_path="", size_bytes=8, success=True, content=b"pdf data"
+        ))
+        mock_get_service.return_value = mock_service
+
+        response = client.post(
+            "/convert/multiple",
+            files=[
+                ("files", ("big.txt", b"x" * (10 * 1024 * 1024 + 1), "text/plain")),
+                ("files", ("small.md", b"# A", "text/markdown")),
+            ]
+        )
+
+    assert response.status_code == 200
+    with zipfile.ZipFile(io.BytesIO(response.content)) as zf:
+        manifest = json.loads(zf.read("manifest.json"))
+    assert manifest["results"][0] == {"file": "big.txt", "status": "skipped", "error": "File exceeds 10MB limit"}
+    assert manifest["successful"] == 1
+
+def test_metrics_endpoint_exposes_prometheus_text():
+    client.get("/health")
+    
+    response = client.get("/metrics")
+    
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain; version=0.0.4")
+    assert 'http_request_duration_seconds_count{method="GET",path="/health",status="200"}' in response.text
+    assert "# TYPE pdf_conversion_stage_seconds histogram" in response.text
+
+def test_history_endpoint_queries_the_store(tmp_path):
+    from src.adapters.driven.sqlite_archiver import SQLiteArchiver
+    from src.domain.model import ConversionRequest, SourceFormat
+    
+    archiver = SQLiteArchiver(str(tmp_path / "history.db"))
+    for name in ("a.pdf", "b.pdf"):
+        request = ConversionRequest(content=name, source_format=SourceFormat.TEXT, output_filename=name)
+        archiver.archive(request, ConversionResult("", 1, name == "a.pdf"))
+    archiver.flush()
+    try:
+        with patch("src.adapters.driving.api.get_container") as mock_get_container:
+            mock_get_container.return_value.history = archiver
+            
+            first = client.get("/history", params={"limit": 1}).json()
+            second = client.get("/history", params={"limit": 1, "cursor": first["next_cursor"]}).json()
+            failed = client.get("/history", params={"status": "failed"}).json()
+            
+            mock_get_container.return_value.history = None
+            unavailable = client.get("/history")
+        
+        assert [r["original_filename"] for r in first["items"] + second["items"]] == ["b.pdf", "a.pdf"]
+        assert second["next_cursor"] is None
+        assert [r["original_filename"] for r in failed["items"]] == ["b.pdf"]
+        assert unavailable.status_code == 503
+        assert client.get("/history", params={"status": "maybe"}).status_code == 422
+    finally:
+        archiver.close()
+
+def test_convert_etag_not_modified_and_byte_ranges():
+    with patch("src.adapters.driving.api.get_service") as mock_get_service:
+        mock_service = MagicMock()
+        mock_service.render_key.return_value = "abc123"
+        mock_service.convert_content_async = AsyncMock(return_value=ConversionResult(
+            file_path="", size_bytes=8, success=True, content=b"pdf data"
+        ))
+        mock_get_service.return_value = mock_service
+        upload = {"file": ("test.md", b"# Content", "text/markdown")}
+
+        response = client.post("/convert/", files=upload)
+        assert response.headers["etag"] == '"abc123"'
+        assert response.headers["content-length"] == "8"
+        assert response.headers["accept-ranges"] == "bytes"
+
+        response = client.post("/convert/", files=upload, headers={"If-None-Match": 'W/"other", "abc123"'})
+        assert response.status_code == 304
+        assert response.content == b""
+        assert mock_service.convert_content_async.await_count == 1
+
+        response = client.post("/convert/", files=upload, headers={"Range": "bytes=4-", "If-Range": '"abc123"'})
+        assert response.status_code == 206
+        assert response.content == b"data"
+        assert response.headers["content-range"] == "bytes 4-7/8"
+
+        # A stale If-Range gets the whole (new) PDF
+        response = client.post("/convert/", files=upload, headers={"Range": "bytes=0-2", "If-Range": '"old"'})
+        assert response.status_code == 200
+        assert response.content == b"pdf data"
+
+        response = client.post("/convert/", files=upload, headers={"Range": "bytes=8-"})
+        assert response.status_code == 416
+        assert response.headers["content-range"] == "bytes */8"
+
+def test_job_result_serves_byte_ranges_from_spill_file(tmp_path):
+    from fastapi import BackgroundTasks
+    from src.adapters.driving.api import pdf_response
+    spilled = tmp_path / "out.pdf"
+    spilled.write_bytes(b"0123456789")
+    request = MagicMock(headers={"range": "bytes=-3"})
+
+    response = pdf_response(
+        ConversionResult(file_path=str(spilled), size_bytes=10, success=True),
+        "out.pdf", BackgroundTasks(), cleanup=False, request=request
+    )
+
+    assert response.status_code == 206
+    assert response.headers["content-range"] == "bytes 7-9/10"
+    assert response.headers["content-length"] == "3"
+    async def body():
+        return b"".join([chunk async for chunk in response.body_iterator])
+    assert asyncio.run(body()) == b"789"
+
+def test_convert_text_accepts_raw_and_json_bodies():
+    with patch("src.adapters.driving.api.get_service") as mock_get_service:
+        mock_service = MagicMock()
+        mock_service.render_key.return_value = "abc123"
+        mock_service.convert_content_async = AsyncMock(return_value=ConversionResult(
+            file_path="", size_bytes=8, success=True, content=b"pdf data"
+        ))
+        mock_get_service.return_value = mock_service
+
+        response = client.post(
+            "/convert/text?filename=notes", content="# Notes".encode(),
+            headers={"Content-Type": "text/markdown; charset=utf-8"}
+        )
+        assert response.status_code == 200
+        assert response.content == b"pdf data"
+        assert response.headers["etag"] == '"abc123"'
+        assert 'filename="notes.pdf"' in response.headers["content-disposition"]
+        args, kwargs = mock_service.convert_content_async.call_args
+        assert args == (b"# Notes", "notes.md")
+
+        response = client.post(
+            "/convert/text", json={"content": "plain words", "format": "text", "filename": "memo.txt", "theme": "compact"}
+        )
+        assert response.status_code == 200
+        args, kwargs = mock_service.convert_content_async.call_args
+        assert args == ("plain words", "memo.txt")
+        assert kwargs["theme"] == "compact"
+        assert kwargs["content_hash"] == hashlib.sha256(b"plain words").hexdigest()
+
+def test_convert_text_validation():
+    assert client.post("/convert/text", content=b"x", headers={"Content-Type": "image/png"}).status_code == 415
+    assert client.post("/convert/text", content=b"", headers={"Content-Type": "text/plain"}).status_code == 400
+    assert client.post("/convert/text", json={"content": 1}).status_code == 422
+    assert client.post("/convert/text", json={"content": "x", "format": "html"}).status_code == 422
+    response = client.post(
+        "/convert/text", content=b"x" * (10 * 1024 * 1024 + 1), headers={"Content-Type": "text/plain"}
+    )
+    assert response.status_code == 413
+    # The limit applies to the decoded content, not to its JSON escaping
+    response = client.post(
+        "/convert/text", content=json.dumps({"content": "\x01" * (10 * 1024 * 1024 + 1)}),
+        headers={"Content-Type": "application/json"}
+    )
+    assert response.status_code == 413
+
+def test_convert_text_json_limit_applies_to_decoded_content():
+    with patch("src.adapters.driving.api.get_service") as mock_get_service:
+        mock_service = MagicMock()
+        mock_service.render_key.return_value = "abc123"
+        mock_service.convert_content_async = AsyncMock(return_value=ConversionResult(
+            file_path="", size_bytes=8, success=True, content=b"pdf data"
+        ))
+        mock_get_service.return_value = mock_service
+
+        # Under the limit once decoded, though the escaped body is ~5x larger
+        content = "\x01" * (2 * 1024 * 1024)
+        body = json.dumps({"content": content})
+        assert len(body) > 10 * 1024 * 1024
+        response = client.post("/convert/text", content=body, headers={"Content-Type": "application/json"})
+        assert response.status_code == 200
+        args, _ = mock_service.convert_content_async.call_args
+        assert args == (content, "document.md")
+
+def test_convert_multiple_streams_progress_events():
+    async def convert(content, filename, theme=None, content_hash=None, spill_threshold=None):
+        if filename == "bad.md":
+            raise RuntimeError("render failed")
+        return ConversionResult(file_path="", size_bytes=8, success=True, content=b"pdf data")
+
+    with patch("src.adapters.driving.api.get_service") as mock_get_service:
+        mock_service = MagicMock()
+        mock_service.convert_content_async = AsyncMock(side_effect=convert)
+        mock_get_service.return_value = mock_service
+
+        with patch("src.infrastructure.container.Container.warm_up"), TestClient(app) as live_client:
+            response = live_client.post(
+                "/convert/multiple?stream=ndjson",
+                files=[
+                    ("files", ("good.md", b"# Good", "text/markdown")),
+                    ("files", ("bad.md", b"# Bad", "text/markdown")),
+                    ("files", ("image.png", b"png", "image/png")),
+                ],
+            )
+            assert response.headers["content-type"].startswith("application/x-ndjson")
+            events = [json.loads(line) for line in response.text.splitlines()]
+
+            assert events[0] == {"event": "skipped", "file": "image.png", "error": "Unsupported format: .png"}
+            by_file = {(e["event"], e.get("file")): e for e in events}
+            assert ("started", "good.md") in by_file and ("started", "bad.md") in by_file
+            assert by_file[("failed", "bad.md")]["error"] == "render failed"
+            succeeded = by_file[("succeeded", "good.md")]
+            assert succeeded["size_bytes"] == 8
+            # PDFs are only retained on request
+            assert "result_url" not in succeeded
+            assert events[-1] == {"event": "completed", "processed": 3, "successful": 1, "failed": 2}
+
+            response = live_client.post(
+                "/convert/multiple?stream=ndjson&keep_results=true",
+                files=[("files", ("good.md", b"# Good", "text/markdown"))],
+            )
+            succeeded = next(json.loads(line) for line in response.text.splitlines() if '"succeeded"' in line)
+            # Finished PDFs can be fetched while (and after) the stream runs
+            assert live_client.get(succeeded["result_url"]).content == b"pdf data"
+
+def test_progress_events_encode_as_sse_and_ndjson():
+    from src.adapters.driving.progress import encode_event
+    assert encode_event("started", {"file": "a.md"}, "sse") == b'event: started\ndata: {"file": "a.md"}\n\n'
+    assert encode_event("started", {"file": "a.md"}, "ndjson") == b'{"event": "started", "file": "a.md"}\n'
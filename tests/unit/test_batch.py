@@ -0,0 +1,144 @@
+import os
+import time
+from pathlib import Path
+from unittest.mock import Mock
+from src.application.batch import BatchConverter
+from src.application.manifest import MANIFEST_NAME, manifest_name
+from src.application.service import ConversionService
+
+def test_batch_results_keep_input_order(tmp_path):
+    files = []
+    for name, delay in [("slow.md", 0.05), ("fast.md", 0.0), ("bad.md", 0.0)]:
+        path = tmp_path / name
+        path.write_text("# Doc")
+        files.append((str(path), delay))
+
+    def fake_convert(input_path, output_path, timeout=None):
+        delay = dict(files)[input_path]
+        time.sleep(delay)
+        if input_path.endswith("bad.md"):
+            raise RuntimeError("boom")
+        return output_path
+
+    service = Mock(spec=ConversionService)
+    service.convert_file.side_effect = fake_convert
+    
+    summary = BatchConverter(service, workers=3, file_timeout=5).run(
+        [f for f, _ in files], str(tmp_path)
+    )
+    
+    assert [r.file for r in summary.results] == ["slow.md", "fast.md", "bad.md"]
+    assert [r.status for r in summary.results] == ["success", "success", "error"]
+    assert summary.successful == 2
+    assert summary.failed == 1
+    assert summary.results[2].error == "boom"
+    service.convert_file.assert_any_call(files[0][0], str(tmp_path / "slow.pdf"), timeout=5)
+
+def test_batch_summary_reports_throughput(tmp_path):
+    path = tmp_path / "doc.md"
+    path.write_text("# Doc")
+    service = Mock(spec=ConversionService)
+    
+    summary = BatchConverter(service, workers=2).run([str(path)], str(tmp_path))
+    data = summary.to_dict()
+    
+    assert data["processed"] == 1
+    assert data["throughput"]["workers"] == 2
+    assert data["throughput"]["files_per_s"] > 0
+
+def test_incremental_batch_skips_unchanged_and_prunes_removed(tmp_path):
+    input_dir, output_dir = tmp_path / "input", tmp_path / "output"
+    input_dir.mkdir()
+    output_dir.mkdir()
+    for name in ("a", "b", "c"):
+        (input_dir / f"{name}.md").write_text(f"# {name}")
+    (output_dir / "unrelated.pdf").write_bytes(b"keep")
+
+    def files():
+        return sorted(str(p) for p in input_dir.glob("*.md"))
+
+    def fake_convert(input_path, output_path, timeout=None):
+        Path(output_path).write_bytes(b"%PDF " + Path(input_path).read_bytes())
+        return output_path
+
+    service = Mock(spec=ConversionService)
+    service.convert_file.side_effect = fake_convert
+    service.render_options_key.return_value = "default"
+    batch = BatchConverter(service, workers=2)
+    def run(**kwargs):
+        service.convert_file.reset_mock()
+        summary = batch.run(files(), str(output_dir), incremental=True, **kwargs)
+        return {r.file: r.status for r in summary.results}, summary
+
+    statuses, _ = run()
+    assert set(statuses.values()) == {"success"}
+    assert run()[0] == {"a.md": "unchanged", "b.md": "unchanged", "c.md": "unchanged"}
+    assert service.convert_file.call_count == 0
+
+    # Changed content and a missing output are rebuilt; a touch without changes is not
+    (input_dir / "a.md").write_text("# a, edited")
+    (output_dir / "b.pdf").unlink()
+    os.utime(input_dir / "c.md", ns=(1, 1))
+    statuses, summary = run()
+    assert statuses == {"a.md": "success", "b.md": "success", "c.md": "unchanged"}
+    assert (summary.successful, summary.unchanged, summary.failed) == (2, 1, 0)
+
+    # Other render options invalidate every output
+    service.render_options_key.return_value = "compact"
+    assert set(run()[0].values()) == {"success"}
+
+    (input_dir / "c.md").unlink()
+    statuses, summary = run(prune=True)
+    assert statuses == {"a.md": "unchanged", "b.md": "unchanged"}
+    assert summary.pruned == ["c.pdf"]
+    assert sorted(p.name for p in output_dir.glob("*.pdf")) == ["a.pdf", "b.pdf", "unrelated.pdf"]
+
+def test_batch_mirrors_input_tree_and_keeps_a_manifest_per_shard(tmp_path):
+    input_dir, output_dir = tmp_path / "input", tmp_path / "output"
+    (input_dir / "sub").mkdir(parents=True)
+    (input_dir / "doc.md").write_text("# Top")
+    (input_dir / "sub" / "doc.md").write_text("# Nested")
+
+    def fake_convert(input_path, output_path, timeout=None):
+        Path(output_path).write_bytes(b"%PDF " + Path(input_path).read_bytes())
+        return output_path
+
+    service = Mock(spec=ConversionService)
+    service.convert_file.side_effect = fake_convert
+    service.render_options_key.return_value = "default"
+    files = [str(input_dir / "doc.md"), str(input_dir / "sub" / "doc.md")]
+
+    summary = BatchConverter(service, workers=1).run(
+        iter(files), str(output_dir), incremental=True,
+        input_root=str(input_dir), manifest_name=manifest_name(1, 2),
+    )
+
+    assert [(r.file, r.output) for r in summary.results] == [("doc.md", "doc.pdf"), ("sub/doc.md", "sub/doc.pdf")]
+    assert (output_dir / "sub" / "doc.pdf").read_bytes() == b"%PDF # Nested"
+    assert (output_dir / ".bulk-manifest.1-of-2.json").exists()
+    assert not (output_dir / MANIFEST_NAME).exists()
+
+def test_batch_reports_progress_as_files_finish(tmp_path):
+    paths = []
+    for name in ("slow.md", "fast.md"):
+        (tmp_path / name).write_text("# Doc")
+        paths.append(str(tmp_path / name))
+
+    def fake_convert(input_path, output_path, timeout=None):
+        time.sleep(0.1 if input_path.endswith("slow.md") else 0)
+        Path(output_path).write_bytes(b"%PDF-1.4")
+        return output_path
+
+    service = Mock(spec=ConversionService)
+    service.convert_file.side_effect = fake_convert
+    started, finished = [], []
+
+    summary = BatchConverter(service, workers=2).run(
+        paths, str(tmp_path / "out"), on_start=started.append, on_result=finished.append
+    )
+
+    assert sorted(started) == ["fast.md", "slow.md"]
+    # Reported in completion order; the summary keeps input order
+    assert [r.file for r in finished] == ["fast.md", "slow.md"]
+    assert [r.file for r in summary.results] == ["slow.md", "fast.md"]
+    assert finished[0].output_bytes == 8
@@ -0,0 +1,75 @@
+import asyncio
+from concurrent.futures import Future
+from src.infrastructure.executor import RenderExecutor
+
+
+class ManualPool:
+    """Stands in for the process pool: jobs finish when the test says so."""
+
+    def __init__(self):
+        self.futures = []
+
+    def submit(self, fn, *args):
+        future = Future()
+        self.futures.append(future)
+        return future
+
+
+def make_executor():
+    executor = RenderExecutor(1, max_pending=0)
+    pool = ManualPool()
+    executor._get_pool = lambda: pool
+    return executor, pool
+
+
+def test_cancelled_waiter_does_not_keep_a_slot():
+    executor, pool = make_executor()
+
+    async def scenario():
+        first = asyncio.ensure_future(executor.run(len, "a"))
+        await asyncio.sleep(0)
+        queued = asyncio.ensure_future(executor.run(len, "b"))
+        await asyncio.sleep(0)
+        assert executor.stats() == {"running": 1, "queued": 1}
+
+        queued.cancel()
+        await asyncio.gather(queued, return_exceptions=True)
+        assert executor.stats() == {"running": 1, "queued": 0}
+
+        pool.futures[0].set_result(1)
+        assert await first == 1
+        assert executor.stats() == {"running": 0, "queued": 0}
+
+        # The freed slot is usable again; the cancelled run never submitted a job
+        third = asyncio.ensure_future(executor.run(len, "c"))
+        await asyncio.sleep(0)
+        assert len(pool.futures) == 2
+        pool.futures[1].set_result(1)
+        return await asyncio.wait_for(third, timeout=5)
+
+    assert asyncio.run(scenario()) == 1
+    assert executor._slots.acquire(blocking=False)
+
+
+def test_released_slot_wakes_next_waiter_after_cancelled_one():
+    executor, pool = make_executor()
+
+    async def scenario():
+        first = asyncio.ensure_future(executor.run(len, "a"))
+        await asyncio.sleep(0)
+        cancelled = asyncio.ensure_future(executor.run(len, "b"))
+        waiting = asyncio.ensure_future(executor.run(len, "c"))
+        await asyncio.sleep(0)
+        assert executor.stats()["queued"] == 2
+
+        # The slot frees up while the first waiter is being cancelled
+        pool.futures[0].set_result(1)
+        cancelled.cancel()
+        await asyncio.gather(first, cancelled, return_exceptions=True)
+        await asyncio.sleep(0)
+        assert len(pool.futures) == 2
+        pool.futures[1].set_result(2)
+        return await asyncio.wait_for(waiting, timeout=5)
+
+    assert asyncio.run(scenario()) == 2
+    assert executor.stats() == {"running": 0, "queued": 0}
@@ -0,0 +1,54 @@
+from unittest.mock import Mock
+from src.adapters.driven.format_router import FormatRouter
+from src.domain.model import ConversionRequest, SourceFormat
+
+def make_request(source_format):
+    return ConversionRequest(content="x", source_format=source_format, output_filename="x.pdf")
+
+def test_routes_by_source_format():
+    default, text = Mock(), Mock()
+    router = FormatRouter(default, {SourceFormat.TEXT: text})
+    
+    router.render(make_request(SourceFormat.TEXT), 10)
+    router.convert(make_request(SourceFormat.MARKDOWN), "out")
+    
+    text.render.assert_called_once()
+    default.convert.assert_called_once()
+    default.render.assert_not_called()
+
+def test_options_and_themes_come_from_converters():
+    default, text = Mock(), Mock()
+    default.options_key.return_value = "html"
+    default.themes_available.return_value = ["default"]
+    text.options_key.return_value = "text"
+    router = FormatRouter(default, {SourceFormat.TEXT: text})
+    
+    assert router.options_key() == "html|text"
+    assert router.themes_available() == ["default"]
+    
+    router.warm_up()
+    default.warm_up.assert_called_once()
+    text.warm_up.assert_called_once()
+
+def test_sections_only_for_section_capable_converters():
+    import pytest
+    from src.domain.exceptions import UnsupportedFormatError
+    from src.domain.ports import PDFConverterPort, SectionRendererPort
+    default, text = Mock(spec=SectionRendererPort), Mock(spec=PDFConverterPort)
+    default.split_sections.return_value = ["a", "b"]
+    router = FormatRouter(default, {SourceFormat.TEXT: text})
+    text_request = make_request(SourceFormat.TEXT)
+
+    assert router.split_sections(make_request(SourceFormat.MARKDOWN), 10) == ["a", "b"]
+    assert router.split_sections(text_request, 10) == [text_request]
+    with pytest.raises(UnsupportedFormatError):
+        router.render_section(text_request)
+
+def test_themes_apply_per_source_format():
+    from src.adapters.driven.text_pdf_adapter import StreamingTextAdapter
+    default = Mock()
+    default.applies_themes.return_value = True
+    router = FormatRouter(default, {SourceFormat.TEXT: StreamingTextAdapter()})
+
+    assert router.applies_themes(SourceFormat.MARKDOWN)
+    assert not router.applies_themes(SourceFormat.TEXT)
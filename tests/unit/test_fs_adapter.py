@@ -1,7 +1,8 @@
 import pytest
 import os
 from unittest.mock import mock_open, patch
-from src.adapters.driven.fs_adapter import LocalFileSystemAdapter
+from src.adapters.driven.fs_adapter import LocalFileSystemAdapter, scan_filter
+from src.domain.model import FileScan, shard_of
 
 def test_fs_read_file_success():
     adapter = LocalFileSystemAdapter()
@@ -23,3 +24,67 @@ def test_fs_write_file():
     with patch("builtins.open", mock_open()):
         path = adapter.save_file("test.pdf", b"data")
         assert os.path.isabs(path)
+
+def make_tree(root, paths):
+    for rel in paths:
+        path = root / rel
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text("# Doc")
+
+def test_scan_files_walks_tree_recursively_with_filters(tmp_path):
+    make_tree(tmp_path, [
+        "a.md", "b.markdown", "c.txt", "image.png",
+        "sub/d.md", "sub/deep/e.MD", "drafts/f.md", "sub/notes.tmp.md",
+    ])
+    adapter = LocalFileSystemAdapter()
+
+    def relative(files):
+        return sorted(os.path.relpath(f, tmp_path).replace(os.sep, "/") for f in files)
+
+    files = adapter.scan_files(str(tmp_path), FileScan())
+    assert not isinstance(files, list)
+    assert relative(files) == [
+        "a.md", "b.markdown", "c.txt", "drafts/f.md", "sub/d.md", "sub/deep/e.MD", "sub/notes.tmp.md",
+    ]
+
+    scan = FileScan(exclude=("drafts", "*.tmp.md"), include=("sub/*",))
+    assert relative(adapter.scan_files(str(tmp_path), scan)) == ["sub/d.md", "sub/deep/e.MD"]
+    assert list(adapter.scan_files(str(tmp_path / "missing"), FileScan())) == []
+
+def test_scan_files_shards_are_disjoint_and_complete(tmp_path):
+    make_tree(tmp_path, [f"dir{i % 7}/doc{i}.md" for i in range(200)])
+    adapter = LocalFileSystemAdapter()
+    everything = set(adapter.scan_files(str(tmp_path), FileScan()))
+
+    shards = [set(adapter.scan_files(str(tmp_path), FileScan(shard_index=i, shard_count=3))) for i in range(3)]
+
+    assert set().union(*shards) == everything
+    assert sum(len(s) for s in shards) == len(everything) == 200
+    assert all(len(s) > 30 for s in shards)
+    # Assignment depends only on the path below the root, not the mount point
+    assert shard_of("dir1/doc1.md", 3) == shard_of("dir1/doc1.md", 3)
+    with pytest.raises(ValueError):
+        FileScan(shard_index=3, shard_count=3)
+
+def test_list_files_is_not_recursive(tmp_path):
+    make_tree(tmp_path, ["a.md", "b.markdown", "sub/c.md"])
+    files = LocalFileSystemAdapter().list_files(str(tmp_path), [".md", ".markdown"])
+    assert sorted(os.path.basename(f) for f in files) == ["a.md", "b.markdown"]
+
+def test_scan_filter_selects_what_scan_files_yields(tmp_path):
+    make_tree(tmp_path, [
+        "a.md", "image.png", "sub/d.md", "sub/deep/e.MD", "drafts/f.md", "sub/notes.tmp.md",
+        *(f"dir{i % 3}/doc{i}.md" for i in range(20)),
+    ])
+    everything = [str(p) for p in tmp_path.rglob("*") if p.is_file()]
+
+    for scan in (
+        FileScan(),
+        FileScan(exclude=("drafts", "*.tmp.md"), include=("sub/*",)),
+        FileScan(exclude=("dir1",), shard_index=1, shard_count=3),
+    ):
+        selects = scan_filter(str(tmp_path), scan)
+        scanned = set(LocalFileSystemAdapter().scan_files(str(tmp_path), scan))
+        assert {path for path in everything if selects(path)} == scanned
+    # Paths outside the root are never selected
+    assert not scan_filter(str(tmp_path / "sub"), FileScan())(str(tmp_path / "a.md"))
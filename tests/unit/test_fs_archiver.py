@@ -0,0 +1,84 @@
+import json
+import threading
+from src.adapters.driven.archive_writer import BufferedArchiver, content_stats
+from src.adapters.driven.fs_archiver import FileSystemArchiver
+from src.domain.model import ConversionRequest, ConversionResult, SourceFormat
+
+
+def _request(content: str, name: str = "doc.pdf") -> ConversionRequest:
+    return ConversionRequest(content=content, source_format=SourceFormat.MARKDOWN, output_filename=name)
+
+
+def _records(archiver: FileSystemArchiver) -> list[dict]:
+    records = []
+    for path in sorted(archiver.meta_dir.glob("*.jsonl")):
+        records.extend(json.loads(line) for line in path.read_text(encoding="utf-8").splitlines())
+    return records
+
+
+def test_content_stats_matches_naive_counts(monkeypatch):
+    # Tiny chunks so words and lines straddle chunk boundaries
+    monkeypatch.setattr("src.adapters.driven.archive_writer._STATS_CHUNK", 3)
+    for text in ["", "one", "one two\nthree  four\n", "héllo wörld\n\n  x", " a\tb\n"]:
+        stats = content_stats(text)
+        assert stats == {
+            "input_size_bytes": len(text.encode("utf-8")),
+            "word_count": len(text.split()),
+            "line_count": len(text.splitlines()),
+            "char_count": len(text),
+        }, text
+
+
+def test_archive_writes_batched_records_after_flush(tmp_path):
+    archiver = FileSystemArchiver(str(tmp_path), flush_interval=60)
+    try:
+        for index in range(5):
+            archiver.archive(_request(f"# Doc {index}\nbody", f"doc{index}.pdf"), ConversionResult("out.pdf", 4, True))
+        assert archiver.flush()
+
+        records = _records(archiver)
+        assert [r["original_filename"] for r in records] == [f"doc{i}.pdf" for i in range(5)]
+        assert records[0]["word_count"] == 4 and records[0]["line_count"] == 2
+        assert records[0]["output_size_bytes"] == 4 and records[0]["success"] is True
+        stats = archiver.stats()
+        assert stats["written"] == 5 and stats["flushes"] == 1 and stats["dropped"] == 0
+    finally:
+        archiver.close()
+
+
+def test_full_queue_drops_records_and_close_writes_the_rest(tmp_path, monkeypatch):
+    # Hold the writer thread back so the queue fills up
+    writer_may_start = threading.Event()
+    run = BufferedArchiver._run
+    monkeypatch.setattr(FileSystemArchiver, "_run", lambda self: (writer_may_start.wait(), run(self)))
+    archiver = FileSystemArchiver(str(tmp_path), queue_size=2, flush_interval=60)
+
+    for _ in range(5):
+        archiver.archive(_request("text"), ConversionResult("", 0, False, error_message="boom"))
+    writer_may_start.set()
+    archiver.close()
+
+    assert archiver.stats() == {"written": 2, "dropped": 3, "failed": 0, "flushes": 1, "queued": 0}
+    assert [r["error"] for r in _records(archiver)] == ["boom", "boom"]
+    # A closed archiver ignores further records
+    archiver.archive(_request("late"), ConversionResult("", 0, True))
+    assert archiver.stats()["queued"] == 0
+
+
+def test_queue_is_bounded_by_queued_text(tmp_path, monkeypatch):
+    writer_may_start = threading.Event()
+    run = BufferedArchiver._run
+    monkeypatch.setattr(FileSystemArchiver, "_run", lambda self: (writer_may_start.wait(), run(self)))
+    archiver = FileSystemArchiver(str(tmp_path), queue_chars=10, flush_interval=60)
+
+    for content in ["a" * 6, "b" * 6, "c" * 4, "d"]:
+        archiver.archive(_request(content), ConversionResult("", 0, True))
+    writer_may_start.set()
+    archiver.flush()
+    # A record larger than the budget is still taken when nothing is queued
+    archiver.archive(_request("e" * 20), ConversionResult("", 0, True))
+    archiver.close()
+
+    assert [r["char_count"] for r in _records(archiver)] == [6, 4, 20]
+    assert archiver.stats()["dropped"] == 2
+    assert archiver._queued_chars == 0
@@ -0,0 +1,79 @@
+import asyncio
+import pytest
+from unittest.mock import AsyncMock, MagicMock
+from src.application.jobs import JobManager, JobStatus
+from src.domain.exceptions import JobQueueFullError
+from src.domain.model import ConversionResult
+
+def make_service(side_effect=None):
+    service = MagicMock()
+    service.convert_content_async = AsyncMock(
+        return_value=ConversionResult(file_path="", size_bytes=3, success=True, content=b"pdf"),
+        side_effect=side_effect
+    )
+    return service
+
+def test_job_runs_to_success():
+    async def scenario():
+        manager = JobManager(lambda: make_service(), workers=1)
+        job = manager.submit(b"# Doc", "doc.md")
+        assert job.status == JobStatus.QUEUED
+        await manager._queue.join()
+        result = manager.get(job.id)
+        await manager.stop()
+        return result
+
+    job = asyncio.run(scenario())
+    assert job.status == JobStatus.SUCCEEDED
+    assert job.result.content == b"pdf"
+    assert job.output_filename == "doc.pdf"
+
+def test_job_failure_is_recorded():
+    async def scenario():
+        manager = JobManager(lambda: make_service(RuntimeError("boom")), workers=1)
+        job = manager.submit(b"# Doc", "doc.md")
+        await manager._queue.join()
+        await manager.stop()
+        return job
+
+    job = asyncio.run(scenario())
+    assert job.status == JobStatus.FAILED
+    assert job.error == "boom"
+
+def test_job_queue_full_rejects():
+    async def scenario():
+        manager = JobManager(lambda: make_service(), workers=1, queue_size=1)
+        manager.submit(b"a", "a.md")
+        try:
+            with pytest.raises(JobQueueFullError):
+                manager.submit(b"b", "b.md")
+        finally:
+            await manager.stop()
+
+    asyncio.run(scenario())
+
+def test_finished_jobs_expire():
+    async def scenario():
+        manager = JobManager(lambda: make_service(), workers=1, result_ttl=0)
+        job = manager.submit(b"# Doc", "doc.md")
+        await manager._queue.join()
+        await asyncio.sleep(0.01)
+        found = manager.get(job.id)
+        await manager.stop()
+        return found
+
+    assert asyncio.run(scenario()) is None
+
+def test_added_results_are_bounded_by_queue_size():
+    async def scenario():
+        manager = JobManager(lambda: make_service(), workers=1, queue_size=1)
+        result = ConversionResult(file_path="", size_bytes=3, success=True, content=b"pdf")
+        try:
+            job = manager.add_finished("a.md", result)
+            assert manager.get(job.id).status == JobStatus.SUCCEEDED
+            with pytest.raises(JobQueueFullError):
+                manager.add_finished("b.md", result)
+        finally:
+            await manager.stop()
+
+    asyncio.run(scenario())
@@ -0,0 +1,59 @@
+import io
+import json
+import logging
+import queue
+from logging.handlers import QueueListener
+from src.infrastructure.logger import (
+    LOG_RECORDS_DROPPED, ColoredFormatter, DroppingQueueHandler, JsonFormatter, SamplingFilter, parse_sample_rates
+)
+
+
+def _record(level=logging.INFO, msg="hello %s", args=("world",), **extra):
+    record = logging.LogRecord("svc", level, __file__, 10, msg, args, None)
+    record.__dict__.update(extra)
+    return record
+
+
+def test_colored_formatter_leaves_the_record_untouched():
+    record = _record()
+    
+    colored = ColoredFormatter("%(levelname)s %(message)s").format(record)
+    plain = logging.Formatter("%(levelname)s %(message)s").format(record)
+    
+    assert "\033[32m" in colored
+    assert record.levelname == "INFO"
+    assert plain == "INFO hello world"
+
+def test_json_formatter_includes_extra_fields():
+    line = JsonFormatter().format(_record(request_id="abc", status=200))
+    entry = json.loads(line)
+    
+    assert entry["level"] == "INFO" and entry["message"] == "hello world"
+    assert entry["request_id"] == "abc" and entry["status"] == 200
+
+def test_sampling_filter_keeps_exact_fraction_per_level():
+    sampler = SamplingFilter(parse_sample_rates("info=0.25, DEBUG=0"))
+    
+    kept_info = [sampler.filter(_record()) for _ in range(8)]
+    
+    assert kept_info == [True, False, False, False, True, False, False, False]
+    assert not sampler.filter(_record(logging.DEBUG))
+    assert sampler.filter(_record(logging.WARNING))
+
+def test_queue_pipeline_formats_on_listener_and_drops_when_full():
+    stream = io.StringIO()
+    target = logging.StreamHandler(stream)
+    target.setFormatter(logging.Formatter("%(levelname)s|%(message)s"))
+    log_queue = queue.Queue(maxsize=2)
+    handler = DroppingQueueHandler(log_queue)
+    dropped = LOG_RECORDS_DROPPED.value()
+    
+    for index in range(3):
+        handler.handle(_record(args=(index,)))
+    listener = QueueListener(log_queue, target)
+    listener.start()
+    listener.stop()
+    
+    assert stream.getvalue().splitlines() == ["INFO|hello 0", "INFO|hello 1"]
+    assert handler.dropped == 1
+    assert LOG_RECORDS_DROPPED.value() == dropped + 1
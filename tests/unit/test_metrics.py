@@ -0,0 +1,40 @@
+from src.infrastructure.metrics import MetricsRegistry, timed
+
+def test_histogram_exposition_is_cumulative():
+    registry = MetricsRegistry()
+    histogram = registry.histogram("latency_seconds", "Latency", ("route",))
+    
+    histogram.observe(0.003, route="/a")
+    histogram.observe(0.2, route="/a")
+    histogram.observe(100, route="/a")
+    text = registry.expose()
+    
+    assert "# TYPE latency_seconds histogram" in text
+    assert 'latency_seconds_bucket{route="/a",le="0.005"} 1' in text
+    assert 'latency_seconds_bucket{route="/a",le="0.25"} 2' in text
+    assert 'latency_seconds_bucket{route="/a",le="+Inf"} 3' in text
+    assert 'latency_seconds_count{route="/a"} 3' in text
+
+def test_counter_gauge_and_label_escaping():
+    registry = MetricsRegistry()
+    counter = registry.counter("events_total", "Events", ("kind",))
+    registry.gauge("queue_depth", "Depth", lambda: 4)
+    registry.gauge("broken", "Unreadable gauges are skipped", lambda: 1 / 0)
+    
+    counter.inc(kind='say "hi"')
+    counter.inc(2, kind='say "hi"')
+    text = registry.expose()
+    
+    assert 'events_total{kind="say \\"hi\\""} 3' in text
+    assert "queue_depth 4" in text
+    assert "broken" not in text
+
+def test_timed_accumulates_per_stage():
+    timings = {}
+    with timed(timings, "html"):
+        pass
+    with timed(timings, "html"):
+        pass
+    
+    assert list(timings) == ["html"]
+    assert timings["html"] >= 0
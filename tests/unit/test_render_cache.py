@@ -0,0 +1,40 @@
+from src.adapters.driven.render_cache import TieredRenderCache
+
+def test_cache_miss_then_memory_hit(tmp_path):
+    cache = TieredRenderCache(memory_budget_bytes=1024, disk_dir=str(tmp_path))
+    
+    assert cache.get("k1") is None
+    cache.put("k1", b"pdf")
+    
+    assert cache.get("k1") == b"pdf"
+    stats = cache.stats()
+    assert stats["misses"] == 1
+    assert stats["memory_hits"] == 1
+
+def test_cache_memory_lru_eviction():
+    cache = TieredRenderCache(memory_budget_bytes=10, disk_dir=None)
+    cache.put("a", b"12345")
+    cache.put("b", b"12345")
+    cache.get("a")  # "a" becomes most recently used
+    cache.put("c", b"12345")
+    
+    assert cache.get("b") is None
+    assert cache.get("a") == b"12345"
+    assert cache.get("c") == b"12345"
+    assert cache.stats()["evictions"] == 1
+
+def test_cache_disk_tier_survives_restart(tmp_path):
+    cache = TieredRenderCache(memory_budget_bytes=1024, disk_dir=str(tmp_path))
+    cache.put("k1", b"pdf")
+    
+    reopened = TieredRenderCache(memory_budget_bytes=1024, disk_dir=str(tmp_path))
+    assert reopened.get("k1") == b"pdf"
+    assert reopened.stats()["disk_hits"] == 1
+
+def test_cache_disk_budget_eviction(tmp_path):
+    cache = TieredRenderCache(memory_budget_bytes=0, disk_dir=str(tmp_path), disk_budget_bytes=8)
+    cache.put("a", b"12345")
+    cache.put("b", b"12345")
+    
+    assert not (tmp_path / "a.pdf").exists()
+    assert cache.get("b") == b"12345"
@@ -0,0 +1,108 @@
+import io
+from concurrent.futures import Future
+from unittest.mock import Mock
+from pypdf import PdfReader
+from src.adapters.driven.pdf_adapter import Xhtml2PdfAdapter
+from src.adapters.driven.sections import split_markdown_sections
+from src.application.service import ConversionService
+from src.domain.model import ConversionRequest, SourceFormat
+from src.domain.ports import FileSystemPort, PDFConverterPort
+
+def chapter(number, paragraphs=3):
+    body = "\n\n".join(f"Paragraph {i} of chapter {number}. " + "Lorem ipsum dolor sit amet. " * 20 for i in range(paragraphs))
+    return f"# Chapter {number}\n\n{body}\n\n"
+
+def test_split_at_top_level_headings_outside_code():
+    text = "Intro\n\n## Part A\n\ntext\n\n```\n# not a heading\n```\n\n## Part B\n\nSee [docs][d].\n\n[d]: https://example.com\n"
+
+    sections = split_markdown_sections(text, min_chars=1)
+
+    assert [s.splitlines()[0] for s in sections] == ["Intro", "## Part B"]
+    assert "# not a heading" in sections[0]
+    # Reference definitions are repeated so every section resolves them
+    assert all("[d]: https://example.com" in s for s in sections)
+
+def test_split_groups_small_sections_and_keeps_all_text():
+    text = "".join(chapter(i, paragraphs=1) for i in range(10))
+
+    sections = split_markdown_sections(text, min_chars=len(chapter(0, paragraphs=1)) * 3)
+
+    assert len(sections) == 3
+    assert "".join(sections) == text
+    assert split_markdown_sections("no headings at all", min_chars=1) == ["no headings at all"]
+
+class InlineExecutor:
+    """Runs jobs in the calling thread (stands in for the render pool)."""
+    max_workers = 2
+
+    def submit(self, fn, *args):
+        future = Future()
+        future.set_result(fn(*args))
+        return future
+
+def test_sectioned_render_numbers_pages_continuously():
+    adapter = Xhtml2PdfAdapter()
+    text = "".join(chapter(i, paragraphs=12) for i in range(3))
+    request = ConversionRequest(content=text, source_format=SourceFormat.MARKDOWN, output_filename="big.pdf")
+    service = ConversionService(adapter, Mock(spec=FileSystemPort), executor=InlineExecutor(), section_chars=len(text) // 4)
+
+    sections = service._sections(request)
+    result = service._render_sections(request, sections)
+
+    assert len(sections) == 3
+    assert result.success
+    reader = PdfReader(io.BytesIO(result.content))
+    assert len(reader.pages) == result.page_count > 3
+    footers = [page.extract_text().split("Page")[-1].strip() for page in reader.pages]
+    assert footers == [str(n) for n in range(1, len(reader.pages) + 1)]
+    assert "number_pages" in result.timings and "merge" in result.timings
+
+def test_page_offset_is_scoped_to_the_overlay_render():
+    from xhtml2pdf import document as pisa_document
+    from xhtml2pdf.xhtml2pdf_reportlab import PmlBaseDoc
+    from src.adapters.driven.sections import numbered_from
+
+    assert pisa_document.PmlBaseDoc is PmlBaseDoc
+    with numbered_from(5):
+        assert pisa_document.PmlBaseDoc is not PmlBaseDoc
+    assert pisa_document.PmlBaseDoc is PmlBaseDoc
+
+def test_sections_need_several_workers():
+    adapter = Mock(spec=Xhtml2PdfAdapter)
+    adapter.options_key.return_value = "x"
+    single = InlineExecutor()
+    single.max_workers = 1
+
+    assert ConversionService(adapter, Mock(spec=FileSystemPort), executor=single, section_chars=10).section_chars == 0
+    # Converters without SectionRendererPort always render whole documents
+    assert ConversionService(Mock(spec=PDFConverterPort), Mock(spec=FileSystemPort), executor=InlineExecutor(), section_chars=10).section_chars == 0
+    service = ConversionService(adapter, Mock(spec=FileSystemPort), executor=InlineExecutor(), section_chars=10)
+    assert service.render_options_key() == ":x:sections=10"
+
+def test_renders_are_byte_reproducible():
+    from src.adapters.driven.text_pdf_adapter import StreamingTextAdapter
+    for adapter, source_format in ((Xhtml2PdfAdapter(), SourceFormat.MARKDOWN), (StreamingTextAdapter(), SourceFormat.TEXT)):
+        renders = [
+            adapter.render(ConversionRequest(content="# Same\n\ntext", source_format=source_format, output_filename=name)).content
+            for name in ("a.pdf", "b.pdf")
+        ]
+        # Strong ETags rely on this: no timestamps or random document IDs
+        assert renders[0] == renders[1]
+
+def worker_parsers(_=None):
+    """Runs in a render worker: identifies the parsers its converter reuses."""
+    from src.application import service
+    converter = service._worker_converter
+    return id(converter._markdown()), id(converter.themes.get("default"))
+
+def test_render_workers_reuse_markdown_parser_and_theme_across_jobs():
+    from src.application.service import install_worker_converter
+    from src.infrastructure.executor import RenderExecutor
+    executor = RenderExecutor(1, initializer=install_worker_converter, initargs=(Xhtml2PdfAdapter(),))
+    try:
+        first = executor.submit(worker_parsers).result(timeout=60)
+        second = executor.submit(worker_parsers).result(timeout=60)
+    finally:
+        executor.shutdown()
+
+    assert first == second
@@ -1,3 +1,4 @@
+import asyncio
 import pytest
 from unittest.mock import Mock
 from src.application.service import ConversionService
@@ -45,3 +46,189 @@ def test_convert_file_unsupported_format(mock_fs, mock_converter):
     
     with pytest.raises(UnsupportedFormatError, match="Unsupported file format"):
         service.convert_file("input.jpg", "out.pdf")
+
+
+def test_convert_file_async_markdown(mock_fs, mock_converter):
+    service = ConversionService(mock_converter, mock_fs)
+    mock_fs.read_file.return_value = "# Hello"
+    mock_converter.convert.return_value = ConversionResult(
+        file_path="/abs/out.pdf",
+        size_bytes=100,
+        success=True
+    )
+
+    path = asyncio.run(service.convert_file_async("input.md", "out.pdf"))
+
+    assert path == "/abs/out.pdf"
+    request = mock_converter.convert.call_args[0][0]
+    assert request.source_format == SourceFormat.MARKDOWN
+
+
+def test_convert_file_render_cache_hit(mock_fs, mock_converter):
+    from src.adapters.driven.render_cache import TieredRenderCache
+    cache = TieredRenderCache(disk_dir=None)
+    service = ConversionService(mock_converter, mock_fs, cache=cache)
+    mock_fs.read_file.return_value = "# Hello"
+    mock_fs.read_bytes.return_value = b"pdf data"
+    mock_fs.save_file.return_value = "/abs/second.pdf"
+    mock_converter.options_key.return_value = "test"
+    mock_converter.convert.return_value = ConversionResult(
+        file_path="/abs/first.pdf",
+        size_bytes=8,
+        success=True
+    )
+
+    service.convert_file("first.md", "first.pdf")
+    path = service.convert_file("second.md", "second.pdf")
+
+    assert path == "/abs/second.pdf"
+    mock_converter.convert.assert_called_once()
+    mock_fs.save_file.assert_called_with("./second.pdf", b"pdf data")
+
+
+def test_convert_content_in_memory(mock_fs, mock_converter):
+    service = ConversionService(mock_converter, mock_fs)
+    mock_converter.render.return_value = ConversionResult(
+        file_path="",
+        size_bytes=8,
+        success=True,
+        content=b"pdf data"
+    )
+
+    result = service.convert_content(b"# Hello", "notes.md")
+
+    assert result.content == b"pdf data"
+    request = mock_converter.render.call_args[0][0]
+    assert request.source_format == SourceFormat.MARKDOWN
+    assert request.output_filename == "notes.pdf"
+    mock_fs.read_file.assert_not_called()
+
+def test_convert_file_records_stage_metrics(mock_fs, mock_converter):
+    from src.infrastructure.metrics import CONVERSIONS, STAGE_SECONDS
+    service = ConversionService(mock_converter, mock_fs)
+    mock_fs.read_file.return_value = "# Hello"
+    mock_converter.convert.return_value = ConversionResult(
+        file_path="/abs/out.pdf", size_bytes=100, success=True, timings={"pdf_render": 0.5}
+    )
+    successes = CONVERSIONS.value(format="md", outcome="success")
+    renders = STAGE_SECONDS.count(stage="pdf_render", format="md")
+    reads = STAGE_SECONDS.count(stage="read", format="md")
+    
+    service.convert_file("input.md", "out.pdf")
+    
+    assert CONVERSIONS.value(format="md", outcome="success") == successes + 1
+    assert STAGE_SECONDS.count(stage="pdf_render", format="md") == renders + 1
+    assert STAGE_SECONDS.count(stage="read", format="md") == reads + 1
+    
+    failures = CONVERSIONS.value(format="unknown", outcome="failure")
+    with pytest.raises(UnsupportedFormatError):
+        service.convert_file("input.jpg", "out.pdf")
+    assert CONVERSIONS.value(format="unknown", outcome="failure") == failures + 1
+
+
+def test_identical_concurrent_conversions_share_one_render(mock_fs, mock_converter):
+    import threading
+    import time
+    from src.infrastructure.metrics import CONVERSIONS
+    service = ConversionService(mock_converter, mock_fs)
+    mock_fs.read_file.return_value = "# Same"
+    mock_fs.read_bytes.return_value = b"%PDF"
+    mock_fs.save_file.side_effect = lambda path, data: f"/abs/{path}"
+    rendering = threading.Event()
+
+    def slow_convert(request, output_dir):
+        rendering.set()
+        time.sleep(0.3)
+        return ConversionResult(file_path="/abs/out/a.pdf", size_bytes=4, success=True)
+
+    mock_converter.convert.side_effect = slow_convert
+    coalesced = CONVERSIONS.value(format="md", outcome="coalesced")
+    leader = threading.Thread(target=service.convert_file, args=("a.md", "out/a.pdf"))
+    leader.start()
+    rendering.wait(timeout=5)
+
+    path = service.convert_file("b.md", "out/b.pdf")
+    leader.join()
+
+    mock_converter.convert.assert_called_once()
+    assert path == "/abs/out/b.pdf"
+    mock_fs.save_file.assert_called_once_with("out/b.pdf", b"%PDF")
+    assert CONVERSIONS.value(format="md", outcome="coalesced") == coalesced + 1
+
+
+def test_identical_async_conversions_share_one_render(mock_fs, mock_converter):
+    import time
+    service = ConversionService(mock_converter, mock_fs)
+
+    def slow_render(request, spill_threshold):
+        time.sleep(0.2)
+        return ConversionResult(file_path="", size_bytes=4, success=True, content=b"%PDF")
+
+    mock_converter.render.side_effect = slow_render
+
+    async def convert_all():
+        return await asyncio.gather(
+            service.convert_content_async("# Same", "a.md"),
+            service.convert_content_async("# Same", "b.md"),
+            service.convert_content_async("# Other", "c.md"),
+        )
+
+    results = asyncio.run(convert_all())
+
+    assert mock_converter.render.call_count == 2
+    assert [r.content for r in results] == [b"%PDF"] * 3
+
+
+def test_render_key_identifies_the_pdf_before_rendering(mock_fs, mock_converter):
+    import hashlib
+    mock_converter.options_key.return_value = "opts"
+    mock_converter.themes_available.return_value = ["default", "compact"]
+    service = ConversionService(mock_converter, mock_fs)
+    content_hash = hashlib.sha256(b"# Hello").hexdigest()
+
+    request = service._build_request(b"# Hello", "a.md")
+    key = service.render_key(content_hash, "b.markdown")
+
+    assert key == service._cache_key(request)
+    assert service.render_key(content_hash, "b.txt") != key
+    assert service.render_key(content_hash, "b.md", theme="compact") != key
+    with pytest.raises(UnsupportedFormatError):
+        service.render_key(content_hash, "b.pdf")
+
+def test_render_key_ignores_theme_where_it_does_not_apply(mock_fs, mock_converter):
+    mock_converter.options_key.return_value = "opts"
+    mock_converter.themes_available.return_value = ["default", "compact"]
+    mock_converter.applies_themes.side_effect = lambda source_format: source_format != SourceFormat.TEXT
+    service = ConversionService(mock_converter, mock_fs)
+
+    # Plain text renders the same under every theme, so it is cached once
+    assert service.render_key("abc", "a.txt", theme="compact") == service.render_key("abc", "a.txt")
+    assert service.render_key("abc", "a.md", theme="compact") != service.render_key("abc", "a.md")
+
+class CountingConverter(PDFConverterPort):
+    """Reports how many renders this converter instance has served (module-level for pool workers)."""
+
+    def __init__(self):
+        self.renders = 0
+
+    def convert(self, request, output_dir):
+        return self.render(request)
+
+    def render(self, request, spill_threshold=None):
+        self.renders += 1
+        content = str(self.renders).encode()
+        return ConversionResult(file_path="", size_bytes=len(content), success=True, content=content)
+
+def test_pool_workers_keep_one_converter_across_jobs(mock_fs):
+    from src.application.service import install_worker_converter
+    from src.infrastructure.executor import RenderExecutor
+    executor = RenderExecutor(1, initializer=install_worker_converter, initargs=(CountingConverter(),))
+    try:
+        service = ConversionService(executor.initargs[0], mock_fs, executor=executor)
+        renders = [service.convert_content(f"# Doc {i}".encode(), "doc.md").content for i in range(3)]
+    finally:
+        executor.shutdown()
+
+    # A converter pickled with every job would start from zero each time
+    # (re-parsing themes and recompiling templates on every render)
+    assert renders == [b"1", b"2", b"3"]
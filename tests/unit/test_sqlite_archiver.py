@@ -0,0 +1,62 @@
+import json
+from src.adapters.driven.sqlite_archiver import SQLiteArchiver
+from src.domain.model import ConversionRequest, ConversionResult, HistoryQuery, SourceFormat
+
+
+def _archive(archiver: SQLiteArchiver, content: str, success: bool = True, name: str = "doc.pdf") -> str:
+    request = ConversionRequest(content=content, source_format=SourceFormat.TEXT, output_filename=name)
+    archiver.archive(request, ConversionResult("", 10, success, error_message=None if success else "boom"))
+    return request.content_hash
+
+
+def test_query_filters_and_paginates_newest_first(tmp_path):
+    archiver = SQLiteArchiver(str(tmp_path / "history.db"), flush_interval=60)
+    try:
+        hashes = [_archive(archiver, f"doc {i}", success=i % 3 != 0, name=f"doc{i}.pdf") for i in range(7)]
+        _archive(archiver, "doc 1", name="again.pdf")
+        assert archiver.flush()
+
+        # Pages follow each other without gaps or repeats
+        names, cursor = [], None
+        while True:
+            page = archiver.query(HistoryQuery(limit=3, cursor=cursor))
+            names.extend(r["original_filename"] for r in page.records)
+            cursor = page.next_cursor
+            if cursor is None:
+                break
+        assert names == ["again.pdf"] + [f"doc{i}.pdf" for i in reversed(range(7))]
+
+        by_hash = archiver.query(HistoryQuery(content_hash=hashes[1])).records
+        assert [r["original_filename"] for r in by_hash] == ["again.pdf", "doc1.pdf"]
+        failed = archiver.query(HistoryQuery(success=False)).records
+        assert [r["original_filename"] for r in failed] == ["doc6.pdf", "doc3.pdf", "doc0.pdf"]
+        assert failed[0]["success"] is False and failed[0]["error"] == "boom"
+        today = by_hash[0]["date"]
+        assert len(archiver.query(HistoryQuery(date_from=today, date_to=today)).records) == 8
+        assert archiver.query(HistoryQuery(date_to="2000-01-01")).records == []
+    finally:
+        archiver.close()
+
+
+def test_import_jsonl_imports_each_file_once(tmp_path):
+    meta_dir = tmp_path / "metadata"
+    meta_dir.mkdir()
+    record = {
+        "run_id": "20250101_120000_abcdef12", "timestamp": "2025-01-01T12:00:00", "date": "2025-01-01",
+        "time": "12:00:00", "original_filename": "old.pdf", "source_format": "md", "input_size_bytes": 5,
+        "output_size_bytes": 100, "content_hash": "abcdef12" * 8, "success": False, "error": "bad",
+        "word_count": 1, "line_count": 1, "char_count": 5,
+    }
+    (meta_dir / "2025-01-01.jsonl").write_text(
+        json.dumps(record) + "\nnot json\n" + json.dumps({"run_id": "incomplete"}) + "\n", encoding="utf-8"
+    )
+    archiver = SQLiteArchiver(str(tmp_path / "history.db"))
+    try:
+        assert archiver.import_jsonl(str(meta_dir)) == 1
+        assert archiver.import_jsonl(str(meta_dir)) == 0
+
+        page = archiver.query(HistoryQuery(success=False, date_from="2025-01-01", date_to="2025-01-01"))
+        assert [r["original_filename"] for r in page.records] == ["old.pdf"]
+        assert page.records[0]["content_hash"] == record["content_hash"]
+    finally:
+        archiver.close()
@@ -0,0 +1,51 @@
+import os
+import pytest
+from src.adapters.driven.theming import ThemeRegistry, split_css
+from src.domain.exceptions import ThemeNotFoundError
+
+CSS = """
+/* comment { not a rule } */
+@page { size: a4; @frame footer { bottom: 1cm; } }
+body { color: #000000; }
+h1 { font-size: 20pt; }
+"""
+
+def test_split_css_separates_page_rules():
+    page_css, style_css = split_css(CSS)
+    
+    assert page_css.startswith("@page")
+    assert "@frame footer" in page_css
+    assert "body" in style_css and "h1" in style_css
+    assert "@page" not in style_css
+
+def test_registry_lists_bundled_themes():
+    names = ThemeRegistry().names()
+    
+    assert "default" in names
+    assert "compact" in names
+
+def test_registry_rejects_unknown_and_path_like_names(tmp_path):
+    registry = ThemeRegistry(themes_dir=tmp_path)
+    
+    with pytest.raises(ThemeNotFoundError):
+        registry.get("missing")
+    with pytest.raises(ThemeNotFoundError):
+        registry.get("../default")
+
+def test_registry_caches_parsed_styles_until_mtime_changes(tmp_path):
+    css_file = tmp_path / "brand.css"
+    css_file.write_text(CSS)
+    registry = ThemeRegistry(themes_dir=tmp_path)
+    
+    theme = registry.get("brand")
+    parsed = theme.parsed_styles
+    assert registry.get("brand") is theme
+    assert theme.parsed_styles is parsed
+    
+    css_file.write_text(CSS.replace("20pt", "24pt"))
+    stat = css_file.stat()
+    os.utime(css_file, (stat.st_atime, stat.st_mtime + 10))
+    
+    reloaded = registry.get("brand")
+    assert reloaded is not theme
+    assert "24pt" in reloaded.style_css
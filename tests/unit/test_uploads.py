@@ -0,0 +1,100 @@
+import asyncio
+import hashlib
+import pytest
+from fastapi import HTTPException
+from starlette.requests import Request
+from src.adapters.driving.uploads import SPOOL_MAX_SIZE, UploadLimits, receive_uploads
+
+BOUNDARY = "b0undary"
+
+def multipart(*files):
+    parts = []
+    for name, data in files:
+        parts.append(
+            f'--{BOUNDARY}\r\nContent-Disposition: form-data; name="file"; filename="{name}"\r\n\r\n'.encode()
+            + data + b"\r\n"
+        )
+    return b"".join(parts) + f"--{BOUNDARY}--\r\n".encode()
+
+def make_request(body, chunk_size=64 * 1024, content_length=True, received=None):
+    chunks = [body[i:i + chunk_size] for i in range(0, len(body), chunk_size)]
+    received = received if received is not None else []
+    headers = [(b"content-type", f"multipart/form-data; boundary={BOUNDARY}".encode())]
+    if content_length:
+        headers.append((b"content-length", str(len(body)).encode()))
+
+    async def receive():
+        chunk = chunks.pop(0) if chunks else b""
+        received.append(chunk)
+        return {"type": "http.request", "body": chunk, "more_body": bool(chunks)}
+    return Request({"type": "http", "method": "POST", "headers": headers}, receive)
+
+LIMITS = UploadLimits(max_file_size=4 * SPOOL_MAX_SIZE, allowed_extensions=(".txt",), max_files=2)
+
+def test_hashes_and_spools_uploads():
+    data = b"0123456789" * (SPOOL_MAX_SIZE // 5)
+    uploads = asyncio.run(receive_uploads(make_request(multipart(("a.txt", b"small"), ("b.txt", data))), LIMITS))
+    
+    small, large = uploads
+    assert small.in_memory and not large.in_memory
+    assert large.size == len(data)
+    assert large.sha256 == hashlib.sha256(data).hexdigest()
+    assert asyncio.run(large.read()) == data
+    for upload in uploads:
+        upload.close()
+
+def test_rejects_from_content_length_without_reading():
+    request = make_request(multipart(("a.txt", b"x" * (5 * SPOOL_MAX_SIZE))))
+    request._receive = None  # reading the body would fail
+    
+    with pytest.raises(HTTPException) as exc:
+        asyncio.run(receive_uploads(request, UploadLimits(max_file_size=1024, allowed_extensions=(".txt",))))
+    assert exc.value.status_code == 413
+
+def test_rejects_disallowed_type_and_skips_when_asked():
+    body = multipart(("a.exe", b"bin"), ("b.txt", b"ok"))
+    
+    with pytest.raises(HTTPException) as exc:
+        asyncio.run(receive_uploads(make_request(body), LIMITS))
+    assert exc.value.status_code == 400
+    
+    skipping = UploadLimits(max_file_size=1024, allowed_extensions=(".txt",), max_files=2, skip_invalid=True)
+    uploads = asyncio.run(receive_uploads(make_request(body), skipping))
+    assert uploads[0].error == "Unsupported format: .exe"
+    assert asyncio.run(uploads[1].read()) == b"ok"
+
+def test_total_limit_skips_later_files():
+    limits = UploadLimits(
+        max_file_size=1024, allowed_extensions=(".txt",), max_files=3, max_total_size=1500, skip_invalid=True
+    )
+    body = multipart(("a.txt", b"a" * 1000), ("b.txt", b"b" * 1000), ("c.txt", b"c" * 400))
+    
+    uploads = asyncio.run(receive_uploads(make_request(body, chunk_size=100), limits))
+    
+    assert [u.error is None for u in uploads] == [True, False, True]
+    assert "Total request size" in uploads[1].error
+    assert asyncio.run(uploads[2].read()) == b"c" * 400
+
+def test_stops_reading_once_file_limit_is_crossed():
+    received = []
+    body = multipart(("a.txt", b"x" * (20 * SPOOL_MAX_SIZE)))
+    request = make_request(body, chunk_size=SPOOL_MAX_SIZE, content_length=False, received=received)
+    
+    with pytest.raises(HTTPException) as exc:
+        asyncio.run(receive_uploads(request, LIMITS))
+    assert exc.value.status_code == 413
+    assert len(received) <= 6
+
+def test_file_limit_counts_bytes_not_yet_written():
+    from src.adapters.driving.uploads import ReceivedUpload, _UploadReader
+    reader = _UploadReader(UploadLimits(max_file_size=1024, allowed_extensions=(".txt",), skip_invalid=True), "utf-8")
+    upload = reader._current = ReceivedUpload(field_name="file", filename="a.txt")
+    reader.uploads.append(upload)
+
+    # The parser may report several pieces of one body chunk before they are flushed
+    reader.on_part_data(b"x" * 600, 0, 600)
+    reader.on_part_data(b"x" * 600, 0, 600)
+    asyncio.run(reader.flush())
+
+    assert upload.error == "File exceeds 0MB limit"
+    assert upload.size == upload.pending == reader.kept_bytes == 0
@@ -0,0 +1,189 @@
+import os
+import queue
+import threading
+import time
+from pathlib import Path
+from unittest.mock import Mock
+import pytest
+from src.adapters.driven.dir_watcher import InotifyDirectoryWatcher, PollingDirectoryWatcher
+from src.application.batch import BatchConverter
+from src.application.service import ConversionService
+from src.application.watch import WatchConverter
+from src.domain.ports import DirectoryWatcherPort
+
+class FakeWatcher(DirectoryWatcherPort):
+    def __init__(self):
+        self.events = queue.Queue()
+        self.closed = False
+
+    def wait_for_changes(self, timeout):
+        try:
+            return {self.events.get(timeout=timeout)}
+        except queue.Empty:
+            return set()
+
+    def close(self):
+        self.closed = True
+
+def wait_until(condition, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline, "condition not reached"
+        time.sleep(0.01)
+
+def test_polling_watcher_reports_created_modified_and_deleted(tmp_path):
+    watcher = PollingDirectoryWatcher(str(tmp_path), (".md",), interval=0.01)
+    doc = tmp_path / "doc.md"
+    doc.write_text("# One")
+    (tmp_path / "ignored.png").write_bytes(b"x")
+    assert watcher.wait_for_changes(1.0) == {str(doc)}
+
+    doc.write_text("# Two, longer")
+    assert watcher.wait_for_changes(1.0) == {str(doc)}
+
+    doc.unlink()
+    assert watcher.wait_for_changes(1.0) == {str(doc)}
+    assert watcher.wait_for_changes(0.05) == set()
+
+def test_inotify_watcher_reports_changes(tmp_path):
+    try:
+        watcher = InotifyDirectoryWatcher(str(tmp_path), (".md", ".txt"))
+    except (OSError, AttributeError):
+        pytest.skip("inotify unavailable")
+    try:
+        assert watcher.wait_for_changes(0.01) == set()
+        (tmp_path / "a.md").write_text("# A")
+        (tmp_path / "b.txt").write_text("B")
+        (tmp_path / "c.png").write_bytes(b"x")
+        changed = set()
+        deadline = time.monotonic() + 2
+        while len(changed) < 2 and time.monotonic() < deadline:
+            changed |= watcher.wait_for_changes(0.2)
+        assert changed == {str(tmp_path / "a.md"), str(tmp_path / "b.txt")}
+    finally:
+        watcher.close()
+
+def test_watch_debounces_bursts_and_prunes_deleted_inputs(tmp_path):
+    input_dir, output_dir = tmp_path / "input", tmp_path / "output"
+    input_dir.mkdir()
+    existing = input_dir / "existing.md"
+    existing.write_text("# Existing")
+
+    def fake_convert(input_path, output_path, timeout=None):
+        Path(output_path).write_bytes(b"%PDF " + Path(input_path).read_bytes())
+        return output_path
+
+    service = Mock(spec=ConversionService)
+    service.render_options_key.return_value = "opts"
+    service.convert_file.side_effect = fake_convert
+    watcher = FakeWatcher()
+    results = []
+    converter = WatchConverter(
+        BatchConverter(service, workers=2), watcher, str(input_dir), str(output_dir),
+        lambda: sorted(str(p) for p in input_dir.glob("*.md")),
+        debounce=0.1, prune=True, on_result=results.append,
+    )
+    stop = threading.Event()
+    thread = threading.Thread(target=converter.run, args=(stop,))
+    thread.start()
+    try:
+        # Catch-up converts what was already there
+        wait_until(lambda: (output_dir / "existing.pdf").exists())
+
+        # A burst of writes to one file is converted once, with the final content
+        new = input_dir / "new.md"
+        for i in range(5):
+            new.write_text(f"# Draft {i}")
+            watcher.events.put(str(new))
+            time.sleep(0.01)
+        wait_until(lambda: any(r.file == "new.md" for r in results))
+        time.sleep(0.2)
+        assert [r.file for r in results] == ["new.md"]
+        assert (output_dir / "new.pdf").read_bytes() == b"%PDF # Draft 4"
+
+        # Touched but unchanged: the manifest skips the render
+        os.utime(new)
+        watcher.events.put(str(new))
+        wait_until(lambda: len(results) == 2)
+        assert results[1].status == "unchanged"
+
+        new.unlink()
+        watcher.events.put(str(new))
+        wait_until(lambda: not (output_dir / "new.pdf").exists())
+    finally:
+        stop.set()
+        thread.join(timeout=5)
+
+    assert not thread.is_alive()
+    assert watcher.closed
+    assert service.convert_file.call_count == 2
+    assert (output_dir / ".bulk-manifest.json").exists()
+
+def test_watchers_cover_subdirectories(tmp_path):
+    polling = PollingDirectoryWatcher(str(tmp_path), (".md",), interval=0.01)
+    try:
+        inotify = InotifyDirectoryWatcher(str(tmp_path), (".md",))
+    except (OSError, AttributeError):
+        inotify = None
+    try:
+        # A directory created after the watch started, with a file already in it
+        nested = tmp_path / "new" / "deeper"
+        nested.mkdir(parents=True)
+        doc = nested / "doc.md"
+        doc.write_text("# Doc")
+        assert polling.wait_for_changes(1.0) == {str(doc)}
+        if inotify is not None:
+            changed = set()
+            deadline = time.monotonic() + 2
+            while str(doc) not in changed and time.monotonic() < deadline:
+                changed |= inotify.wait_for_changes(0.2)
+            assert str(doc) in changed
+            # The new directories are watched too
+            doc.write_text("# Edited")
+            assert str(doc) in inotify.wait_for_changes(2.0)
+    finally:
+        if inotify is not None:
+            inotify.close()
+
+def test_watch_mirrors_paths_and_ignores_unselected_files(tmp_path):
+    from src.adapters.driven.fs_adapter import LocalFileSystemAdapter, scan_filter
+    from src.domain.model import FileScan
+    input_dir, output_dir = tmp_path / "input", tmp_path / "output"
+    (input_dir / "sub").mkdir(parents=True)
+    (input_dir / "drafts").mkdir()
+    scan = FileScan(exclude=("drafts",))
+
+    def fake_convert(input_path, output_path, timeout=None):
+        Path(output_path).write_bytes(b"%PDF")
+        return output_path
+
+    service = Mock(spec=ConversionService)
+    service.render_options_key.return_value = "opts"
+    service.convert_file.side_effect = fake_convert
+    watcher = FakeWatcher()
+    results = []
+    converter = WatchConverter(
+        BatchConverter(service, workers=1), watcher, str(input_dir), str(output_dir),
+        lambda: LocalFileSystemAdapter().scan_files(str(input_dir), scan),
+        debounce=0.01, on_result=results.append,
+        input_root=str(input_dir), manifest_name=".shard-manifest.json", selects=scan_filter(str(input_dir), scan),
+    )
+    stop = threading.Event()
+    thread = threading.Thread(target=converter.run, args=(stop,))
+    thread.start()
+    try:
+        draft = input_dir / "drafts" / "draft.md"
+        draft.write_text("# Draft")
+        watcher.events.put(str(draft))
+        doc = input_dir / "sub" / "doc.md"
+        doc.write_text("# Doc")
+        watcher.events.put(str(doc))
+        wait_until(lambda: results)
+        time.sleep(0.1)
+    finally:
+        stop.set()
+        thread.join(timeout=5)
+
+    assert [r.file for r in results] == ["sub/doc.md"]
+    assert (output_dir / "sub" / "doc.pdf").exists()
+    assert (output_dir / ".shard-manifest.json").exists()
@@ -0,0 +1,91 @@
+import os
+import time
+import pytest
+from src.domain.exceptions import RenderLimitError
+from src.infrastructure.worker_pool import SupervisedProcessPool, WorkerLimits
+
+# Jobs are module-level so spawned workers can import them
+
+def pid(_=None):
+    return os.getpid()
+
+def sleep(seconds):
+    time.sleep(seconds)
+    return seconds
+
+def spin(seconds):
+    end = time.process_time() + seconds
+    while time.process_time() < end:
+        pass
+    return seconds
+
+def hog(mb):
+    data = bytearray(mb * 1024 * 1024)
+    for i in range(0, len(data), 4096):
+        data[i] = 1
+    time.sleep(1)
+    return len(data)
+
+def fail(message):
+    raise ValueError(message)
+
+def crash():
+    os._exit(3)
+
+def log_handlers():
+    from src.infrastructure import logger
+    return sorted(type(handler).__name__ for handler in logger.listener.handlers)
+
+@pytest.fixture
+def make_pool():
+    pools = []
+    def make(**limits):
+        pool = SupervisedProcessPool(1, WorkerLimits(**limits))
+        pools.append(pool)
+        return pool
+    yield make
+    for pool in pools:
+        pool.shutdown()
+
+def test_wall_time_limit_replaces_the_worker(make_pool):
+    pool = make_pool(timeout_s=0.5)
+    first = pool.submit(pid).result(timeout=30)
+
+    with pytest.raises(RenderLimitError) as excinfo:
+        pool.submit(sleep, 5).result(timeout=30)
+
+    assert excinfo.value.limit == "wall_time"
+    assert pool.submit(sleep, 0).result(timeout=30) == 0
+    assert pool.submit(pid).result(timeout=30) != first
+
+def test_cpu_and_memory_limits(make_pool):
+    pool = make_pool(cpu_s=1, memory_mb=200)
+
+    with pytest.raises(RenderLimitError) as excinfo:
+        pool.submit(spin, 5).result(timeout=30)
+    assert excinfo.value.limit == "cpu_time"
+    # The CPU budget is per job, not per worker
+    assert pool.submit(spin, 0.5).result(timeout=30) == 0.5
+
+    with pytest.raises(RenderLimitError) as excinfo:
+        pool.submit(hog, 300).result(timeout=30)
+    assert excinfo.value.limit == "memory"
+
+def test_errors_crashes_and_recycling(make_pool):
+    pool = make_pool(max_jobs=2)
+
+    with pytest.raises(ValueError, match="bad input"):
+        pool.submit(fail, "bad input").result(timeout=30)
+    # Second job on this worker: it is replaced afterwards
+    first = pool.submit(pid).result(timeout=30)
+    second = pool.submit(pid).result(timeout=30)
+    assert second != first
+
+    with pytest.raises(RenderLimitError) as excinfo:
+        pool.submit(crash).result(timeout=30)
+    assert excinfo.value.limit == "worker_crash"
+    assert pool.submit(pid).result(timeout=30) not in (first, second)
+
+def test_workers_leave_the_log_file_to_the_parent(make_pool):
+    assert "LazyRotatingFileHandler" in log_handlers()
+    assert make_pool().submit(log_handlers).result(timeout=30) == ["StreamHandler"]